@@ -0,0 +1,222 @@
+"""
+Incrementally maintained aggregate counters for the Cultural Corpus Collection Platform
+Dashboard counters are updated on every submission and read without scanning user_responses.csv
+
+Usage:
+    python aggregate_store.py rebuild   # recompute data/aggregates.json from the raw CSV
+"""
+
+import argparse
+import csv
+import json
+import os
+import re
+from datetime import date
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from config import DATA_FOLDER, CSV_FILE, AGGREGATES_FILE
+from file_lock import file_lock, atomic_write
+
+AGGREGATES_VERSION = 1
+
+IDI_EMITI_CATEGORY = 'Cultural Identification'
+
+# Counter families keyed by the response column they count
+COUNTED_COLUMNS = {
+    'language': 'language',
+    'category': 'category',
+    'media_type': 'media_type',
+    'validation_status': 'validation_status',
+    'contributor': 'contributor_name'
+}
+
+CONFIDENCE_PATTERN = re.compile(r'Confidence: ([^.]*)')
+
+DAY_NAMES = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+MONTH_NAMES = ['January', 'February', 'March', 'April', 'May', 'June', 'July',
+               'August', 'September', 'October', 'November', 'December']
+
+def empty_aggregates() -> Dict:
+    """Create an empty aggregate document"""
+    aggregates = {
+        'version': AGGREGATES_VERSION,
+        'source_size': 0,
+        'total': 0,
+        'day': {},
+        'hour': {},
+        'idi_emiti': {
+            'total': 0,
+            'audio_recordings': 0,
+            'local_language_name': {},
+            'dialect_regional_variation': {},
+            'confidence': {}
+        }
+    }
+    for family in COUNTED_COLUMNS:
+        aggregates[family] = {}
+    return aggregates
+
+def _increment(counter: Dict, key: Optional[str]):
+    """Increment a counter, skipping empty values like pandas value_counts does"""
+    if key is None:
+        return
+    key = str(key)
+    if key == '':
+        return
+    counter[key] = counter.get(key, 0) + 1
+
+def apply_response(aggregates: Dict, row: Dict):
+    """Add a single response row to the aggregate counters"""
+    aggregates['total'] += 1
+
+    for family, column in COUNTED_COLUMNS.items():
+        _increment(aggregates[family], row.get(column))
+
+    timestamp = str(row.get('timestamp') or '')
+    # Timestamps that aren't ISO are left out, as pd.to_datetime(errors='coerce') did
+    if len(timestamp) >= 13 and timestamp[10] == 'T' and timestamp[11:13].isdigit():
+        _increment(aggregates['day'], timestamp[:10])
+        _increment(aggregates['hour'], str(int(timestamp[11:13])))
+
+    if row.get('category') == IDI_EMITI_CATEGORY:
+        idi_emiti = aggregates['idi_emiti']
+        idi_emiti['total'] += 1
+        if row.get('local_language_audio_path'):
+            idi_emiti['audio_recordings'] += 1
+        _increment(idi_emiti['local_language_name'], row.get('local_language_name'))
+        _increment(idi_emiti['dialect_regional_variation'], row.get('dialect_regional_variation'))
+        match = CONFIDENCE_PATTERN.search(str(row.get('contributor_details') or ''))
+        if match:
+            _increment(idi_emiti['confidence'], match.group(1))
+
+def save_aggregates(aggregates: Dict):
+    """Persist aggregates atomically"""
+    Path(DATA_FOLDER).mkdir(exist_ok=True)
+
+    with atomic_write(AGGREGATES_FILE) as f:
+        json.dump(aggregates, f, ensure_ascii=False)
+
+def rebuild_aggregates() -> Dict:
+    """Recompute all aggregates from the raw responses CSV"""
+    aggregates = empty_aggregates()
+
+    # Hold the CSV lock so a concurrent append cannot be half-counted
+    with file_lock(CSV_FILE):
+        if os.path.exists(CSV_FILE):
+            with open(CSV_FILE, 'r', newline='', encoding='utf-8') as f:
+                for row in csv.DictReader(f):
+                    apply_response(aggregates, row)
+                aggregates['source_size'] = os.fstat(f.fileno()).st_size
+
+        save_aggregates(aggregates)
+    return aggregates
+
+def _read_aggregates_file() -> Optional[Dict]:
+    try:
+        with open(AGGREGATES_FILE, 'r', encoding='utf-8') as f:
+            aggregates = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    if not isinstance(aggregates, dict) or aggregates.get('version') != AGGREGATES_VERSION:
+        return None
+    return aggregates
+
+def _csv_size() -> int:
+    try:
+        return os.path.getsize(CSV_FILE)
+    except OSError:
+        return 0
+
+def load_aggregates() -> Dict:
+    """Load aggregates, rebuilding them if they do not match the current CSV"""
+    aggregates = _read_aggregates_file()
+
+    if aggregates is None or aggregates.get('source_size') != _csv_size():
+        aggregates = rebuild_aggregates()
+
+    return aggregates
+
+def record_responses(rows: List[Dict], size_before: int, size_after: int):
+    """Update aggregates after rows were appended to the responses CSV.
+
+    size_before/size_after are the CSV sizes around the append. If the stored
+    aggregates were not in sync with size_before (another writer, manual edit,
+    schema migration) they are rebuilt from the CSV instead of incremented.
+    Callers should hold the CSV_FILE lock so updates are applied in file order.
+    """
+    aggregates = _read_aggregates_file()
+
+    if aggregates is None or aggregates.get('source_size') != size_before:
+        rebuild_aggregates()
+        return
+
+    for row in rows:
+        apply_response(aggregates, row)
+    aggregates['source_size'] = size_after
+    save_aggregates(aggregates)
+
+def _sorted_counts(counter: Dict) -> Dict:
+    """Order a counter by descending count like pandas value_counts"""
+    return dict(sorted(counter.items(), key=lambda item: item[1], reverse=True))
+
+def _add(counter: Dict, key: str, count: int):
+    counter[key] = counter.get(key, 0) + count
+
+def time_based_analytics(aggregates: Dict, today: date) -> Dict:
+    """Derive daily, hourly, weekday, monthly and recent trends from the day/hour histograms"""
+    daily = dict(sorted(aggregates['day'].items()))
+
+    day_of_week = {}
+    monthly = {}
+    recent_trend = {}
+    for day, count in daily.items():
+        try:
+            parsed = date.fromisoformat(day)
+        except ValueError:
+            continue
+        _add(day_of_week, DAY_NAMES[parsed.weekday()], count)
+        _add(monthly, MONTH_NAMES[parsed.month - 1], count)
+        if (today - parsed).days <= 7:
+            recent_trend[day] = count
+
+    return {
+        'daily': daily,
+        'hourly': {int(hour): count for hour, count in sorted(aggregates['hour'].items(), key=lambda item: int(item[0]))},
+        'day_of_week': _sorted_counts(day_of_week),
+        'monthly': _sorted_counts(monthly),
+        'recent_trend': recent_trend
+    }
+
+def idi_emiti_analytics(aggregates: Dict) -> Dict:
+    """Idi-Emiti totals and top languages/dialects from the aggregate counters"""
+    idi_emiti = aggregates['idi_emiti']
+    local_names = idi_emiti['local_language_name']
+    dialects = idi_emiti['dialect_regional_variation']
+
+    return {
+        'total_identifications': idi_emiti['total'],
+        'languages_documented': len(local_names),
+        'dialects_documented': len(dialects),
+        'audio_recordings': idi_emiti['audio_recordings'],
+        'confidence_distribution': _sorted_counts(idi_emiti['confidence']),
+        'top_languages': dict(list(_sorted_counts(local_names).items())[:10]),
+        'top_dialects': dict(list(_sorted_counts(dialects).items())[:10])
+    }
+
+def get_counts(aggregates: Dict, family: str) -> Dict:
+    """Get a counter family (language, category, media_type, validation_status, contributor)"""
+    return _sorted_counts(aggregates[family])
+
+def main():
+    parser = argparse.ArgumentParser(description="Maintain dashboard aggregate counters")
+    parser.add_argument('command', choices=['rebuild'], help="rebuild: recompute aggregates from the responses CSV")
+    args = parser.parse_args()
+
+    if args.command == 'rebuild':
+        aggregates = rebuild_aggregates()
+        print(f"✅ Rebuilt aggregates from {aggregates['total']} submissions")
+
+if __name__ == "__main__":
+    main()
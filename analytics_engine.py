@@ -0,0 +1,313 @@
+"""
+Shared analytics engine for the Cultural Corpus Collection Platform
+Reads each submissions column at most once per data version (only the columns a
+metric uses), parses timestamps once and computes every metric family from that
+single snapshot
+"""
+
+import copy
+import threading
+from typing import Callable, Dict, List, Optional
+
+import pandas as pd
+
+from data_cache import get_or_compute
+from storage_backend import get_backend
+
+class AnalyticsSnapshot:
+    """Responses columns loaded on demand, plus lazily derived columns and memoized metrics"""
+
+    def __init__(self, read_columns: Callable[[Optional[List[str]]], pd.DataFrame]):
+        self._read_columns = read_columns
+        self._columns: Dict[str, pd.Series] = {}
+        self._rows: Optional[int] = None
+        self._derived = {}
+        self._metrics = {}
+        self._lock = threading.Lock()
+        self._load_lock = threading.RLock()
+
+    def _read(self, columns: Optional[List[str]]) -> pd.DataFrame:
+        try:
+            df = self._read_columns(columns)
+        except Exception:
+            return pd.DataFrame()
+
+        # Columns are read lazily, so later reads may include rows appended since
+        # the first one; the table is append-only, so keeping the first N rows
+        # keeps every column of this snapshot aligned
+        if self._rows is None:
+            self._rows = len(df)
+        return df.iloc[:self._rows].reset_index(drop=True)
+
+    def frame(self, *columns: str) -> pd.DataFrame:
+        """A frame with just the given columns (each column is read once per snapshot)"""
+        with self._load_lock:
+            missing = [column for column in columns if column not in self._columns]
+            if missing:
+                loaded = self._read(missing)
+                for column in loaded.columns:
+                    self._columns[column] = loaded[column]
+            return pd.DataFrame({column: self._columns[column] for column in columns if column in self._columns})
+
+    @property
+    def df(self) -> pd.DataFrame:
+        """The full responses table"""
+        with self._load_lock:
+            return self._derive('df', lambda: self._read(None))
+
+    def _derive(self, name: str, compute: Callable):
+        if name not in self._derived:
+            self._derived[name] = compute()
+        return self._derived[name]
+
+    @property
+    def timestamps(self) -> pd.Series:
+        """Parsed submission timestamps (parsed once per snapshot)"""
+        return self._derive('timestamps', lambda: pd.to_datetime(
+            self.frame('timestamp')['timestamp'], format='ISO8601', errors='coerce'
+        ))
+
+    @property
+    def dates(self) -> pd.Series:
+        """Submission dates derived from the parsed timestamps"""
+        return self._derive('dates', lambda: self.timestamps.dt.date)
+
+    def metric(self, name: str) -> Dict:
+        """Compute a metric family once per snapshot and return a private copy"""
+        with self._lock:
+            if name not in self._metrics:
+                try:
+                    self._metrics[name] = METRIC_FAMILIES[name](self)
+                except Exception:
+                    self._metrics[name] = {}
+            return copy.deepcopy(self._metrics[name])
+
+def get_analytics_snapshot() -> Optional[AnalyticsSnapshot]:
+    """Return the snapshot for the current data version, re-reading the data only when it changed"""
+    version = get_backend().responses_version()
+    if version is None:
+        return None
+
+    return get_or_compute('get_analytics_snapshot', ('analytics_snapshot',), version,
+                          lambda: AnalyticsSnapshot(get_backend().read_responses), copy_result=False)
+
+def get_metric(name: str) -> Dict:
+    """Get a single metric family for the current data version"""
+    snapshot = get_analytics_snapshot()
+    if snapshot is None:
+        return {}
+    return snapshot.metric(name)
+
+# Metric families
+
+def _user_engagement(snapshot: AnalyticsSnapshot) -> Dict:
+    """Unique contributors, sessions and session duration"""
+    df = snapshot.frame('contributor_name', 'session_id')
+    named = df['contributor_name'] != ''
+
+    # Unique contributors (by name)
+    unique_contributors = df.loc[named, 'contributor_name'].nunique()
+
+    # Unique sessions
+    unique_sessions = df['session_id'].nunique()
+
+    # Anonymous vs named submissions
+    anonymous_count = int((~named).sum())
+    named_count = int(named.sum())
+
+    # Average submissions per session
+    avg_per_session = len(df) / unique_sessions if unique_sessions > 0 else 0
+
+    # Most active contributors
+    active_contributors = df.loc[named, 'contributor_name'].value_counts().head(5).to_dict()
+
+    # Session duration analysis (if multiple submissions per session)
+    session_times = snapshot.timestamps.groupby(df['session_id']).agg(['min', 'max'])
+    duration_minutes = (session_times['max'] - session_times['min']).dt.total_seconds() / 60
+    avg_session_duration = duration_minutes.mean()
+
+    return {
+        'unique_contributors': unique_contributors,
+        'unique_sessions': unique_sessions,
+        'anonymous_submissions': anonymous_count,
+        'named_submissions': named_count,
+        'avg_submissions_per_session': round(avg_per_session, 2),
+        'avg_session_duration': round(avg_session_duration, 2),
+        'active_contributors': active_contributors
+    }
+
+def _content_analysis(snapshot: AnalyticsSnapshot) -> Dict:
+    """Description length, language and category diversity"""
+    df = snapshot.frame('description', 'language', 'category', 'media_type')
+
+    # Description length analysis
+    description_length = df['description'].str.len()
+
+    # Language diversity
+    language_counts = df['language'].value_counts()
+
+    # Category diversity
+    category_counts = df['category'].value_counts()
+
+    return {
+        'avg_description_length': round(description_length.mean(), 2),
+        'max_description_length': description_length.max(),
+        'min_description_length': description_length.min(),
+        'total_languages': len(language_counts),
+        'most_common_language': language_counts.index[0] if len(language_counts) > 0 else None,
+        'total_categories': len(category_counts),
+        'most_common_category': category_counts.index[0] if len(category_counts) > 0 else None,
+        'media_type_distribution': df['media_type'].value_counts().to_dict()
+    }
+
+def _popular_media(snapshot: AnalyticsSnapshot) -> Dict:
+    """Most popular media files and media types"""
+    df = snapshot.frame('media_filename', 'media_type')
+    return {
+        'popular_media': df['media_filename'].value_counts().head(10).to_dict(),
+        'media_type_popularity': df['media_type'].value_counts().to_dict()
+    }
+
+def _growth_metrics(snapshot: AnalyticsSnapshot) -> Dict:
+    """Daily, weekly and monthly growth"""
+    timestamps = snapshot.timestamps
+    dates = snapshot.dates
+
+    # Daily growth
+    daily_growth = dates.value_counts().sort_index()
+    daily_growth_records = [
+        {'date': str(date), 'submissions': count} for date, count in daily_growth.items()
+    ]
+
+    # Weekly growth
+    iso = timestamps.dt.isocalendar()
+    weekly_growth = pd.DataFrame({'year': timestamps.dt.year, 'week': iso.week}).groupby(['year', 'week']).size()
+    weekly_growth_records = [
+        {'year': year, 'week': week, 'submissions': count} for (year, week), count in weekly_growth.items()
+    ]
+
+    # Monthly growth
+    monthly_growth = timestamps.dt.to_period('M').value_counts().sort_index()
+    monthly_growth_records = [
+        {'month': str(month), 'submissions': count} for month, count in monthly_growth.items()
+    ]
+
+    # Growth rate calculation
+    total_submissions = len(timestamps)
+    first_submission_date = dates.min()
+    last_submission_date = dates.max()
+
+    if first_submission_date and last_submission_date:
+        days_active = (last_submission_date - first_submission_date).days
+        avg_daily_submissions = total_submissions / days_active if days_active > 0 else 0
+    else:
+        avg_daily_submissions = 0
+
+    return {
+        'total_submissions': total_submissions,
+        'first_submission_date': str(first_submission_date) if first_submission_date else None,
+        'last_submission_date': str(last_submission_date) if last_submission_date else None,
+        'avg_daily_submissions': round(avg_daily_submissions, 2),
+        'daily_growth': daily_growth_records,
+        'weekly_growth': weekly_growth_records,
+        'monthly_growth': monthly_growth_records
+    }
+
+def _quality_metrics(snapshot: AnalyticsSnapshot) -> Dict:
+    """Completeness and validation status"""
+    df = snapshot.frame('title', 'description', 'category', 'language', 'latitude', 'longitude', 'validation_status')
+
+    # Completeness metrics
+    total_records = len(df)
+    complete_records = int(df[['title', 'description', 'category']].notna().all(axis=1).sum())
+    completeness_rate = (complete_records / total_records) * 100 if total_records > 0 else 0
+
+    # Language, category and geolocation completeness
+    language_completeness = (df['language'].notna().sum() / total_records) * 100 if total_records > 0 else 0
+    category_completeness = (df['category'].notna().sum() / total_records) * 100 if total_records > 0 else 0
+    geo_completeness = (df['latitude'].notna() & df['longitude'].notna()).sum() / total_records * 100 if total_records > 0 else 0
+
+    return {
+        'total_records': total_records,
+        'complete_records': complete_records,
+        'completeness_rate': round(completeness_rate, 2),
+        'validation_status_distribution': df['validation_status'].value_counts().to_dict(),
+        'language_completeness': round(language_completeness, 2),
+        'category_completeness': round(category_completeness, 2),
+        'geo_completeness': round(geo_completeness, 2)
+    }
+
+def _category_analytics(snapshot: AnalyticsSnapshot) -> Dict:
+    """Category distribution by language and media type"""
+    df = snapshot.frame('category', 'language', 'media_type')
+
+    # observed=True: categorical columns would otherwise add every unseen combination
+    category_language = df.groupby(['category', 'language'], observed=True).size().reset_index()
+    category_language.columns = ['category', 'language', 'count']
+
+    category_media = df.groupby(['category', 'media_type'], observed=True).size().reset_index()
+    category_media.columns = ['category', 'media_type', 'count']
+
+    return {
+        'category_distribution': df['category'].value_counts().to_dict(),
+        'category_language': category_language.to_dict('records'),
+        'category_media': category_media.to_dict('records')
+    }
+
+def _contributor_analytics(snapshot: AnalyticsSnapshot) -> Dict:
+    """Top contributors and anonymous ratio"""
+    df = snapshot.frame('contributor_name')
+    named = df['contributor_name'] != ''
+
+    anonymous_count = int((~named).sum())
+    anonymous_ratio = (anonymous_count / len(df)) * 100 if len(df) > 0 else 0
+
+    return {
+        'top_contributors': df.loc[named, 'contributor_name'].value_counts().head(10).to_dict(),
+        'total_contributors': df.loc[named, 'contributor_name'].nunique(),
+        'anonymous_ratio': round(anonymous_ratio, 2),
+        'named_submissions': int(named.sum()),
+        'anonymous_submissions': anonymous_count
+    }
+
+def _geo_analytics(snapshot: AnalyticsSnapshot) -> Dict:
+    """Geographic distribution of submissions with coordinates"""
+    df = snapshot.frame('latitude', 'longitude')
+
+    # Filter records with valid coordinates
+    geo_df = df[df['latitude'].notna() & df['longitude'].notna()]
+
+    if len(geo_df) == 0:
+        return {'message': 'No geographical data available'}
+
+    geo_distribution = {
+        'total_geo_records': len(geo_df),
+        'avg_latitude': geo_df['latitude'].mean(),
+        'avg_longitude': geo_df['longitude'].mean(),
+        'min_latitude': geo_df['latitude'].min(),
+        'max_latitude': geo_df['latitude'].max(),
+        'min_longitude': geo_df['longitude'].min(),
+        'max_longitude': geo_df['longitude'].max()
+    }
+
+    # Regional analysis (simplified)
+    latitude = geo_df['latitude']
+    region = pd.Series('Central', index=geo_df.index)
+    region[latitude > 20] = 'North'
+    region[latitude < 15] = 'South'
+
+    return {
+        'geo_distribution': geo_distribution,
+        'regional_distribution': region.value_counts().to_dict()
+    }
+
+METRIC_FAMILIES = {
+    'user_engagement': _user_engagement,
+    'content_analysis': _content_analysis,
+    'popular_media': _popular_media,
+    'growth_metrics': _growth_metrics,
+    'quality_metrics': _quality_metrics,
+    'category_analytics': _category_analytics,
+    'contributor_analytics': _contributor_analytics,
+    'geo_analytics': _geo_analytics
+}
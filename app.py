@@ -9,6 +9,8 @@ from utils import (
     get_available_media,
     get_session_id,
     get_submission_count,
+    get_language_stats,
+    get_contributor_stats,
     get_comprehensive_analytics,
     get_time_based_analytics,
     get_user_engagement_metrics,
@@ -19,10 +21,21 @@ from utils import (
     get_media_type,
     validate_media_file,
     save_uploaded_file,
+    store_uploaded_file,
+    UploadTooLargeError,
     get_idi_emiti_count,
     get_idi_emiti_languages,
     get_user_idi_emiti_count,
     get_idi_emiti_analytics,
+    get_idi_emiti_vocabulary,
+    get_possible_duplicates,
+    get_cache_stats,
+    load_responses,
+    query_submissions,
+    search_submissions,
+    get_category_stats,
+    get_media_type_stats,
+    get_validation_status_stats,
     display_storage_status
 )
 from language_manager import (
@@ -36,14 +49,15 @@ from language_manager import (
 from audio_recorder import audio_recorder_component, get_recorded_audio, has_recorded_audio, clear_recorded_audio, save_recorded_audio_to_file
 from config import (
     APP_TITLE, APP_ICON, APP_DESCRIPTION, ADMIN_USERNAME, ADMIN_PASSWORD, ADMIN_SESSION_KEY,
-    ASSETS_FOLDER, DATA_FOLDER, CSV_FILE, UPLOADS_FOLDER, IMAGE_EXTENSIONS, AUDIO_EXTENSIONS, VIDEO_EXTENSIONS,
+    ASSETS_FOLDER, DATA_FOLDER, UPLOADS_FOLDER, IMAGE_EXTENSIONS, AUDIO_EXTENSIONS, VIDEO_EXTENSIONS,
     MAX_FORM_WIDTH, IMAGE_CAPTION, TEXT_AREA_HEIGHT, NAME_PLACEHOLDER,
     DESCRIPTION_PLACEHOLDER, USER_DETAILS_PLACEHOLDER, LATITUDE_PLACEHOLDER,
     LONGITUDE_PLACEHOLDER, TITLE_PLACEHOLDER, CATEGORY_PLACEHOLDER, CATEGORIES, LANGUAGES,
     SUCCESS_MESSAGE, INFO_MESSAGE, ERROR_NO_DESCRIPTION, ERROR_NO_MEDIA,
     ERROR_INVALID_FILE, ERROR_FILE_TOO_LARGE, ERROR_NO_TITLE, ERROR_NO_CATEGORY,
     ADMIN_LOGIN_ERROR, ADMIN_ACCESS_DENIED, CUSTOM_CSS, RECENT_RESPONSES_LIMIT,
-    MEDIA_TYPES, MAX_IMAGE_SIZE, MAX_AUDIO_SIZE, MAX_VIDEO_SIZE
+    MEDIA_TYPES, MAX_IMAGE_SIZE, MAX_AUDIO_SIZE, MAX_VIDEO_SIZE, IDI_EMITI_PREFETCH,
+    SUBMISSIONS_PAGE_SIZES, SUBMISSIONS_SORT_COLUMNS, EXPORT_FORMATS, EXPORT_MAX_DOWNLOAD_SIZE
 )
 from auth import (
     check_user_authentication,
@@ -52,6 +66,8 @@ from auth import (
     render_user_profile,
     logout_user
 )
+from csv_user_manager import get_session_reaper_stats
+from app_init import initialize_app
 import hashlib
 import streamlit.components.v1 as components
 
@@ -435,6 +451,9 @@ def initialize_session_state():
         st.session_state.submission_count = get_submission_count()
 
 def main():
+    # Create storage files and start background maintenance (once per process)
+    initialize_app()
+    
     # Initialize session state
     initialize_session_state()
     
@@ -574,6 +593,9 @@ def authenticate_admin(username, password):
 
 def cultural_corpus_page(user=None):
     """Main cultural corpus collection page"""
+    # Imaging modules are loaded only by the pages that show images
+    from renditions import get_rendition, preview_image
+    
     # Require authentication
     if not user:
         st.error("🔐 Authentication Required")
@@ -641,7 +663,7 @@ def cultural_corpus_page(user=None):
         
         if uploaded_file is not None:
             # Validate file
-            file_size = len(uploaded_file.getbuffer())
+            file_size = uploaded_file.size
             is_valid, validation_message = validate_media_file(uploaded_file.name, file_size)
             
             if not is_valid:
@@ -653,7 +675,7 @@ def cultural_corpus_page(user=None):
             st.markdown(f"### 📺 {get_text('media_preview')}")
             
             if media_type == "image":
-                st.image(uploaded_file, caption="Uploaded Image", use_container_width=True)
+                st.image(preview_image(uploaded_file), caption="Uploaded Image", use_container_width=True)
             elif media_type == "audio":
                 st.audio(uploaded_file)
             elif media_type == "video":
@@ -788,7 +810,7 @@ def cultural_corpus_page(user=None):
                     
                     try:
                         # Save uploaded file
-                        filename, file_path = save_uploaded_file(uploaded_file, media_type)
+                        filename, file_path, file_size, file_sha256 = store_uploaded_file(uploaded_file, media_type)
                         
                         # Save audio recording if provided (for images)
                         audio_filename = None
@@ -812,6 +834,7 @@ def cultural_corpus_page(user=None):
                             longitude=longitude,
                             file_size=file_size,
                             file_path=file_path,
+                            file_sha256=file_sha256,
                             local_language_name=local_language_name if media_type == "image" else None,
                             dialect_regional_variation=dialect if media_type == "image" else None,
                             pronunciation_guide=pronunciation_guide if media_type == "image" else None,
@@ -829,6 +852,8 @@ def cultural_corpus_page(user=None):
                         # Clear form
                         st.rerun()
                         
+                    except UploadTooLargeError as e:
+                        st.error(f"{ERROR_FILE_TOO_LARGE} ({e})")
                     except Exception as e:
                         st.error(f"Error saving data: {str(e)}")
         
@@ -844,7 +869,7 @@ def cultural_corpus_page(user=None):
                 st.markdown(f"#### 📺 Sample {MEDIA_TYPES.get(media_type, 'Media')}")
                 
                 if media_type == "image":
-                    st.image(random_media, caption="Sample Cultural Object", use_container_width=True)
+                    st.image(get_rendition(random_media), caption="Sample Cultural Object", use_container_width=True)
                 elif media_type == "audio":
                     st.audio(random_media)
                 elif media_type == "video":
@@ -886,9 +911,53 @@ def cultural_corpus_page(user=None):
         
         st.markdown("</div>", unsafe_allow_html=True)
 
+def get_idi_emiti_object():
+    """Get the object shown in Idi-Emiti, keeping the next few scheduled with warm renditions"""
+    from object_scheduler import next_object
+    from renditions import prefetch_renditions
+    
+    # Objects already shown or queued in this session are not repeated until all were seen
+    seen = st.session_state.setdefault('idi_emiti_seen', set())
+    queue = st.session_state.setdefault('idi_emiti_queue', [])
+    current = st.session_state.get('idi_emiti_object')
+    
+    if current is None or not os.path.exists(current):
+        current = None
+        while queue and current is None:
+            candidate = queue.pop(0)
+            if os.path.exists(candidate):
+                current = candidate
+        if current is None:
+            current = next_object(seen)
+            if current is None and seen:
+                seen.clear()
+                seen.update(queue)
+                current = next_object(seen)
+            if current is not None:
+                seen.add(current)
+        st.session_state.idi_emiti_object = current
+    
+    # Schedule upcoming objects ahead of time and render them in the background
+    upcoming = []
+    while current is not None and len(queue) < IDI_EMITI_PREFETCH:
+        next_path = next_object(seen)
+        if next_path is None:
+            break
+        seen.add(next_path)
+        queue.append(next_path)
+        upcoming.append(next_path)
+    prefetch_renditions(upcoming)
+    
+    return current
+
+def advance_idi_emiti_object():
+    """Show a different object on the next rerun"""
+    st.session_state.idi_emiti_object = None
+
 def idi_emiti_page(user=None):
     """Idi-Emiti (What is this?) page - Cultural object identification game"""
     import os  # Add missing import
+    from renditions import load_rendition
     
     # Require authentication
     if not user:
@@ -924,23 +993,24 @@ def idi_emiti_page(user=None):
         4. **Help preserve culture** - Your contribution helps document linguistic diversity
         """)
         
-        # Get random image from assets
-        random_image = get_random_media()
+        # Get the next image chosen by the coverage-aware scheduler
+        random_image = get_idi_emiti_object()
         
-        if random_image and get_media_type(random_image) == "image":
+        if random_image:
             # Display the image with skip button below
             st.markdown(f"### 🖼️ {get_text('what_is_this')}")
             
             col1, col2 = st.columns([2, 1])
             
             with col1:
-                st.image(random_image, caption="Traditional Cultural Object", use_container_width=True)
+                st.image(load_rendition(random_image), caption="Traditional Cultural Object", use_container_width=True)
                 
                 # Skip button below the image
                 st.markdown("---")
                 skip_col1, skip_col2, skip_col3 = st.columns([1, 1, 1])
                 with skip_col2:
                     if st.button(f"⏭️ {get_text('skip_object')}", use_container_width=True, help="Skip to a different cultural object"):
+                        advance_idi_emiti_object()
                         st.rerun()
             
             with col2:
@@ -1070,6 +1140,8 @@ def idi_emiti_page(user=None):
                                 st.success("✅ Uploaded audio file saved successfully!")
                                 # Clear the session state after successful save
                                 del st.session_state['idi_emiti_audio_file']
+                            except UploadTooLargeError as e:
+                                st.error(f"{ERROR_FILE_TOO_LARGE} ({e})")
                             except Exception as e:
                                 st.error(f"❌ Error saving uploaded audio: {str(e)}")
                         
@@ -1123,6 +1195,7 @@ def idi_emiti_page(user=None):
                         
                         # Set success flag in session state
                         st.session_state.identification_success = True
+                        advance_idi_emiti_object()
                         st.rerun()
                         
                     except Exception as e:
@@ -1144,8 +1217,13 @@ def idi_emiti_page(user=None):
                 elif new_object_button:
                     # Show new object
                     st.success("🆕 Loading a new cultural object...")
+                    advance_idi_emiti_object()
                     st.rerun()
         
+        else:
+            st.warning("No cultural object images found in the assets folder.")
+            st.info("Please add some traditional cultural object images to the assets folder to enable this feature.")
+        
         # Handle success message and next object button (outside form context)
         if st.session_state.get('identification_success', False):
             st.success("🎉 Thank you for your contribution!")
@@ -1155,10 +1233,6 @@ def idi_emiti_page(user=None):
                 st.session_state.identification_success = False
                 st.rerun()
         
-        else:
-            st.warning("No cultural object images found in the assets folder.")
-            st.info("Please add some traditional cultural object images to the assets folder to enable this feature.")
-        
         # User contribution message
         st.markdown("---")
         st.markdown("### 🎯 Your Contribution")
@@ -1269,12 +1343,11 @@ def landing_page():
     
     # Key Statistics
     try:
-        analytics = get_comprehensive_analytics()
-        total_submissions = analytics.get('growth_metrics', {}).get('total_submissions', 0)
-        unique_contributors = analytics.get('user_engagement', {}).get('unique_contributors', 0)
-        languages_documented = analytics.get('content_analysis', {}).get('total_languages', 0)
-        idi_emiti_stats = get_idi_emiti_analytics()
-        cultural_identifications = idi_emiti_stats.get('total_identifications', 0)
+        # Served from the incrementally maintained aggregate counters
+        total_submissions = get_submission_count()
+        unique_contributors = len(get_contributor_stats())
+        languages_documented = len(get_language_stats())
+        cultural_identifications = get_idi_emiti_count()
     except:
         total_submissions = 0
         unique_contributors = 0
@@ -1674,8 +1747,126 @@ def authentication_page(auth_type):
         
         st.markdown("</div>", unsafe_allow_html=True)
 
+def render_submissions_browser():
+    """Filterable, sortable submissions table that loads one page at a time"""
+    from media_worker import attach_media_metadata
+    
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        categories = st.multiselect("Category", sorted(get_category_stats()), key="browse_category")
+    with col2:
+        languages = st.multiselect("Language", sorted(get_language_stats()), key="browse_language")
+    with col3:
+        media_types = st.multiselect("Media Type", sorted(get_media_type_stats()), key="browse_media_type")
+    with col4:
+        statuses = st.multiselect("Validation Status", sorted(get_validation_status_stats()), key="browse_status")
+    
+    col1, col2, col3, col4, col5 = st.columns([2, 1, 1, 1, 1])
+    with col1:
+        contributor = st.text_input("Contributor (name or email)", key="browse_contributor")
+    with col2:
+        date_from = st.date_input("From", value=None, key="browse_date_from")
+    with col3:
+        date_to = st.date_input("To", value=None, key="browse_date_to")
+    with col4:
+        sort_by = st.selectbox("Sort by", SUBMISSIONS_SORT_COLUMNS, key="browse_sort_by")
+    with col5:
+        descending = st.selectbox("Order", ["Descending", "Ascending"], key="browse_order") == "Descending"
+    
+    filters = {
+        'category': categories,
+        'language': languages,
+        'media_type': media_types,
+        'validation_status': statuses,
+        'contributor': contributor,
+        'date_from': date_from,
+        'date_to': date_to
+    }
+    
+    col1, col2 = st.columns([1, 3])
+    with col1:
+        page_size = st.selectbox("Rows per page", SUBMISSIONS_PAGE_SIZES, key="browse_page_size")
+    
+    # Filtering can leave fewer pages than the page last viewed
+    page = st.session_state.get('browse_page', 1)
+    df, total = query_submissions(filters, sort_by, descending, page, page_size)
+    pages = max(1, -(-total // page_size))
+    if page > pages:
+        st.session_state.browse_page = page = pages
+        df, total = query_submissions(filters, sort_by, descending, page, page_size)
+    
+    with col2:
+        st.number_input(f"Page (of {pages})", min_value=1, max_value=pages, step=1, key="browse_page")
+    
+    if total == 0:
+        st.info("No submissions found")
+        return
+    
+    first = (page - 1) * page_size + 1
+    st.caption(f"Showing {first}–{first + len(df) - 1} of {total} submissions")
+    st.dataframe(attach_media_metadata(df), use_container_width=True)
+
+def render_submission_search():
+    """Full-text search box with ranked results"""
+    from media_worker import attach_media_metadata
+    
+    query = st.text_input("🔍 Search submissions",
+                          placeholder="Words from titles, descriptions, local names or cultural context",
+                          key="search_query")
+    if not query.strip():
+        return
+    
+    found = search_submissions(query)
+    if found['total'] == 0:
+        st.info("No submissions match all of these words")
+        return
+    
+    shown = len(found['results'])
+    st.caption(f"{found['total']} matches in {found['elapsed_ms']} ms"
+               + (f" · showing the best {shown}" if shown < found['total'] else ""))
+    st.dataframe(attach_media_metadata(found['results']), use_container_width=True)
+
+def render_corpus_export():
+    """Export options, the export run and downloads of finished archives"""
+    from corpus_export import export_corpus, list_exports
+    
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        formats = st.multiselect("Formats", EXPORT_FORMATS, default=EXPORT_FORMATS, key="export_formats")
+    with col2:
+        approved_only = st.checkbox("Approved submissions only", key="export_approved_only")
+    with col3:
+        include_media = st.checkbox("Include media files in the archive", key="export_include_media")
+    
+    if st.button("▶️ Start Export", disabled=not formats):
+        with st.spinner("Exporting corpus..."):
+            try:
+                summary = export_corpus(formats, approved_only, archive=True, include_media=include_media)
+                st.success(f"✅ Exported {summary['rows']} submissions and {summary['media_files']} media references "
+                           f"in {summary['duration_seconds']}s")
+                if summary['missing_media']:
+                    st.warning(f"{summary['missing_media']} referenced media files are missing (see the manifest)")
+            except (OSError, ValueError) as e:
+                st.error(f"Export failed: {e}")
+    
+    for export in list_exports()[:5]:
+        archive = export['archive']
+        label = f"{export['name']} · {export['rows']} submissions · {', '.join(export['formats'])}"
+        if archive is None:
+            st.caption(label)
+        elif os.path.getsize(archive) > EXPORT_MAX_DOWNLOAD_SIZE:
+            st.caption(f"{label} · too large to download here, saved at {archive}")
+        else:
+            with open(archive, 'rb') as f:
+                st.download_button(f"⬇️ {label}", f, file_name=os.path.basename(archive),
+                                   mime="application/zip", key=f"download_{export['name']}")
+
 def admin_panel_page():
     """Admin panel page"""
+    from media_worker import get_media_worker_stats
+    from object_scheduler import get_object_coverage
+    from renditions import get_rendition
+    
     st.markdown(f"""
     <div class="hero-section">
         <h1 class="hero-title">🔧 {get_text('admin_panel')}</h1>
@@ -1702,6 +1893,9 @@ def admin_panel_page():
         
         if st.button("📈 Generate Analytics Report"):
             st.session_state.generate_report = True
+        
+        if st.button("📦 Export Corpus"):
+            st.session_state.show_export = True
     
     with col2:
         if st.button("🗑️ Clear All Data", key="clear_data"):
@@ -1717,14 +1911,18 @@ def admin_panel_page():
             st.session_state[ADMIN_SESSION_KEY] = False
             st.rerun()
     
+    st.markdown("### 🔍 Search Submissions")
+    render_submission_search()
+    
     # Show submissions if requested
     if st.session_state.get('show_submissions', False):
         st.markdown("### 📋 All Submissions")
-        try:
-            df = pd.read_csv(CSV_FILE)
-            st.dataframe(df, use_container_width=True)
-        except:
-            st.info("No submissions found")
+        render_submissions_browser()
+    
+    # Export the corpus if requested
+    if st.session_state.get('show_export', False):
+        st.markdown("### 📦 Export Corpus")
+        render_corpus_export()
     
     # Generate report if requested
     if st.session_state.get('generate_report', False):
@@ -1884,10 +2082,41 @@ def admin_panel_page():
             confidence_data = idi_emiti_stats['confidence_distribution']
             st.bar_chart(confidence_data)
         
+        # Per-object coverage used by the Idi-Emiti scheduler
+        st.markdown("#### 🗺️ Object Coverage")
+        coverage = get_object_coverage()
+        if coverage:
+            coverage_df = pd.DataFrame(coverage)[['path', 'identifications', 'dialects', 'share']]
+            coverage_df.columns = ['Object', 'Identifications', 'Dialects', 'Chance Shown (%)']
+            st.dataframe(coverage_df, use_container_width=True)
+        
+        # Names given for one object, with spelling and script variants grouped
+        st.markdown("#### 🗣️ Object Vocabulary")
+        identified = [obj['path'] for obj in coverage if obj['identifications']] if coverage else []
+        if identified:
+            object_path = st.selectbox("Object", sorted(identified), key="vocabulary_object")
+            col1, col2 = st.columns([1, 3])
+            with col1:
+                st.image(get_rendition(object_path), use_container_width=True)
+            with col2:
+                names = get_idi_emiti_vocabulary(object_path)
+                if names:
+                    vocabulary_df = pd.DataFrame([{
+                        'Name': name['name'],
+                        'Submissions': name['submissions'],
+                        'Variants': ', '.join(f"{form} ({count})" for form, count in name['variants'].items()),
+                        'Pronunciations': ', '.join(name['pronunciations'])
+                    } for name in names])
+                    st.dataframe(vocabulary_df, use_container_width=True, hide_index=True)
+                else:
+                    st.info("No local names recorded for this object")
+        else:
+            st.info("No objects identified yet")
+        
         # Recent Idi-Emiti submissions
         st.markdown("#### 📝 Recent Identifications")
         try:
-            df = pd.read_csv(CSV_FILE)
+            df = load_responses()
             idi_emiti_df = df[df['category'] == 'Cultural Identification'].tail(10)
             if not idi_emiti_df.empty:
                 display_df = idi_emiti_df[['timestamp', 'contributor_name', 'local_language_name', 'dialect_regional_variation', 'cultural_context']].copy()
@@ -1899,6 +2128,66 @@ def admin_panel_page():
             st.info("No identification data available")
     else:
         st.info("No Idi-Emiti data available yet. Encourage users to participate in the cultural identification game!")
+    
+    # Near-duplicate uploads for curators to review
+    st.markdown("---")
+    st.markdown("### 🪞 Possible Duplicates")
+    st.markdown("Uploaded images that look alike, such as re-compressed, resized or re-framed copies.")
+    
+    duplicate_pairs, total_pairs = get_possible_duplicates()
+    if duplicate_pairs:
+        st.caption(f"Showing {len(duplicate_pairs)} of {total_pairs} pairs, most similar first")
+        for pair in duplicate_pairs:
+            st.markdown(f"**{pair['distance']} of 64 hash bits differ**")
+            col1, col2 = st.columns(2)
+            for col, side in ((col1, 'a'), (col2, 'b')):
+                with col:
+                    st.image(get_rendition(pair[f'path_{side}']), caption=pair[f'path_{side}'],
+                             use_container_width=True)
+                    for submission in pair[f'submissions_{side}']:
+                        st.caption(submission)
+    else:
+        st.info("No possible duplicates among the processed images")
+    
+    # Reader cache statistics (for tuning)
+    with st.expander("⚙️ Cache Statistics"):
+        cache_stats = get_cache_stats()
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.metric("Cache Hits", cache_stats['hits'])
+        with col2:
+            st.metric("Cache Misses", cache_stats['misses'])
+        with col3:
+            st.metric("Hit Rate", f"{cache_stats['hit_rate']}%")
+        if cache_stats['by_function']:
+            st.dataframe(
+                pd.DataFrame.from_dict(cache_stats['by_function'], orient='index'),
+                use_container_width=True
+            )
+    
+    with st.expander("🧹 Session Reaper"):
+        reaper_stats = get_session_reaper_stats()
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.metric("Active Sessions", reaper_stats['active_sessions'])
+        with col2:
+            st.metric("Reaper Runs", reaper_stats['runs'])
+        with col3:
+            st.metric("Sessions Reaped", reaper_stats['total_reaped'])
+        if reaper_stats['history']:
+            st.dataframe(pd.DataFrame(reaper_stats['history']), use_container_width=True)
+    
+    with st.expander("🛠️ Media Processing"):
+        media_stats = get_media_worker_stats()
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.metric("Pending", media_stats['pending'])
+        with col2:
+            st.metric("Processed", media_stats['completed'])
+        with col3:
+            st.metric("Failed", media_stats['failed'])
+        if media_stats['recent']:
+            st.dataframe(pd.DataFrame(media_stats['recent']), use_container_width=True)
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
@@ -0,0 +1,25 @@
+"""
+Explicit startup step for the Cultural Corpus Collection Platform
+Importing the app's modules has no file or thread side effects; the storage
+files and the session reaper are set up here, once per process, before the
+first page is drawn.
+"""
+
+import threading
+
+from csv_user_manager import initialize_storage, start_session_reaper
+
+_initialized = False
+_init_lock = threading.Lock()
+
+def initialize_app():
+    """Create the data files and start background maintenance (only the first call does anything)"""
+    global _initialized
+    if _initialized:
+        return
+
+    with _init_lock:
+        if not _initialized:
+            initialize_storage()
+            start_session_reaper()
+            _initialized = True
@@ -0,0 +1,204 @@
+"""
+Columnar snapshot of user_responses.csv for analytics reads
+The CSV stays the append-only ingestion log; a Parquet copy stores the same rows
+column by column (low-cardinality columns dictionary-encoded) so metrics read
+only the columns they use. Rows appended since the last refresh are read from
+the end of the CSV, so results are never stale. Row groups are kept small, so
+a page of the admin submissions browser decodes only the groups it touches.
+
+Usage:
+    python columnar_snapshot.py refresh   # rebuild data/user_responses.parquet now
+"""
+
+import argparse
+import importlib.util
+import io
+import json
+import os
+import time
+from bisect import bisect_right
+from typing import Dict, List, Optional
+
+import pandas as pd
+
+# pyarrow is imported on first use, so importing this module stays cheap
+PYARROW_AVAILABLE = importlib.util.find_spec('pyarrow') is not None
+
+from config import (
+    CSV_FILE, RESPONSES_SNAPSHOT_FILE, SNAPSHOT_CATEGORICAL_COLUMNS,
+    SNAPSHOT_REFRESH_INTERVAL, SNAPSHOT_MAX_TAIL_BYTES, SNAPSHOT_ROW_GROUP_SIZE
+)
+from file_lock import file_lock, atomic_write
+
+METADATA_KEY = b'user_responses_source'
+
+def _categorize(df: pd.DataFrame) -> pd.DataFrame:
+    """Store low-cardinality columns as categoricals (dictionary-encoded in Parquet)"""
+    for column in SNAPSHOT_CATEGORICAL_COLUMNS:
+        if column in df.columns and df[column].dtype != 'category':
+            df[column] = df[column].astype('category')
+    return df
+
+def refresh_snapshot() -> Dict:
+    """Rewrite the Parquet snapshot from the full CSV"""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    with file_lock(CSV_FILE):
+        stat = os.stat(CSV_FILE)
+        df = _categorize(pd.read_csv(CSV_FILE))
+
+        source = {'inode': stat.st_ino, 'source_size': stat.st_size, 'rows': len(df), 'created_at': time.time()}
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        table = table.replace_schema_metadata({
+            **(table.schema.metadata or {}),
+            METADATA_KEY: json.dumps(source).encode()
+        })
+
+        with atomic_write(RESPONSES_SNAPSHOT_FILE, 'wb') as f:
+            pq.write_table(table, f, row_group_size=SNAPSHOT_ROW_GROUP_SIZE)
+
+    return source
+
+def _open_snapshot():
+    """Open the snapshot and its source metadata from one file handle (None if unusable)"""
+    import pyarrow.parquet as pq
+
+    try:
+        parquet_file = pq.ParquetFile(RESPONSES_SNAPSHOT_FILE)
+        source = json.loads(parquet_file.schema_arrow.metadata[METADATA_KEY])
+        return parquet_file, source
+    except Exception:
+        return None, None
+
+def _needs_refresh(source: Optional[Dict], stat: os.stat_result) -> bool:
+    if source is None:
+        return True
+    # A different inode or a shorter file means the CSV was rewritten (e.g. migrated)
+    if source['inode'] != stat.st_ino or source['source_size'] > stat.st_size:
+        return True
+
+    tail_bytes = stat.st_size - source['source_size']
+    if tail_bytes > SNAPSHOT_MAX_TAIL_BYTES:
+        return True
+    return tail_bytes > 0 and time.time() - source['created_at'] > SNAPSHOT_REFRESH_INTERVAL
+
+def _read_tail(offset: int, columns: Optional[List[str]]) -> Optional[pd.DataFrame]:
+    """Parse only the rows appended to the CSV after offset"""
+    with open(CSV_FILE, 'rb') as f:
+        header = f.readline()
+        f.seek(offset)
+        tail = f.read()
+
+    if not tail.strip():
+        return None
+
+    available = pd.read_csv(io.BytesIO(header), nrows=0).columns
+    usecols = None if columns is None else [column for column in columns if column in available]
+    return pd.read_csv(io.BytesIO(header + tail), usecols=usecols)
+
+def read_csv_columns(columns: Optional[List[str]] = None) -> pd.DataFrame:
+    """Read selected columns straight from the CSV (used when pyarrow is not installed)"""
+    if columns is None:
+        return pd.read_csv(CSV_FILE)
+
+    available = pd.read_csv(CSV_FILE, nrows=0).columns
+    return pd.read_csv(CSV_FILE, usecols=[column for column in columns if column in available])
+
+def _current_snapshot():
+    """Open the snapshot, rebuilding it first if it is missing or too far behind the CSV"""
+    parquet_file, source = _open_snapshot()
+    if _needs_refresh(source, os.stat(CSV_FILE)):
+        refresh_snapshot()
+        parquet_file, source = _open_snapshot()
+    return parquet_file, source
+
+def read_columns(columns: Optional[List[str]] = None) -> pd.DataFrame:
+    """Read the given response columns (all if None) in CSV row order"""
+    if not PYARROW_AVAILABLE:
+        return read_csv_columns(columns)
+
+    parquet_file, source = _current_snapshot()
+    if parquet_file is None:
+        return read_csv_columns(columns)
+
+    if columns is not None:
+        available = set(parquet_file.schema_arrow.names)
+        columns = [column for column in columns if column in available]
+    df = parquet_file.read(columns=columns).to_pandas()
+
+    tail = _read_tail(source['source_size'], columns)
+    if tail is not None:
+        df = _categorize(pd.concat([df, tail], ignore_index=True))
+
+    return df
+
+def scan_csv_rows(positions: List[int], columns: Optional[List[str]] = None) -> pd.DataFrame:
+    """Pick rows out of the CSV in chunks (used when pyarrow is not installed)"""
+    wanted = set(positions)
+    available = pd.read_csv(CSV_FILE, nrows=0).columns
+    usecols = None if columns is None else [column for column in columns if column in available]
+
+    parts = []
+    offset = 0
+    for chunk in pd.read_csv(CSV_FILE, usecols=usecols, chunksize=SNAPSHOT_ROW_GROUP_SIZE):
+        chunk.index = pd.RangeIndex(offset, offset + len(chunk))
+        offset += len(chunk)
+        parts.append(chunk[chunk.index.isin(wanted)])
+        if offset > max(wanted):
+            break
+    return pd.concat(parts)
+
+def read_rows(positions: List[int], columns: Optional[List[str]] = None) -> pd.DataFrame:
+    """Read only the given rows (0-based CSV row positions), indexed and ordered by position"""
+    if not positions:
+        return pd.DataFrame(columns=columns)
+    if not PYARROW_AVAILABLE:
+        return scan_csv_rows(positions, columns).loc[positions]
+
+    parquet_file, source = _current_snapshot()
+    if parquet_file is None:
+        return scan_csv_rows(positions, columns).loc[positions]
+
+    if columns is not None:
+        available = set(parquet_file.schema_arrow.names)
+        columns = [column for column in columns if column in available]
+
+    # Decode only the row groups that hold a requested row
+    by_group: Dict[int, List[int]] = {}
+    starts = [0]
+    for group in range(parquet_file.num_row_groups):
+        starts.append(starts[-1] + parquet_file.metadata.row_group(group).num_rows)
+    snapshot_rows = starts[-1]
+    for position in sorted(set(positions)):
+        if position < snapshot_rows:
+            by_group.setdefault(bisect_right(starts, position) - 1, []).append(position)
+
+    parts = []
+    for group, group_positions in by_group.items():
+        rows = parquet_file.read_row_group(group, columns=columns).to_pandas()
+        rows.index = pd.RangeIndex(starts[group], starts[group] + len(rows))
+        parts.append(rows.loc[group_positions])
+
+    if max(positions) >= snapshot_rows:
+        tail = _read_tail(source['source_size'], columns)
+        if tail is not None:
+            tail.index = pd.RangeIndex(snapshot_rows, snapshot_rows + len(tail))
+            parts.append(tail[tail.index.isin(positions)])
+
+    return pd.concat(parts).loc[positions]
+
+def main():
+    parser = argparse.ArgumentParser(description="Maintain the columnar analytics snapshot")
+    parser.add_argument('command', choices=['refresh'], help="refresh: rebuild the Parquet snapshot from the CSV")
+    args = parser.parse_args()
+
+    if args.command == 'refresh':
+        if not PYARROW_AVAILABLE:
+            print("❌ pyarrow is not installed; analytics read the CSV directly")
+            return
+        source = refresh_snapshot()
+        print(f"✅ Wrote {source['rows']} submissions to {RESPONSES_SNAPSHOT_FILE}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,295 @@
+"""
+Corpus export for research consumers
+Submissions are streamed from the storage backend in chunks and written to CSV,
+JSON Lines and/or Parquet, optionally keeping only approved submissions. Each
+export also gets a manifest of the media files the exported rows reference and
+a SHA256SUMS file, and can be packed into a zip archive (optionally with the
+media files). Neither the table nor any media file is held in memory as a whole.
+
+Usage:
+    python corpus_export.py                          # all formats, all submissions
+    python corpus_export.py --format csv parquet --approved-only
+    python corpus_export.py --archive --include-media
+"""
+
+import argparse
+import csv
+import importlib.util
+import json
+import os
+import shutil
+import sys
+import time
+import zipfile
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import pandas as pd
+
+from config import (
+    ASSETS_FOLDER, EXPORTS_FOLDER, EXPORT_FORMATS, EXPORT_CHUNK_SIZE, RESPONSE_COLUMNS
+)
+from media_store import REFERENCE_COLUMNS, hash_stream, is_object_path, media_type_of, normalize_media_path
+from storage_backend import get_backend
+
+DATA_FILES = {'csv': 'corpus.csv', 'jsonl': 'corpus.jsonl', 'parquet': 'corpus.parquet'}
+MANIFEST_FILE = 'media_manifest.csv'
+MANIFEST_COLUMNS = ['path', 'column', 'media_type', 'size', 'sha256', 'exists']
+CHECKSUMS_FILE = 'SHA256SUMS'
+INFO_FILE = 'export_info.json'
+
+# Typed columns in JSON Lines and Parquet (everything else is a string)
+NUMERIC_COLUMNS = {'latitude': 'float64', 'longitude': 'float64', 'file_size': 'Int64'}
+
+# Columns of the earliest submissions and the current columns holding the same data;
+# their images were picked from ASSETS_FOLDER, so image_filename is a file name there
+LEGACY_COLUMNS = {'image_filename': 'media_filename', 'name': 'contributor_name',
+                  'user_details': 'contributor_details'}
+
+# Writers
+
+class _CSVWriter:
+    def __init__(self, path: str):
+        self._file = open(path, 'w', newline='', encoding='utf-8')
+        self._header = True
+
+    def write(self, chunk: pd.DataFrame):
+        chunk.to_csv(self._file, index=False, header=self._header, lineterminator='\n')
+        self._header = False
+
+    def close(self):
+        if self._header:
+            pd.DataFrame(columns=RESPONSE_COLUMNS).to_csv(self._file, index=False, lineterminator='\n')
+        self._file.close()
+
+class _JSONLWriter:
+    def __init__(self, path: str):
+        self._file = open(path, 'w', encoding='utf-8')
+
+    def write(self, chunk: pd.DataFrame):
+        lines = typed_columns(chunk).to_json(orient='records', lines=True, force_ascii=False)
+        self._file.write(lines if lines.endswith('\n') else lines + '\n')
+
+    def close(self):
+        self._file.close()
+
+class _ParquetWriter:
+    def __init__(self, path: str):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        self._pa = pa
+        self._schema = pa.schema([
+            (column, pa.int64() if NUMERIC_COLUMNS.get(column) == 'Int64'
+             else pa.float64() if column in NUMERIC_COLUMNS else pa.string())
+            for column in RESPONSE_COLUMNS
+        ])
+        self._writer = pq.ParquetWriter(path, self._schema, compression='zstd')
+
+    def write(self, chunk: pd.DataFrame):
+        table = self._pa.Table.from_pandas(typed_columns(chunk), schema=self._schema, preserve_index=False)
+        self._writer.write_table(table)
+
+    def close(self):
+        self._writer.close()
+
+WRITERS = {'csv': _CSVWriter, 'jsonl': _JSONLWriter, 'parquet': _ParquetWriter}
+
+def _is_empty(values: pd.Series) -> pd.Series:
+    return values.fillna('').astype(str) == ''
+
+def conform_columns(chunk: pd.DataFrame) -> pd.DataFrame:
+    """Put a chunk in RESPONSE_COLUMNS order (columns missing from older data are '').
+
+    Values in LEGACY_COLUMNS fill the matching current column where it is empty.
+    """
+    conformed = chunk.reindex(columns=RESPONSE_COLUMNS, fill_value='')
+    for legacy, column in LEGACY_COLUMNS.items():
+        if legacy in chunk.columns:
+            fill = _is_empty(conformed[column]) & ~_is_empty(chunk[legacy])
+            conformed.loc[fill, column] = chunk.loc[fill, legacy]
+
+    if 'image_filename' in chunk.columns:
+        legacy_image = _is_empty(conformed['file_path']) & ~_is_empty(chunk['image_filename'])
+        conformed.loc[legacy_image, 'file_path'] = [
+            os.path.join(ASSETS_FOLDER, filename) for filename in chunk.loc[legacy_image, 'image_filename']
+        ]
+        conformed.loc[legacy_image & _is_empty(conformed['media_type']), 'media_type'] = 'image'
+    return conformed
+
+def typed_columns(chunk: pd.DataFrame) -> pd.DataFrame:
+    """Convert numeric columns; empty values become nulls"""
+    chunk = chunk.copy()
+    for column, dtype in NUMERIC_COLUMNS.items():
+        chunk[column] = pd.to_numeric(chunk[column], errors='coerce')
+        if dtype == 'Int64':
+            chunk[column] = chunk[column].round().astype('Int64')
+    return chunk
+
+def approved_rows(chunk: pd.DataFrame) -> pd.DataFrame:
+    """Keep the submissions whose validation_status is 'approved'"""
+    return chunk[chunk['validation_status'].str.strip().str.lower() == 'approved']
+
+# Manifest and checksums
+
+def file_sha256(path: str) -> str:
+    """Hash a file in chunks"""
+    with open(path, 'rb') as f:
+        return hash_stream(f, 'file')[1]
+
+def _manifest_entry(path: str, column: str, sha256: str) -> Dict:
+    entry = {'path': path, 'column': column, 'media_type': media_type_of(path),
+             'size': None, 'sha256': sha256 or None, 'exists': os.path.isfile(path)}
+    if entry['exists']:
+        entry['size'] = os.path.getsize(path)
+        if entry['sha256'] is None:
+            entry['sha256'] = (os.path.splitext(os.path.basename(path))[0] if is_object_path(path)
+                               else file_sha256(path))
+    return entry
+
+def _write_checksums(directory: str, filenames: List[str]):
+    with open(os.path.join(directory, CHECKSUMS_FILE), 'w', encoding='utf-8') as f:
+        for filename in filenames:
+            f.write(f"{file_sha256(os.path.join(directory, filename))}  {filename}\n")
+
+def _write_archive(directory: str, filenames: List[str], media_paths: List[str]) -> str:
+    """Zip an export directory; files are streamed from disk into the archive"""
+    archive = directory + '.zip'
+    partial = archive + '.partial'
+    name = os.path.basename(directory)
+
+    with zipfile.ZipFile(partial, 'w', compression=zipfile.ZIP_DEFLATED, allowZip64=True) as zf:
+        for filename in filenames + [CHECKSUMS_FILE, INFO_FILE]:
+            zf.write(os.path.join(directory, filename), f"{name}/{filename}")
+        for path in media_paths:
+            # Media formats are already compressed
+            zf.write(path, f"{name}/media/{os.path.normpath(path)}", compress_type=zipfile.ZIP_STORED)
+
+    os.replace(partial, archive)
+    with open(archive + '.sha256', 'w', encoding='utf-8') as f:
+        f.write(f"{file_sha256(archive)}  {os.path.basename(archive)}\n")
+    return archive
+
+# Export
+
+def export_corpus(formats: Optional[List[str]] = None, approved_only: bool = False,
+                  archive: bool = False, include_media: bool = False,
+                  chunk_size: int = EXPORT_CHUNK_SIZE) -> Dict:
+    """Stream the submissions into a new export directory and return a summary"""
+    formats = list(dict.fromkeys(formats or EXPORT_FORMATS))
+    for fmt in formats:
+        if fmt not in WRITERS:
+            raise ValueError(f"Unknown export format: {fmt}")
+    if 'parquet' in formats and importlib.util.find_spec('pyarrow') is None:
+        raise ValueError("pyarrow is required for Parquet exports")
+
+    started = time.perf_counter()
+    name = f"corpus-{datetime.now().strftime('%Y%m%d-%H%M%S')}" + ('-approved' if approved_only else '')
+    directory = os.path.join(EXPORTS_FOLDER, name)
+    suffix = 1
+    while os.path.exists(directory):
+        suffix += 1
+        directory = os.path.join(EXPORTS_FOLDER, f"{name}-{suffix}")
+    name = os.path.basename(directory)
+    # Built under a temporary name, so a listed export is always complete
+    partial = directory + '.partial'
+    shutil.rmtree(partial, ignore_errors=True)
+    os.makedirs(partial)
+
+    summary = {'name': name, 'directory': directory, 'formats': formats, 'approved_only': approved_only,
+               'rows': 0, 'rows_scanned': 0, 'media_files': 0, 'missing_media': 0, 'archive': None}
+    writers = {fmt: WRITERS[fmt](os.path.join(partial, DATA_FILES[fmt])) for fmt in formats}
+    media_paths = []
+    seen = set()
+
+    try:
+        with open(os.path.join(partial, MANIFEST_FILE), 'w', newline='', encoding='utf-8') as manifest_file:
+            manifest = csv.DictWriter(manifest_file, MANIFEST_COLUMNS, lineterminator='\n')
+            manifest.writeheader()
+
+            for chunk in get_backend().iter_responses(chunk_size):
+                summary['rows_scanned'] += len(chunk)
+                chunk = conform_columns(chunk)
+                if approved_only:
+                    chunk = approved_rows(chunk)
+                if chunk.empty:
+                    continue
+
+                for writer in writers.values():
+                    writer.write(chunk)
+                summary['rows'] += len(chunk)
+
+                for column in REFERENCE_COLUMNS:
+                    hashes = chunk['file_sha256'] if column == 'file_path' else [''] * len(chunk)
+                    for path, sha256 in zip(chunk[column], hashes):
+                        path = normalize_media_path(path)
+                        if not path or path in seen:
+                            continue
+                        seen.add(path)
+                        entry = _manifest_entry(path, column, sha256)
+                        manifest.writerow(entry)
+                        if entry['exists']:
+                            media_paths.append(path)
+                        else:
+                            summary['missing_media'] += 1
+    finally:
+        for writer in writers.values():
+            writer.close()
+
+    summary['media_files'] = len(media_paths)
+    filenames = [DATA_FILES[fmt] for fmt in formats] + [MANIFEST_FILE]
+    _write_checksums(partial, filenames)
+    with open(os.path.join(partial, INFO_FILE), 'w', encoding='utf-8') as f:
+        json.dump({**{key: summary[key] for key in ('name', 'formats', 'approved_only', 'rows', 'media_files')},
+                   'created_at': datetime.now().isoformat()}, f, indent=2)
+    os.replace(partial, directory)
+
+    if archive:
+        summary['archive'] = _write_archive(directory, filenames, media_paths if include_media else [])
+        summary['archive_size'] = os.path.getsize(summary['archive'])
+
+    summary['duration_seconds'] = round(time.perf_counter() - started, 2)
+    return summary
+
+def list_exports() -> List[Dict]:
+    """Get the completed exports, newest first"""
+    if not os.path.isdir(EXPORTS_FOLDER):
+        return []
+
+    exports = []
+    for name in sorted(os.listdir(EXPORTS_FOLDER), reverse=True):
+        info_path = os.path.join(EXPORTS_FOLDER, name, INFO_FILE)
+        if os.path.isfile(info_path):
+            with open(info_path, 'r', encoding='utf-8') as f:
+                info = json.load(f)
+            archive = os.path.join(EXPORTS_FOLDER, name + '.zip')
+            exports.append({**info, 'archive': archive if os.path.isfile(archive) else None})
+    return exports
+
+def main():
+    parser = argparse.ArgumentParser(description="Export the corpus for research use")
+    parser.add_argument('--format', nargs='+', choices=EXPORT_FORMATS, default=EXPORT_FORMATS,
+                        help="output formats (default: all)")
+    parser.add_argument('--approved-only', action='store_true',
+                        help="export only submissions with validation_status 'approved'")
+    parser.add_argument('--archive', action='store_true', help="also pack the export into a zip archive")
+    parser.add_argument('--include-media', action='store_true',
+                        help="with --archive: add the referenced media files to the archive")
+    args = parser.parse_args()
+
+    try:
+        summary = export_corpus(args.format, args.approved_only, args.archive, args.include_media)
+    except (OSError, ValueError) as e:
+        print(f"Error exporting corpus: {e}")
+        sys.exit(1)
+
+    print(f"✅ Exported {summary['rows']} of {summary['rows_scanned']} submissions "
+          f"({', '.join(summary['formats'])}) and {summary['media_files']} media references "
+          f"to {summary['directory']} in {summary['duration_seconds']}s")
+    if summary['missing_media']:
+        print(f"   {summary['missing_media']} referenced media files are missing (see {MANIFEST_FILE})")
+    if summary['archive']:
+        print(f"   Archive: {summary['archive']}")
+
+if __name__ == "__main__":
+    main()
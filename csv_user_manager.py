@@ -1,22 +1,18 @@
 """
-CSV-based User Management System for Cultural Corpus Collection Platform
-Replaces MySQL database with simple CSV file storage for user data
+User Management System for Cultural Corpus Collection Platform
+Account and session operations on top of the configured storage backend
+(CSV files by default, or SQLite; see STORAGE_BACKEND in config.py)
 """
 
-import csv
-import os
 import hashlib
 import secrets
-import json
 from datetime import datetime, timedelta
-from typing import Dict, Optional, List, Tuple, Any
+from typing import Dict, Optional, List
 from pathlib import Path
-import pandas as pd
-
-# File paths
-DATA_FOLDER = "data"
-USERS_CSV_FILE = os.path.join(DATA_FOLDER, "users.csv")
-SESSIONS_CSV_FILE = os.path.join(DATA_FOLDER, "sessions.csv")
+from storage_backend import get_backend
+from config import (
+    DATA_FOLDER, SESSION_MAX_ACTIVE_PER_USER, SESSION_REAP_INTERVAL
+)
 
 def ensure_data_directories():
     """Ensure data directories exist"""
@@ -30,77 +26,27 @@ def verify_password(password: str, hashed_password: str) -> bool:
     """Verify password against hash"""
     return hash_password(password) == hashed_password
 
-def initialize_users_csv():
-    """Initialize users CSV file with headers if it doesn't exist"""
-    ensure_data_directories()
-    
-    if not os.path.exists(USERS_CSV_FILE):
-        headers = [
-            'user_id', 'username', 'email', 'password_hash', 'full_name', 
-            'bio', 'country', 'region', 'city', 'cultural_background',
-            'profession', 'location', 'created_at', 'last_login', 
-            'is_active', 'role', 'display_publicly'
-        ]
-        
-        with open(USERS_CSV_FILE, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.writer(f)
-            writer.writerow(headers)
-
-def initialize_sessions_csv():
-    """Initialize sessions CSV file with headers if it doesn't exist"""
+def initialize_storage():
+    """Create the user and session storage if it doesn't exist"""
     ensure_data_directories()
-    
-    if not os.path.exists(SESSIONS_CSV_FILE):
-        headers = ['session_token', 'user_id', 'created_at', 'expires_at', 'is_active']
-        
-        with open(SESSIONS_CSV_FILE, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.writer(f)
-            writer.writerow(headers)
+    get_backend().initialize()
 
 def load_users() -> List[Dict]:
-    """Load all users from CSV file"""
-    initialize_users_csv()
-    
-    users = []
-    try:
-        df = pd.read_csv(USERS_CSV_FILE)
-        for _, row in df.iterrows():
-            user = row.to_dict()
-            users.append(user)
-    except Exception as e:
-        print(f"Error loading users: {e}")
-    
-    return users
+    """Load all users"""
+    return get_backend().load_users()
 
 def save_users(users: List[Dict]):
-    """Save users to CSV file"""
+    """Save users, replacing the stored list"""
     ensure_data_directories()
-    
-    if not users:
-        return
-    
-    df = pd.DataFrame(users)
-    df.to_csv(USERS_CSV_FILE, index=False)
+    get_backend().save_users(users)
 
 def get_user_by_email(email: str) -> Optional[Dict]:
     """Get user by email address"""
-    users = load_users()
-    
-    for user in users:
-        if user.get('email', '').lower() == email.lower():
-            return user
-    
-    return None
+    return get_backend().get_user_by_email(email)
 
 def get_user_by_id(user_id: str) -> Optional[Dict]:
     """Get user by user ID"""
-    users = load_users()
-    
-    for user in users:
-        if user.get('user_id') == user_id:
-            return user
-    
-    return None
+    return get_backend().get_user_by_id(user_id)
 
 def create_user(username: str, email: str, password_hash: str, 
                full_name: str = None, bio: str = None, country: str = None,
@@ -136,24 +82,15 @@ def create_user(username: str, email: str, password_hash: str,
         'display_publicly': True
     }
     
-    # Load existing users and add new user
-    users = load_users()
-    users.append(user)
-    save_users(users)
+    # The backend re-checks the email atomically with the insert
+    if not get_backend().insert_user(user):
+        return None
     
     return user_id
 
 def update_user_login(user_id: str) -> bool:
     """Update user's last login timestamp"""
-    users = load_users()
-    
-    for user in users:
-        if user.get('user_id') == user_id:
-            user['last_login'] = datetime.now().isoformat()
-            save_users(users)
-            return True
-    
-    return False
+    return get_backend().update_user(user_id, {'last_login': datetime.now().isoformat()})
 
 def update_user_profile(user_id: str, **kwargs) -> bool:
     """Update user profile information"""
@@ -162,55 +99,24 @@ def update_user_profile(user_id: str, **kwargs) -> bool:
         'cultural_background', 'profession', 'location', 'display_publicly'
     ]
     
-    users = load_users()
-    
-    for user in users:
-        if user.get('user_id') == user_id:
-            for field, value in kwargs.items():
-                if field in allowed_fields and value is not None:
-                    user[field] = value
-            
-            save_users(users)
-            return True
-    
-    return False
+    fields = {
+        field: value for field, value in kwargs.items()
+        if field in allowed_fields and value is not None
+    }
+    return get_backend().update_user(user_id, fields)
 
 def deactivate_user(user_id: str) -> bool:
     """Deactivate a user account"""
-    users = load_users()
-    
-    for user in users:
-        if user.get('user_id') == user_id:
-            user['is_active'] = False
-            save_users(users)
-            return True
-    
-    return False
+    return get_backend().update_user(user_id, {'is_active': False})
 
 def load_sessions() -> List[Dict]:
-    """Load all sessions from CSV file"""
-    initialize_sessions_csv()
-    
-    sessions = []
-    try:
-        df = pd.read_csv(SESSIONS_CSV_FILE)
-        for _, row in df.iterrows():
-            session = row.to_dict()
-            sessions.append(session)
-    except Exception as e:
-        print(f"Error loading sessions: {e}")
-    
-    return sessions
+    """Load all sessions"""
+    return get_backend().load_sessions()
 
 def save_sessions(sessions: List[Dict]):
-    """Save sessions to CSV file"""
+    """Save sessions, replacing the stored list"""
     ensure_data_directories()
-    
-    if not sessions:
-        return
-    
-    df = pd.DataFrame(sessions)
-    df.to_csv(SESSIONS_CSV_FILE, index=False)
+    get_backend().save_sessions(sessions)
 
 def create_session(user_id: str, expires_in_hours: int = 24) -> str:
     """Create a new session for a user"""
@@ -226,70 +132,37 @@ def create_session(user_id: str, expires_in_hours: int = 24) -> str:
         'is_active': True
     }
     
-    # Load existing sessions and add new session
-    sessions = load_sessions()
-    sessions.append(session)
-    save_sessions(sessions)
+    get_backend().create_session(session, max_active=SESSION_MAX_ACTIVE_PER_USER)
     
     return session_token
 
 def validate_session(session_token: str) -> Optional[Dict]:
     """Validate session token and return user data if valid"""
-    sessions = load_sessions()
-    current_time = datetime.now()
+    session = get_backend().get_active_session(session_token)
+    if session is None:
+        return None
     
-    for session in sessions:
-        if (session.get('session_token') == session_token and 
-            session.get('is_active', False)):
-            
-            # Check if session has expired
-            try:
-                expires_at = datetime.fromisoformat(session['expires_at'])
-                if current_time > expires_at:
-                    # Session expired, deactivate it
-                    session['is_active'] = False
-                    save_sessions(sessions)
-                    return None
-                
-                # Session is valid, get user data
-                user = get_user_by_id(session['user_id'])
-                if user and user.get('is_active', True):
-                    return user
-                    
-            except Exception as e:
-                print(f"Error parsing session expiry: {e}")
-                continue
+    user = get_user_by_id(session['user_id'])
+    if user and user.get('is_active', True):
+        return user
     
     return None
 
 def logout_user(session_token: str) -> bool:
     """Logout user by deactivating session"""
-    sessions = load_sessions()
-    
-    for session in sessions:
-        if session.get('session_token') == session_token:
-            session['is_active'] = False
-            save_sessions(sessions)
-            return True
-    
-    return False
+    return get_backend().deactivate_session(session_token)
 
-def cleanup_expired_sessions():
-    """Remove expired sessions from the CSV file"""
-    sessions = load_sessions()
-    current_time = datetime.now()
-    active_sessions = []
-    
-    for session in sessions:
-        try:
-            expires_at = datetime.fromisoformat(session['expires_at'])
-            if current_time <= expires_at and session.get('is_active', False):
-                active_sessions.append(session)
-        except Exception as e:
-            print(f"Error parsing session expiry: {e}")
-            continue
-    
-    save_sessions(active_sessions)
+def cleanup_expired_sessions() -> Dict:
+    """Remove expired and logged-out sessions"""
+    return get_backend().reap_sessions()
+
+def start_session_reaper(interval: float = SESSION_REAP_INTERVAL):
+    """Start the background thread that periodically cleans up sessions"""
+    get_backend().start_session_reaper(interval)
+
+def get_session_reaper_stats() -> Dict:
+    """Get sessions reaped per run and current session counts"""
+    return get_backend().get_session_reaper_stats()
 
 def get_user_statistics(user_id: str) -> Dict:
     """Get user statistics"""
@@ -297,13 +170,10 @@ def get_user_statistics(user_id: str) -> Dict:
     if not user:
         return {}
     
-    # Load user responses to get contribution stats
+    # Load user responses to get contribution stats (indexed by contributor_email in SQLite)
     try:
-        from utils import CSV_FILE
-        if os.path.exists(CSV_FILE):
-            df = pd.read_csv(CSV_FILE)
-            user_contributions = df[df['contributor_email'] == user.get('email', '')]
-            
+        user_contributions = get_backend().responses_by_contributor(user.get('email', ''))
+        if not user_contributions.empty:
             return {
                 'total_contributions': len(user_contributions),
                 'media_types': user_contributions['media_type'].value_counts().to_dict() if len(user_contributions) > 0 else {},
@@ -332,29 +202,8 @@ def get_all_users() -> List[Dict]:
 
 def delete_user(user_id: str) -> bool:
     """Delete a user account completely"""
-    users = load_users()
-    original_count = len(users)
-    
-    users = [user for user in users if user.get('user_id') != user_id]
-    
-    if len(users) < original_count:
-        save_users(users)
-        return True
-    
-    return False
+    return get_backend().delete_user(user_id)
 
 def change_user_password(user_id: str, new_password_hash: str) -> bool:
     """Change user password"""
-    users = load_users()
-    
-    for user in users:
-        if user.get('user_id') == user_id:
-            user['password_hash'] = new_password_hash
-            save_users(users)
-            return True
-    
-    return False
-
-# Initialize CSV files on import
-initialize_users_csv()
-initialize_sessions_csv() 
\ No newline at end of file
+    return get_backend().update_user(user_id, {'password_hash': new_password_hash})
@@ -0,0 +1,97 @@
+"""
+Process-wide cache for data readers
+Results are keyed on the identity of the file they were computed from and are
+only recomputed when that file actually changes
+"""
+
+import copy
+import functools
+import os
+import threading
+from typing import Any, Callable, Dict, Optional, Tuple, Union
+
+_lock = threading.RLock()
+_write_generations: Dict[str, int] = {}
+_entries: Dict[Tuple, Tuple[Any, Any]] = {}
+_stats: Dict[str, Dict[str, int]] = {}
+
+def bump_write_generation(path: str):
+    """Mark a file as changed by this process (covers coarse filesystem mtimes)"""
+    key = os.path.abspath(path)
+    with _lock:
+        _write_generations[key] = _write_generations.get(key, 0) + 1
+
+def get_file_version(path: str) -> Optional[Tuple[int, int, int, int]]:
+    """Identify the current contents of a file by (inode, mtime, size, write generation)"""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    generation = _write_generations.get(os.path.abspath(path), 0)
+    return (stat.st_ino, stat.st_mtime_ns, stat.st_size, generation)
+
+def _record(name: str, outcome: str):
+    counters = _stats.setdefault(name, {'hits': 0, 'misses': 0})
+    counters[outcome] += 1
+
+def get_or_compute(name: str, key: Tuple, version: Any, compute: Callable, copy_result: bool = True):
+    """Return the cached value for key if it was computed for this version, else compute it"""
+    with _lock:
+        entry = _entries.get(key)
+        if entry is not None and entry[0] == version:
+            _record(name, 'hits')
+            value = entry[1]
+            return copy.deepcopy(value) if copy_result else value
+        _record(name, 'misses')
+
+    value = compute()
+
+    with _lock:
+        _entries[key] = (version, value)
+    return copy.deepcopy(value) if copy_result else value
+
+def cached_on(source: Union[str, Callable[[], Any]], copy_result: bool = True):
+    """Cache a reader's result until its data source changes.
+
+    source is either a file path or a callable returning a version token for
+    the data (e.g. a storage backend's responses_version). Cached values are
+    deep-copied on the way out so callers can mutate them freely; pass
+    copy_result=False for values that are treated as read-only.
+    """
+    get_version = source if callable(source) else lambda: get_file_version(source)
+
+    def decorator(func: Callable) -> Callable:
+        name = func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            key = (name, args, tuple(sorted(kwargs.items())))
+            return get_or_compute(name, key, get_version(),
+                                  lambda: func(*args, **kwargs), copy_result)
+
+        return wrapper
+
+    return decorator
+
+def get_cache_stats() -> Dict:
+    """Get hit/miss counters per cached reader plus totals"""
+    with _lock:
+        by_function = {name: dict(counters) for name, counters in _stats.items()}
+
+    hits = sum(counters['hits'] for counters in by_function.values())
+    misses = sum(counters['misses'] for counters in by_function.values())
+    lookups = hits + misses
+
+    return {
+        'hits': hits,
+        'misses': misses,
+        'hit_rate': round(hits / lookups * 100, 2) if lookups > 0 else 0,
+        'entries': len(_entries),
+        'by_function': by_function
+    }
+
+def clear_cache():
+    """Drop all cached values and reset counters"""
+    with _lock:
+        _entries.clear()
+        _stats.clear()
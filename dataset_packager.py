@@ -0,0 +1,284 @@
+"""
+Training dataset packager
+Packs the corpus into WebDataset-style tar shards: each submission is a sample
+whose files share a key (000000042.json with the submission's fields,
+000000042.jpg with its media, 000000042.local_audio.wav with the local-language
+recording). Shards are planned in one streaming pass over the submissions and
+written and gzip-compressed on a process pool, one shard per task. Finished
+shards are recorded in progress.jsonl, so an interrupted build resumes with
+the shards that are still missing.
+
+Usage:
+    python dataset_packager.py build                      # build (or resume) data/datasets/corpus
+    python dataset_packager.py build --name approved --approved-only --workers 8
+    python dataset_packager.py build --restart            # discard the previous plan and shards
+    python dataset_packager.py status                     # shards done / planned
+"""
+
+import argparse
+import io
+import json
+import multiprocessing
+import os
+import shutil
+import tarfile
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from datetime import datetime
+from typing import Dict, Iterator, Optional
+
+from config import (
+    DATASETS_FOLDER, DATASET_SHARD_MAX_BYTES, DATASET_SHARD_MAX_SAMPLES, DATASET_WORKERS,
+    DATASET_COMPRESSLEVEL, EXPORT_CHUNK_SIZE
+)
+from corpus_export import approved_rows, conform_columns, file_sha256, typed_columns
+from media_store import normalize_media_path
+from storage_backend import get_backend
+
+PLAN_FILE = 'plan.jsonl'
+OPTIONS_FILE = 'options.json'
+PROGRESS_FILE = 'progress.jsonl'
+CHECKSUMS_FILE = 'SHA256SUMS'
+INFO_FILE = 'dataset_info.json'
+
+# Sample file suffix per media column (the media file's own extension is appended)
+MEDIA_SUFFIXES = {'file_path': '', 'local_language_audio_path': 'local_audio.'}
+
+def shard_filename(index: int, compress: bool) -> str:
+    return f"shard-{index:06d}.tar" + ('.gz' if compress else '')
+
+# Planning (one streaming pass, in the main process)
+
+def _iter_samples(approved_only: bool) -> Iterator[Dict]:
+    """Yield each exported submission with its sidecar record and media files"""
+    key = 0
+    for chunk in get_backend().iter_responses(EXPORT_CHUNK_SIZE):
+        chunk = conform_columns(chunk)
+        if approved_only:
+            chunk = approved_rows(chunk)
+        if chunk.empty:
+            continue
+
+        sidecars = typed_columns(chunk).to_json(orient='records', lines=True, force_ascii=False).splitlines()
+        media_paths = zip(*(chunk[column] for column in MEDIA_SUFFIXES))
+        for sidecar, paths in zip(sidecars, media_paths):
+            media = []
+            size = len(sidecar.encode('utf-8'))
+            for path, prefix in zip(paths, MEDIA_SUFFIXES.values()):
+                path = normalize_media_path(path)
+                if path and os.path.isfile(path):
+                    extension = os.path.splitext(path)[1].lstrip('.').lower() or 'bin'
+                    media.append([path, prefix + extension])
+                    size += os.path.getsize(path)
+            yield {'key': f"{key:09d}", 'sidecar': sidecar, 'media': media, 'size': size}
+            key += 1
+
+def create_plan(directory: str, approved_only: bool, compress: bool) -> Dict:
+    """Assign the submissions to shards and save the plan"""
+    os.makedirs(directory, exist_ok=True)
+    options = {'approved_only': approved_only, 'compress': compress,
+               'created_at': datetime.now().isoformat(), 'shards': 0, 'samples': 0, 'bytes': 0}
+
+    partial = os.path.join(directory, PLAN_FILE + '.partial')
+    with open(partial, 'w', encoding='utf-8') as plan:
+        shard = {'shard': 0, 'samples': [], 'bytes': 0}
+
+        def flush():
+            plan.write(json.dumps(shard, ensure_ascii=False) + '\n')
+            options['shards'] += 1
+
+        for sample in _iter_samples(approved_only):
+            if shard['samples'] and (len(shard['samples']) >= DATASET_SHARD_MAX_SAMPLES
+                                     or shard['bytes'] + sample['size'] > DATASET_SHARD_MAX_BYTES):
+                flush()
+                shard = {'shard': shard['shard'] + 1, 'samples': [], 'bytes': 0}
+            shard['samples'].append(sample)
+            shard['bytes'] += sample['size']
+            options['samples'] += 1
+            options['bytes'] += sample['size']
+        if shard['samples']:
+            flush()
+
+    with open(os.path.join(directory, OPTIONS_FILE), 'w', encoding='utf-8') as f:
+        json.dump(options, f, indent=2)
+    # The plan is complete once it has its final name
+    os.replace(partial, os.path.join(directory, PLAN_FILE))
+    return options
+
+def _iter_plan(directory: str) -> Iterator[Dict]:
+    with open(os.path.join(directory, PLAN_FILE), 'r', encoding='utf-8') as f:
+        for line in f:
+            yield json.loads(line)
+
+# Packing (runs in the worker processes)
+
+def _owned_by_nobody(info: tarfile.TarInfo) -> tarfile.TarInfo:
+    info.uid = info.gid = 0
+    info.uname = info.gname = ''
+    return info
+
+def pack_shard(directory: str, shard: Dict, compress: bool, mtime: float) -> Dict:
+    """Write one shard to a temporary file and move it into place when complete"""
+    filename = shard_filename(shard['shard'], compress)
+    path = os.path.join(directory, filename)
+    partial = path + '.partial'
+    missing = 0
+
+    if compress:
+        tar = tarfile.open(partial, 'w:gz', compresslevel=DATASET_COMPRESSLEVEL)
+    else:
+        tar = tarfile.open(partial, 'w')
+    with tar:
+        for sample in shard['samples']:
+            data = sample['sidecar'].encode('utf-8')
+            info = tarfile.TarInfo(f"{sample['key']}.json")
+            info.size = len(data)
+            info.mtime = mtime
+            tar.addfile(info, io.BytesIO(data))
+
+            for media_path, suffix in sample['media']:
+                try:
+                    tar.add(media_path, arcname=f"{sample['key']}.{suffix}", recursive=False,
+                            filter=_owned_by_nobody)
+                except FileNotFoundError:
+                    # Removed since the plan was made
+                    missing += 1
+
+    sha256 = file_sha256(partial)
+    os.replace(partial, path)
+    return {'shard': shard['shard'], 'file': filename, 'samples': len(shard['samples']),
+            'bytes': os.path.getsize(path), 'sha256': sha256, 'missing_media': missing}
+
+# Progress
+
+def load_progress(directory: str) -> Dict[int, Dict]:
+    """Get the finished shards whose files are still in place"""
+    progress = {}
+    path = os.path.join(directory, PROGRESS_FILE)
+    if not os.path.exists(path):
+        return progress
+
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue  # a torn last line from an interrupted run
+            shard_path = os.path.join(directory, record['file'])
+            if os.path.isfile(shard_path) and os.path.getsize(shard_path) == record['bytes']:
+                progress[record['shard']] = record
+    return progress
+
+def _record_progress(directory: str, record: Dict):
+    with open(os.path.join(directory, PROGRESS_FILE), 'a', encoding='utf-8') as f:
+        f.write(json.dumps(record) + '\n')
+        f.flush()
+        os.fsync(f.fileno())
+
+def _load_options(directory: str) -> Optional[Dict]:
+    path = os.path.join(directory, OPTIONS_FILE)
+    if not os.path.exists(os.path.join(directory, PLAN_FILE)) or not os.path.exists(path):
+        return None
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+# Build
+
+def build_dataset(name: str = 'corpus', approved_only: bool = False, compress: bool = True,
+                  workers: Optional[int] = DATASET_WORKERS, restart: bool = False) -> Dict:
+    """Build or resume a sharded dataset in DATASETS_FOLDER/name and return a summary"""
+    directory = os.path.join(DATASETS_FOLDER, name)
+    if restart:
+        shutil.rmtree(directory, ignore_errors=True)
+
+    started = time.perf_counter()
+    options = _load_options(directory)
+    resumed = options is not None
+    if options is None:
+        options = create_plan(directory, approved_only, compress)
+    progress = load_progress(directory)
+    workers = workers or os.cpu_count() or 1
+    mtime = datetime.fromisoformat(options['created_at']).timestamp()
+
+    summary = {'directory': directory, 'resumed': resumed, 'workers': workers,
+               'approved_only': options['approved_only'], 'shards': options['shards'],
+               'samples': options['samples'], 'skipped': len(progress), 'packed': 0, 'missing_media': 0}
+
+    # Workers are spawned, not forked, for the same reason as the media worker pool
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn')) as executor:
+        in_flight = set()
+
+        def collect(done):
+            for future in done:
+                record = future.result()
+                _record_progress(directory, record)
+                progress[record['shard']] = record
+                summary['packed'] += 1
+                summary['missing_media'] += record['missing_media']
+
+        # Only a few shard plans are held in memory at a time
+        for shard in _iter_plan(directory):
+            if shard['shard'] in progress:
+                continue
+            if len(in_flight) >= workers * 2:
+                done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                collect(done)
+            in_flight.add(executor.submit(pack_shard, directory, shard, options['compress'], mtime))
+        collect(wait(in_flight).done)
+
+    records = [progress[index] for index in sorted(progress)]
+    with open(os.path.join(directory, CHECKSUMS_FILE), 'w', encoding='utf-8') as f:
+        for record in records:
+            f.write(f"{record['sha256']}  {record['file']}\n")
+    with open(os.path.join(directory, INFO_FILE), 'w', encoding='utf-8') as f:
+        json.dump({**options, 'completed_at': datetime.now().isoformat(),
+                   'archive_bytes': sum(record['bytes'] for record in records),
+                   'files': [record['file'] for record in records]}, f, indent=2)
+
+    summary['archive_bytes'] = sum(record['bytes'] for record in records)
+    summary['duration_seconds'] = round(time.perf_counter() - started, 2)
+    return summary
+
+def dataset_status(name: str = 'corpus') -> Optional[Dict]:
+    """Get the planned and finished shards of a dataset (None if it was never planned)"""
+    directory = os.path.join(DATASETS_FOLDER, name)
+    options = _load_options(directory)
+    if options is None:
+        return None
+    progress = load_progress(directory)
+    return {**options, 'directory': directory, 'done': len(progress),
+            'archive_bytes': sum(record['bytes'] for record in progress.values())}
+
+def main():
+    parser = argparse.ArgumentParser(description="Package the corpus as sharded WebDataset tar archives")
+    parser.add_argument('command', choices=['build', 'status'],
+                        help="build: plan and pack the shards (resuming an interrupted build); "
+                             "status: print build progress")
+    parser.add_argument('--name', default='corpus', help="dataset directory name in data/datasets/")
+    parser.add_argument('--approved-only', action='store_true',
+                        help="build: package only submissions with validation_status 'approved'")
+    parser.add_argument('--no-compress', action='store_true', help="build: write plain .tar shards")
+    parser.add_argument('--workers', type=int, default=DATASET_WORKERS, help="build: packing processes")
+    parser.add_argument('--restart', action='store_true', help="build: discard an unfinished build")
+    args = parser.parse_args()
+
+    if args.command == 'build':
+        summary = build_dataset(args.name, args.approved_only, not args.no_compress, args.workers, args.restart)
+        if summary['resumed']:
+            print(f"Resumed {summary['directory']}: {summary['skipped']} shards were already packed "
+                  f"(options of the original plan apply)")
+        print(f"✅ Packed {summary['packed']} shards with {summary['workers']} workers in "
+              f"{summary['duration_seconds']}s; {summary['samples']} samples in {summary['shards']} shards, "
+              f"{summary['archive_bytes'] / (1024*1024):.1f}MB")
+        if summary['missing_media']:
+            print(f"   {summary['missing_media']} media files were removed while packing")
+    elif args.command == 'status':
+        status = dataset_status(args.name)
+        if status is None:
+            print(f"Error: no dataset named {args.name} in {DATASETS_FOLDER}")
+            return
+        print(f"✅ {status['directory']}: {status['done']}/{status['shards']} shards packed "
+              f"({status['samples']} samples, {status['archive_bytes'] / (1024*1024):.1f}MB so far)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""
+Cross-process file locking and atomic file replacement for the data/ directory
+Lets several Streamlit workers share the same CSV files without lost updates
+or truncated files
+"""
+
+import os
+import stat
+import tempfile
+import threading
+from contextlib import contextmanager
+from typing import Dict
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+class _LockState:
+    def __init__(self):
+        self.thread_lock = threading.RLock()
+        self.depth = 0
+        self.fd = None
+
+_states: Dict[str, _LockState] = {}
+_states_lock = threading.Lock()
+
+def _get_state(path: str) -> _LockState:
+    key = os.path.abspath(path)
+    with _states_lock:
+        state = _states.get(key)
+        if state is None:
+            state = _states[key] = _LockState()
+        return state
+
+def _lock_fd(fd: int):
+    if fcntl is not None:
+        fcntl.flock(fd, fcntl.LOCK_EX)
+    else:
+        os.lseek(fd, 0, os.SEEK_SET)
+        msvcrt.locking(fd, msvcrt.LK_LOCK, 1)
+
+def _unlock_fd(fd: int):
+    if fcntl is not None:
+        fcntl.flock(fd, fcntl.LOCK_UN)
+    else:
+        os.lseek(fd, 0, os.SEEK_SET)
+        msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+
+@contextmanager
+def file_lock(path: str):
+    """Hold an exclusive lock on path across threads and processes.
+
+    The lock lives on a sidecar '<path>.lock' file so the data file itself can
+    be replaced atomically while locked. The lock is re-entrant within a thread.
+    """
+    state = _get_state(path)
+    with state.thread_lock:
+        if state.depth == 0:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            fd = os.open(path + '.lock', os.O_RDWR | os.O_CREAT, 0o644)
+            try:
+                _lock_fd(fd)
+            except BaseException:
+                os.close(fd)
+                raise
+            state.fd = fd
+        state.depth += 1
+        try:
+            yield
+        finally:
+            state.depth -= 1
+            if state.depth == 0:
+                fd, state.fd = state.fd, None
+                try:
+                    _unlock_fd(fd)
+                finally:
+                    os.close(fd)
+
+def fsync_directory(path: str):
+    """Flush directory metadata so a rename survives a crash (no-op on Windows)"""
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+@contextmanager
+def atomic_write(path: str, mode: str = 'w', newline: str = '', encoding: str = 'utf-8'):
+    """Write a file through a temporary sibling that replaces it on success.
+
+    Readers see either the old or the new contents, never a partial file; if
+    the block raises, the original file is left untouched.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, temp_file = tempfile.mkstemp(prefix=os.path.basename(path) + '.', suffix='.tmp', dir=directory)
+
+    try:
+        # mkstemp creates 0600 files; keep the permissions of the file being replaced
+        try:
+            os.chmod(temp_file, stat.S_IMODE(os.stat(path).st_mode))
+        except OSError:
+            os.chmod(temp_file, 0o644)
+
+        if 'b' in mode:
+            f = os.fdopen(fd, mode)
+        else:
+            f = os.fdopen(fd, mode, newline=newline, encoding=encoding)
+        with f:
+            yield f
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_file, path)
+    except BaseException:
+        try:
+            os.remove(temp_file)
+        except OSError:
+            pass
+        raise
+
+    fsync_directory(directory)
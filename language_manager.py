@@ -3,13 +3,57 @@ Language management utility for Cultural Corpus Collection Platform
 Handles language switching, translations, and localization
 """
 
+import json
+import os
+import threading
 import streamlit as st
-from config import SUPPORTED_LANGUAGES, TRANSLATIONS
+from config import SUPPORTED_LANGUAGES, LOCALES_FOLDER, DEFAULT_LANGUAGE
+
+# Compiled catalogs by language code: flat tables with fallbacks already applied
+_catalogs = {}
+_catalogs_lock = threading.Lock()
+
+def _read_locale_file(language_code):
+    """Read a language's catalog file (empty if the language has none)"""
+    path = os.path.join(LOCALES_FOLDER, f"{language_code}.json")
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError) as e:
+        print(f"Error loading translations for {language_code}: {e}")
+        return {}
+
+def _compile_catalog(language_code):
+    """Merge a language's catalog over the default language's"""
+    catalog = _read_locale_file(language_code)
+    if language_code == DEFAULT_LANGUAGE:
+        default = {'texts': {}, 'categories': [], 'placeholders': {}}
+    else:
+        default = get_catalog(DEFAULT_LANGUAGE)
+    
+    return {
+        'texts': {**default['texts'], **catalog.get('texts', {})},
+        'categories': tuple(catalog.get('categories') or default['categories']),
+        'placeholders': {**default['placeholders'], **catalog.get('placeholders', {})}
+    }
+
+def get_catalog(language_code):
+    """Get the compiled catalog of a language, loading it on first use"""
+    catalog = _catalogs.get(language_code)
+    if catalog is None:
+        with _catalogs_lock:
+            catalog = _catalogs.get(language_code)
+            if catalog is None:
+                catalog = _compile_catalog(language_code)
+                _catalogs[language_code] = catalog
+    return catalog
 
 def get_current_language():
     """Get the currently selected language from session state"""
     if 'current_language' not in st.session_state:
-        st.session_state.current_language = 'en'  # Default to English
+        st.session_state.current_language = DEFAULT_LANGUAGE
     return st.session_state.current_language
 
 def set_language(language_code):
@@ -24,11 +68,8 @@ def get_text(key, language_code=None):
     if language_code is None:
         language_code = get_current_language()
     
-    # Get translations for the language
-    translations = TRANSLATIONS.get(language_code, TRANSLATIONS['en'])
-    
-    # Return translated text or fallback to English
-    return translations.get(key, TRANSLATIONS['en'].get(key, key))
+    # Missing keys were filled in from English when the catalog was compiled
+    return get_catalog(language_code)['texts'].get(key, key)
 
 def render_language_selector():
     """Render language selector component"""
@@ -153,92 +194,15 @@ def render_language_banner():
 def initialize_language_session():
     """Initialize language session state"""
     if 'current_language' not in st.session_state:
-        st.session_state.current_language = 'en'
+        st.session_state.current_language = DEFAULT_LANGUAGE
     
     # Apply language-specific styles
     apply_language_styles()
 
 def get_translated_categories():
     """Get categories translated to current language"""
-    current_lang = get_current_language()
-    
-    # Category translations
-    category_translations = {
-        'en': [
-            "Traditional Clothing & Textiles",
-            "Musical Instruments",
-            "Cooking Utensils & Tools",
-            "Religious & Ceremonial Items",
-            "Agricultural Tools",
-            "Art & Crafts",
-            "Jewelry & Accessories",
-            "Games & Toys",
-            "Architecture & Structures",
-            "Food & Beverages",
-            "Other"
-        ],
-        'hi': [
-            "पारंपरिक वस्त्र और वस्त्र",
-            "संगीत वाद्ययंत्र",
-            "खाना पकाने के बर्तन और औजार",
-            "धार्मिक और अनुष्ठानिक वस्तुएं",
-            "कृषि उपकरण",
-            "कला और शिल्प",
-            "आभूषण और सामान",
-            "खेल और खिलौने",
-            "स्थापत्य और संरचनाएं",
-            "भोजन और पेय",
-            "अन्य"
-        ],
-        'te': [
-            "సాంప్రదాయ వస్త్రాలు మరియు వస్త్రాలు",
-            "సంగీత వాయిద్యాలు",
-            "వంట పాత్రలు మరియు ఉపకరణాలు",
-            "మత మరియు ఆచార వస్తువులు",
-            "వ్యవసాయ ఉపకరణాలు",
-            "కళ మరియు చేతి వృత్తులు",
-            "నగలు మరియు అలంకారాలు",
-            "ఆటలు మరియు బొమ్మలు",
-            "వాస్తుకళ మరియు నిర్మాణాలు",
-            "ఆహారం మరియు పానీయాలు",
-            "ఇతరములు"
-        ]
-    }
-    
-    return category_translations.get(current_lang, category_translations['en'])
+    return list(get_catalog(get_current_language())['categories'])
 
 def get_translated_placeholders():
     """Get form placeholders translated to current language"""
-    current_lang = get_current_language()
-    
-    placeholder_translations = {
-        'en': {
-            'name': 'Enter your name',
-            'description': 'Describe the cultural object, its significance, and usage...',
-            'user_details': 'Share your cultural background, profession, and location...',
-            'latitude': 'Enter latitude (optional)',
-            'longitude': 'Enter longitude (optional)',
-            'title': 'Enter a title for this cultural object',
-            'category': 'Select a category'
-        },
-        'hi': {
-            'name': 'अपना नाम दर्ज करें',
-            'description': 'सांस्कृतिक वस्तु का वर्णन करें, इसका महत्व और उपयोग...',
-            'user_details': 'अपनी सांस्कृतिक पृष्ठभूमि, पेशा और स्थान साझा करें...',
-            'latitude': 'अक्षांश दर्ज करें (वैकल्पिक)',
-            'longitude': 'देशांतर दर्ज करें (वैकल्पिक)',
-            'title': 'इस सांस्कृतिक वस्तु के लिए शीर्षक दर्ज करें',
-            'category': 'एक श्रेणी चुनें'
-        },
-        'te': {
-            'name': 'మీ పేరును నమోదు చేయండి',
-            'description': 'సాంస్కృతిక వస్తువును వివరించండి, దాని ప్రాముఖ్యత మరియు ఉపయోగం...',
-            'user_details': 'మీ సాంస్కృతిక నేపథ్యం, వృత్తి మరియు స్థానాన్ని పంచుకోండి...',
-            'latitude': 'అక్షాంశాన్ని నమోదు చేయండి (ఐచ్ఛికం)',
-            'longitude': 'రేఖాంశాన్ని నమోదు చేయండి (ఐచ్ఛికం)',
-            'title': 'ఈ సాంస్కృతిక వస్తువుకు శీర్షికను నమోదు చేయండి',
-            'category': 'ఒక వర్గాన్ని ఎంచుకోండి'
-        }
-    }
-    
-    return placeholder_translations.get(current_lang, placeholder_translations['en']) 
\ No newline at end of file
+    return dict(get_catalog(get_current_language())['placeholders'])
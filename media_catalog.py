@@ -0,0 +1,269 @@
+"""
+Persistent catalog of the media files in assets/ and uploads/
+Listing media reads an in-memory index (path, type, size, mtime, sha256,
+dimensions) instead of walking directories. Uploads are added to it as they are
+stored, and a throttled rescan reconciles it with the filesystem. The rescan
+stats each directory and lists only directories whose mtime changed, so
+unchanged shard directories cost one stat. The index is persisted to
+data/media_catalog.json, so a restarted app does not need a full rescan.
+
+Usage:
+    python media_catalog.py rescan   # rebuild the catalog from a full directory listing
+"""
+
+import argparse
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from config import (
+    ASSETS_FOLDER, DATA_FOLDER, MEDIA_EXTENSIONS, MEDIA_CATALOG_FILE, MEDIA_CATALOG_RESCAN_INTERVAL
+)
+from data_cache import get_file_version
+from file_lock import file_lock, atomic_write
+from media_store import MEDIA_TYPE_DIRS, hash_stream, is_object_path, media_dir, media_type_of
+
+CATALOG_VERSION = 1
+
+def catalog_roots() -> Dict[str, bool]:
+    """Directories tracked by the catalog and whether their subdirectories are included"""
+    roots = {ASSETS_FOLDER: False}
+    for media_type in MEDIA_TYPE_DIRS:
+        roots[media_dir(media_type)] = True
+    return roots
+
+def _describe(path: str, stat: os.stat_result, sha256: Optional[str] = None) -> Dict:
+    """Build the catalog entry of a media file"""
+    media_type = media_type_of(path)
+    entry = {
+        'path': path,
+        'filename': os.path.basename(path),
+        'type': media_type,
+        'size': stat.st_size,
+        'mtime_ns': stat.st_mtime_ns,
+        'sha256': sha256,
+        'width': None,
+        'height': None
+    }
+
+    try:
+        if entry['sha256'] is None:
+            if is_object_path(path):
+                entry['sha256'] = os.path.splitext(entry['filename'])[0]
+            else:
+                with open(path, 'rb') as f:
+                    entry['sha256'] = hash_stream(f, media_type)[1]
+
+        if media_type == 'image':
+            from PIL import Image
+
+            # Opening only parses the header; pixel data is never decoded here
+            with Image.open(path) as image:
+                entry['width'], entry['height'] = image.size
+    except Exception as e:
+        print(f"Error reading media file {path}: {e}")
+
+    return entry
+
+class MediaCatalog:
+    """Index of media files, reconciled with the filesystem at most every rescan_interval seconds.
+
+    Files are assumed not to change in place (uploads are content-addressed), so
+    a directory whose mtime did not move is not listed again.
+    """
+
+    def __init__(self, path: str = MEDIA_CATALOG_FILE, rescan_interval: float = MEDIA_CATALOG_RESCAN_INTERVAL):
+        self.path = path
+        self.rescan_interval = rescan_interval
+        self._lock = threading.RLock()
+        self._entries: Dict[str, Dict] = {}
+        self._dirs: Dict[str, Dict] = {}
+        self._file_version = None
+        self._dirty = False
+        self._changes = 0
+        self._listings: Dict = {}
+        self._last_scan = 0.0
+        self.stats = {'rescans': 0, 'dirs_listed': 0, 'last_rescan_ms': None}
+
+    # Persistence
+
+    def _load(self):
+        """Load the catalog file if another process (or a previous run) saved a newer one"""
+        version = get_file_version(self.path)
+        if version is None or version == self._file_version:
+            return
+
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Error loading media catalog: {e}")
+            return
+
+        if data.get('version') == CATALOG_VERSION:
+            self._entries = data['entries']
+            self._dirs = data['dirs']
+            self._file_version = version
+            self._changes += 1
+
+    def _save(self):
+        Path(DATA_FOLDER).mkdir(exist_ok=True)
+
+        with file_lock(self.path), atomic_write(self.path) as f:
+            json.dump({'version': CATALOG_VERSION, 'entries': self._entries, 'dirs': self._dirs}, f)
+        self._file_version = get_file_version(self.path)
+        self._dirty = False
+
+    def _mark_changed(self):
+        self._dirty = True
+        self._changes += 1
+
+    # Reconciliation
+
+    def _forget(self, directory: str):
+        """Drop a removed directory and everything below it"""
+        prefix = directory + os.sep
+        for path in [path for path in self._dirs if path == directory or path.startswith(prefix)]:
+            del self._dirs[path]
+        for path in [path for path in self._entries if path.startswith(prefix)]:
+            del self._entries[path]
+        self._mark_changed()
+
+    def _reconcile_dir(self, directory: str, recursive: bool, force: bool):
+        try:
+            mtime_ns = os.stat(directory).st_mtime_ns
+        except FileNotFoundError:
+            self._forget(directory)
+            return
+
+        known = self._dirs.get(directory)
+        if known is not None and known['mtime_ns'] == mtime_ns and not force:
+            subdirs = known['subdirs']
+        else:
+            self.stats['dirs_listed'] += 1
+            files = {}
+            subdirs = []
+            with os.scandir(directory) as it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        if recursive:
+                            subdirs.append(entry.path)
+                    elif entry.name.endswith(MEDIA_EXTENSIONS):
+                        files[entry.path] = entry.stat()
+
+            previous = known or {'files': [], 'subdirs': []}
+            for path in set(previous['files']) - files.keys():
+                self._entries.pop(path, None)
+            for path in set(previous['subdirs']) - set(subdirs):
+                self._forget(path)
+            for path, stat in files.items():
+                current = self._entries.get(path)
+                if current is None or current['size'] != stat.st_size or current['mtime_ns'] != stat.st_mtime_ns:
+                    self._entries[path] = _describe(path, stat)
+
+            subdirs.sort()
+            self._dirs[directory] = {'mtime_ns': mtime_ns, 'files': sorted(files), 'subdirs': subdirs}
+            self._mark_changed()
+
+        for subdir in subdirs:
+            self._reconcile_dir(subdir, recursive, force)
+
+    def rescan(self, force: bool = False) -> Dict:
+        """Reconcile the catalog with the filesystem now (force lists every directory)"""
+        with self._lock:
+            self._load()
+            started = time.perf_counter()
+            for root, recursive in catalog_roots().items():
+                self._reconcile_dir(root, recursive, force)
+            self._last_scan = time.time()
+            self.stats['rescans'] += 1
+            self.stats['last_rescan_ms'] = round((time.perf_counter() - started) * 1000, 2)
+            if self._dirty:
+                self._save()
+            return dict(self.stats)
+
+    def _refresh(self):
+        """Rescan if the last rescan is older than rescan_interval"""
+        if time.time() - self._last_scan >= self.rescan_interval:
+            self.rescan()
+
+    def invalidate(self):
+        """Make the next read rescan (e.g. after files were removed outside the app)"""
+        with self._lock:
+            self._last_scan = 0.0
+
+    # Updates
+
+    def add(self, path: str, sha256: Optional[str] = None):
+        """Add or update a file that was just written"""
+        entry = _describe(path, os.stat(path), sha256)
+        with self._lock:
+            # Persisted by the next rescan, which lists the changed directory
+            # but finds this entry already described
+            self._entries[path] = entry
+            self._mark_changed()
+
+    # Reads
+
+    def version(self) -> int:
+        """Token that changes whenever the catalog contents change (within this process)"""
+        with self._lock:
+            self._refresh()
+            return self._changes
+
+    def _listing(self, directory: str, media_type: Optional[str]) -> List[Dict]:
+        """Get the sorted entries below a directory, reusing the last result until the catalog changes"""
+        key = (directory, media_type)
+        cached = self._listings.get(key)
+        if cached is not None and cached[0] == self._changes:
+            return cached[1]
+
+        prefix = directory + os.sep
+        listing = [
+            entry for path, entry in sorted(self._entries.items())
+            if path.startswith(prefix) and (media_type is None or entry['type'] == media_type)
+        ]
+        self._listings[key] = (self._changes, listing)
+        return listing
+
+    def files(self, directory: str, media_type: Optional[str] = None) -> List[Dict]:
+        """Get the entries below a tracked directory, optionally of one media type"""
+        with self._lock:
+            self._refresh()
+            return [dict(entry) for entry in self._listing(directory, media_type)]
+
+    def count(self, directory: str) -> int:
+        """Count the files below a tracked directory"""
+        with self._lock:
+            self._refresh()
+            return len(self._listing(directory, None))
+
+_catalog: Optional[MediaCatalog] = None
+_catalog_lock = threading.Lock()
+
+def get_media_catalog() -> MediaCatalog:
+    """Get the process-wide media catalog"""
+    global _catalog
+    if _catalog is None:
+        with _catalog_lock:
+            if _catalog is None:
+                _catalog = MediaCatalog()
+    return _catalog
+
+def main():
+    parser = argparse.ArgumentParser(description="Maintain the media catalog")
+    parser.add_argument('command', choices=['rescan'], help="rescan: list every tracked directory again")
+    args = parser.parse_args()
+
+    if args.command == 'rescan':
+        catalog = get_media_catalog()
+        stats = catalog.rescan(force=True)
+        total = sum(catalog.count(root) for root in catalog_roots())
+        print(f"✅ Catalogued {total} media files in {stats['last_rescan_ms']}ms "
+              f"({stats['dirs_listed']} directories listed)")
+
+if __name__ == "__main__":
+    main()
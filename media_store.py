@@ -0,0 +1,270 @@
+"""
+Content-addressed media store for uploaded files
+Each upload is stored once, named after the SHA-256 of its contents and sharded
+by the first hash bytes (uploads/images/ab/cd/abcd...ef.jpg), so uploading the
+same photo again only adds a submission row pointing at the existing file.
+Reference counts come from the file paths recorded in the submissions.
+
+Usage:
+    python media_store.py migrate          # move legacy uuid-named uploads into the store
+    python media_store.py gc [--dry-run]   # delete stored files no submission references
+    python media_store.py stats            # print object, reference and disk usage counts
+"""
+
+import argparse
+import hashlib
+import os
+import re
+import shutil
+import time
+from collections import Counter
+from typing import BinaryIO, Dict, Iterator, Optional, Tuple
+
+from config import (
+    UPLOADS_FOLDER, IMAGE_EXTENSIONS, AUDIO_EXTENSIONS, VIDEO_EXTENSIONS, MEDIA_EXTENSIONS,
+    UPLOAD_CHUNK_SIZE, MEDIA_GC_GRACE_PERIOD
+)
+from file_lock import atomic_write
+from storage_backend import get_backend
+
+# Upload subdirectory per media type
+MEDIA_TYPE_DIRS = {'image': 'images', 'audio': 'audio', 'video': 'video'}
+
+# Submission columns that may point at an uploaded file
+REFERENCE_COLUMNS = ['file_path', 'local_language_audio_path']
+
+OBJECT_NAME_PATTERN = re.compile(r'^[0-9a-f]{64}\.[A-Za-z0-9]+$')
+
+class UploadTooLargeError(ValueError):
+    """Raised when an upload exceeds the size limit for its media type"""
+
+def media_type_of(filename: str) -> str:
+    """Determine the media type based on file extension"""
+    filename = filename.lower()
+    if filename.endswith(IMAGE_EXTENSIONS):
+        return "image"
+    elif filename.endswith(AUDIO_EXTENSIONS):
+        return "audio"
+    elif filename.endswith(VIDEO_EXTENSIONS):
+        return "video"
+    else:
+        return "unknown"
+
+def media_dir(media_type: str) -> str:
+    """Get the upload directory for a media type"""
+    if media_type in MEDIA_TYPE_DIRS:
+        return os.path.join(UPLOADS_FOLDER, MEDIA_TYPE_DIRS[media_type])
+    return UPLOADS_FOLDER
+
+def object_path(media_type: str, sha256: str, extension: str) -> str:
+    """Get the sharded storage path of a file with the given content hash"""
+    return os.path.join(media_dir(media_type), sha256[:2], sha256[2:4], sha256 + extension.lower())
+
+def normalize_media_path(path) -> str:
+    """Normalize a stored media path for comparison ('' if there is none).
+
+    Submissions saved on Windows record paths like uploads\\images\\x.png, so
+    backslashes are treated as separators on every platform.
+    """
+    if path is None or path != path or str(path) == '':  # missing or NaN
+        return ''
+    return os.path.normpath(str(path).replace('\\', '/'))
+
+def is_object_path(path: str) -> bool:
+    """Check whether a path is a content-addressed object (not a legacy upload)"""
+    return OBJECT_NAME_PATTERN.match(os.path.basename(path)) is not None
+
+def hash_stream(stream: BinaryIO, media_type: str, max_size: Optional[int] = None) -> Tuple[int, str]:
+    """Hash a stream in chunks and return its size and SHA-256, enforcing max_size"""
+    digest = hashlib.sha256()
+    size = 0
+    while True:
+        chunk = stream.read(UPLOAD_CHUNK_SIZE)
+        if not chunk:
+            break
+        size += len(chunk)
+        if max_size is not None and size > max_size:
+            raise UploadTooLargeError(
+                f"{media_type.capitalize()} file size exceeds {max_size // (1024*1024)}MB limit"
+            )
+        digest.update(chunk)
+    return size, digest.hexdigest()
+
+def _copy_stream(stream: BinaryIO, path: str):
+    """Copy a stream to path in chunks through an atomic replace"""
+    with atomic_write(path, 'wb') as f:
+        shutil.copyfileobj(stream, f, UPLOAD_CHUNK_SIZE)
+
+def ingest_upload(stream: BinaryIO, media_type: str, extension: str,
+                  max_size: Optional[int] = None) -> Tuple[str, str, int, str]:
+    """Store an upload by content hash and return its filename, path, size and sha256.
+
+    The stream is hashed first and only copied to disk if no file with the same
+    contents is stored yet, so duplicate uploads cost no disk writes.
+    """
+    stream.seek(0)
+    size, sha256 = hash_stream(stream, media_type, max_size)
+
+    path = object_path(media_type, sha256, extension)
+    try:
+        # Refresh the mtime so gc's grace period also covers re-uploaded files
+        os.utime(path)
+    except FileNotFoundError:
+        stream.seek(0)
+        _copy_stream(stream, path)
+
+    return os.path.basename(path), path, size, sha256
+
+def iter_media_files(directory: str) -> Iterator[str]:
+    """Yield the media files below a directory, including shard subdirectories"""
+    for root, dirs, files in os.walk(directory):
+        dirs.sort()
+        for filename in sorted(files):
+            if filename.endswith(MEDIA_EXTENSIONS):
+                yield os.path.join(root, filename)
+
+def reference_counts() -> Counter:
+    """Count the submissions referencing each uploaded file path"""
+    counts = Counter()
+    backend = get_backend()
+    if backend.responses_version() is None:
+        return counts
+
+    df = backend.read_responses(REFERENCE_COLUMNS)
+    for column in REFERENCE_COLUMNS:
+        if column not in df.columns:
+            continue
+        for path, count in df[column].dropna().astype(str).value_counts().items():
+            path = normalize_media_path(path)
+            if path:
+                counts[path] += count
+    return counts
+
+def _place_object(source: str, target: str):
+    """Add a copy of source at target, hard-linking when the filesystem allows it"""
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    try:
+        os.link(source, target)
+    except OSError:
+        with open(source, 'rb') as f:
+            _copy_stream(f, target)
+    # A hard link keeps the legacy file's mtime; gc's grace period starts now
+    os.utime(target)
+
+def migrate_uploads() -> Dict:
+    """Move legacy uploads into the content-addressed store.
+
+    Every legacy file is first placed in the store, then submissions are
+    relinked to it, and only then is the legacy file removed, so an interrupted
+    migration can simply be run again. A legacy file that is still referenced
+    after relinking is kept.
+    """
+    moves = {}
+    stats = {'files': 0, 'duplicates': 0, 'bytes_freed': 0, 'relinked': 0, 'kept_referenced': 0}
+
+    for media_type in MEDIA_TYPE_DIRS:
+        for path in iter_media_files(media_dir(media_type)):
+            if is_object_path(path):
+                continue
+
+            with open(path, 'rb') as f:
+                size, sha256 = hash_stream(f, media_type)
+            target = object_path(media_type, sha256, os.path.splitext(path)[1])
+
+            if os.path.exists(target):
+                stats['duplicates'] += 1
+                stats['bytes_freed'] += size
+                os.utime(target)
+            else:
+                _place_object(path, target)
+            moves[normalize_media_path(path)] = {'path': target, 'sha256': sha256}
+            stats['files'] += 1
+
+    if moves:
+        stats['relinked'] = get_backend().relink_media(moves)
+        references = reference_counts()
+        for path in moves:
+            if references[path]:
+                stats['kept_referenced'] += 1
+                continue
+            os.remove(path)
+
+    return stats
+
+def collect_garbage(dry_run: bool = False, grace_period: float = MEDIA_GC_GRACE_PERIOD) -> Dict:
+    """Delete stored files that no submission references.
+
+    Files younger than grace_period are kept, since an upload is stored before
+    the submission that references it is saved.
+    """
+    references = reference_counts()
+    cutoff = time.time() - grace_period
+    stats = {'removed': 0, 'bytes_freed': 0, 'kept_recent': 0}
+
+    for media_type in MEDIA_TYPE_DIRS:
+        for path in iter_media_files(media_dir(media_type)):
+            if not is_object_path(path) or references[normalize_media_path(path)]:
+                continue
+
+            stat = os.stat(path)
+            if stat.st_mtime > cutoff:
+                stats['kept_recent'] += 1
+                continue
+
+            stats['removed'] += 1
+            stats['bytes_freed'] += stat.st_size
+            if not dry_run:
+                os.remove(path)
+
+    return stats
+
+def store_stats() -> Dict:
+    """Count stored objects, their references and the bytes saved by deduplication"""
+    references = reference_counts()
+    stats = {'objects': 0, 'legacy_files': 0, 'bytes': 0, 'references': 0,
+             'unreferenced': 0, 'bytes_deduplicated': 0}
+
+    for media_type in MEDIA_TYPE_DIRS:
+        for path in iter_media_files(media_dir(media_type)):
+            size = os.path.getsize(path)
+            count = references[normalize_media_path(path)]
+            stats['bytes'] += size
+            stats['references'] += count
+            if not is_object_path(path):
+                stats['legacy_files'] += 1
+                continue
+            stats['objects'] += 1
+            if count == 0:
+                stats['unreferenced'] += 1
+            stats['bytes_deduplicated'] += size * max(count - 1, 0)
+
+    return stats
+
+def main():
+    parser = argparse.ArgumentParser(description="Maintain the content-addressed media store")
+    parser.add_argument('command', choices=['migrate', 'gc', 'stats'],
+                        help="migrate: move legacy uploads into the store; "
+                             "gc: delete unreferenced files; stats: print store usage")
+    parser.add_argument('--dry-run', action='store_true', help="gc: only report what would be deleted")
+    args = parser.parse_args()
+
+    if args.command == 'migrate':
+        stats = migrate_uploads()
+        print(f"✅ Migrated {stats['files']} uploads ({stats['duplicates']} duplicates, "
+              f"{stats['bytes_freed'] / (1024*1024):.1f}MB freed); relinked {stats['relinked']} references")
+        if stats['kept_referenced']:
+            print(f"   Kept {stats['kept_referenced']} legacy files that are still referenced")
+    elif args.command == 'gc':
+        stats = collect_garbage(dry_run=args.dry_run)
+        action = "Would remove" if args.dry_run else "Removed"
+        print(f"✅ {action} {stats['removed']} unreferenced files "
+              f"({stats['bytes_freed'] / (1024*1024):.1f}MB); kept {stats['kept_recent']} recent uploads")
+    elif args.command == 'stats':
+        stats = store_stats()
+        print(f"✅ {stats['objects']} stored files ({stats['bytes'] / (1024*1024):.1f}MB), "
+              f"{stats['references']} references, {stats['unreferenced']} unreferenced, "
+              f"{stats['legacy_files']} legacy uploads; "
+              f"deduplication saved {stats['bytes_deduplicated'] / (1024*1024):.1f}MB")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,312 @@
+"""
+Background processing of uploaded media
+Saving an upload only hashes and stores the file. Validation, metadata
+extraction (resolution, EXIF, duration, perceptual hashes) and rendition
+generation run on a process pool, so the submission is saved without waiting
+for them and several uploads are processed on separate cores. Results are appended to
+data/media_metadata.jsonl keyed by sha256, which links them to submissions
+through the file_sha256 column.
+
+Usage:
+    python media_worker.py backfill   # process stored uploads that have no metadata yet
+"""
+
+import argparse
+import importlib.util
+import json
+import multiprocessing
+import os
+import threading
+import time
+import wave
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import Dict, Optional
+
+import pandas as pd
+from PIL import ExifTags, Image
+
+# OpenCV is optional and slow to import, so it is loaded only to read a video
+OPENCV_AVAILABLE = importlib.util.find_spec('cv2') is not None
+
+from config import DATA_FOLDER, MEDIA_METADATA_FILE, MEDIA_WORKERS, RENDITION_WIDTHS
+from data_cache import cached_on, bump_write_generation
+from file_lock import file_lock
+from media_store import MEDIA_TYPE_DIRS, iter_media_files, is_object_path, media_dir
+from renditions import create_rendition
+
+# EXIF fields kept in the metadata record
+EXIF_FIELDS = ('DateTime', 'Make', 'Model', 'Orientation', 'Software')
+
+# Extraction (runs in the worker processes)
+
+def _image_metadata(path: str) -> Dict:
+    with Image.open(path) as image:
+        exif = image.getexif()
+        metadata = {
+            'format': image.format,
+            'width': image.width,
+            'height': image.height,
+            'exif': {
+                ExifTags.TAGS.get(tag, str(tag)): str(value)
+                for tag, value in exif.items()
+                if ExifTags.TAGS.get(tag) in EXIF_FIELDS
+            }
+        }
+        # Orientations 5-8 rotate by 90 degrees, so the displayed size is swapped
+        if exif.get(0x0112) in (5, 6, 7, 8):
+            metadata['width'], metadata['height'] = image.height, image.width
+
+    # verify() checks the whole file for corruption but leaves the image unusable
+    with Image.open(path) as image:
+        image.verify()
+
+    # Imported here: it imports this module for the metadata store
+    from perceptual_hash import perceptual_hashes
+
+    metadata.update(perceptual_hashes(path))
+    metadata['renditions'] = [create_rendition(path, width) for width in RENDITION_WIDTHS]
+    return metadata
+
+def _audio_metadata(path: str) -> Dict:
+    if not path.lower().endswith('.wav'):
+        return {}
+
+    with wave.open(path, 'rb') as audio:
+        frames = audio.getnframes()
+        rate = audio.getframerate()
+        return {
+            'channels': audio.getnchannels(),
+            'sample_rate': rate,
+            'duration_seconds': round(frames / rate, 3) if rate else None
+        }
+
+def _video_metadata(path: str) -> Dict:
+    if not OPENCV_AVAILABLE:
+        return {}
+
+    import cv2
+    capture = cv2.VideoCapture(path)
+    try:
+        if not capture.isOpened():
+            raise ValueError("Video could not be decoded")
+        fps = capture.get(cv2.CAP_PROP_FPS)
+        frames = capture.get(cv2.CAP_PROP_FRAME_COUNT)
+        return {
+            'width': int(capture.get(cv2.CAP_PROP_FRAME_WIDTH)),
+            'height': int(capture.get(cv2.CAP_PROP_FRAME_HEIGHT)),
+            'fps': round(fps, 3),
+            'duration_seconds': round(frames / fps, 3) if fps else None
+        }
+    finally:
+        capture.release()
+
+EXTRACTORS = {'image': _image_metadata, 'audio': _audio_metadata, 'video': _video_metadata}
+
+def process_media(path: str, media_type: str, sha256: str) -> Dict:
+    """Validate a stored media file and extract its metadata"""
+    started = time.perf_counter()
+    record = {
+        'sha256': sha256,
+        'path': path,
+        'media_type': media_type,
+        'size': os.path.getsize(path),
+        'valid': True,
+        'error': None
+    }
+
+    try:
+        record.update(EXTRACTORS.get(media_type, lambda _: {})(path))
+    except Exception as e:
+        record['valid'] = False
+        record['error'] = str(e)
+
+    record['processed_at'] = time.time()
+    record['duration_ms'] = round((time.perf_counter() - started) * 1000, 2)
+    return record
+
+# Metadata store
+
+def append_metadata(record: Dict):
+    """Append a processing result to the media metadata file"""
+    Path(DATA_FOLDER).mkdir(exist_ok=True)
+
+    with file_lock(MEDIA_METADATA_FILE):
+        with open(MEDIA_METADATA_FILE, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(record, ensure_ascii=False) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+    bump_write_generation(MEDIA_METADATA_FILE)
+
+@cached_on(MEDIA_METADATA_FILE, copy_result=False)
+def load_media_metadata() -> Dict[str, Dict]:
+    """Get the latest processing result per sha256 (read-only)"""
+    metadata = {}
+    if not os.path.exists(MEDIA_METADATA_FILE):
+        return metadata
+
+    with open(MEDIA_METADATA_FILE, 'r', encoding='utf-8') as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue  # a torn last line from an interrupted write
+            metadata[record['sha256']] = record
+    return metadata
+
+def get_media_metadata(sha256: str) -> Optional[Dict]:
+    """Get the processing result of a stored file, if it was processed"""
+    record = load_media_metadata().get(sha256)
+    return dict(record) if record else None
+
+def attach_media_metadata(df: pd.DataFrame) -> pd.DataFrame:
+    """Add resolution, duration and validation columns to submissions by file_sha256"""
+    if df.empty or 'file_sha256' not in df.columns:
+        return df
+
+    metadata = load_media_metadata()
+    records = [metadata.get(sha256) or {} for sha256 in df['file_sha256']]
+    df = df.copy()
+    df['width'] = [record.get('width') for record in records]
+    df['height'] = [record.get('height') for record in records]
+    df['duration_seconds'] = [record.get('duration_seconds') for record in records]
+    df['media_valid'] = [record.get('valid') for record in records]
+    df['media_error'] = [record.get('error') for record in records]
+    return df
+
+# Worker pool
+
+class MediaWorkerPool:
+    """Process pool that processes each stored file once and records the result.
+
+    Workers are started with the 'spawn' method: forking the multi-threaded
+    Streamlit server could copy locks held by other threads into the children.
+    """
+
+    def __init__(self, workers: int = MEDIA_WORKERS):
+        self.workers = workers
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._pending: Dict[str, Future] = {}
+        self.stats = {'submitted': 0, 'completed': 0, 'failed': 0, 'skipped': 0}
+        self.recent = deque(maxlen=20)
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers, mp_context=multiprocessing.get_context('spawn')
+            )
+        return self._executor
+
+    def submit(self, path: str, media_type: str, sha256: str) -> Optional[Future]:
+        """Queue a stored file for processing (skipped if it was already processed)"""
+        with self._lock:
+            if sha256 in self._pending:
+                return self._pending[sha256]
+            if sha256 in load_media_metadata():
+                self.stats['skipped'] += 1
+                return None
+
+            try:
+                future = self._get_executor().submit(process_media, path, media_type, sha256)
+            except BrokenProcessPool:
+                # A worker died; start a fresh pool
+                self._executor = None
+                future = self._get_executor().submit(process_media, path, media_type, sha256)
+
+            self._pending[sha256] = future
+            self.stats['submitted'] += 1
+
+        future.add_done_callback(lambda done: self._on_done(sha256, path, media_type, done))
+        return future
+
+    def _on_done(self, sha256: str, path: str, media_type: str, future: Future):
+        try:
+            record = future.result()
+        except Exception as e:
+            # The worker itself failed (not the file), so nothing is recorded
+            # and the file is processed again the next time it is queued
+            print(f"Error processing media {path}: {e}")
+            record = None
+            if isinstance(e, BrokenProcessPool):
+                with self._lock:
+                    self._executor = None
+        else:
+            try:
+                append_metadata(record)
+            except Exception as e:
+                print(f"Error saving media metadata: {e}")
+
+        with self._lock:
+            self._pending.pop(sha256, None)
+            if record is None:
+                self.stats['failed'] += 1
+                record = {'path': path, 'media_type': media_type, 'valid': False, 'error': 'Worker failed'}
+            else:
+                self.stats['completed' if record['valid'] else 'failed'] += 1
+            self.recent.append({key: record.get(key) for key in
+                                ('path', 'media_type', 'valid', 'error', 'duration_ms')})
+
+    def wait(self):
+        """Block until all queued files are processed"""
+        with self._lock:
+            futures = list(self._pending.values())
+        wait(futures)
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            return {**self.stats, 'pending': len(self._pending), 'workers': self.workers,
+                    'recent': list(self.recent)}
+
+_pool: Optional[MediaWorkerPool] = None
+_pool_lock = threading.Lock()
+
+def get_media_pool() -> MediaWorkerPool:
+    """Get the process-wide media worker pool"""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = MediaWorkerPool()
+    return _pool
+
+def enqueue_media(path: str, media_type: str, sha256: str) -> Optional[Future]:
+    """Queue a newly stored file for background processing"""
+    return get_media_pool().submit(path, media_type, sha256)
+
+def get_media_worker_stats() -> Dict:
+    """Get counters and the most recent results of the media worker pool"""
+    return get_media_pool().get_stats()
+
+def backfill() -> Dict:
+    """Process all stored uploads that have no metadata yet"""
+    pool = get_media_pool()
+    queued = 0
+
+    for media_type in MEDIA_TYPE_DIRS:
+        for path in iter_media_files(media_dir(media_type)):
+            # Legacy uploads have no content hash yet; run `python media_store.py migrate` first
+            if not is_object_path(path):
+                continue
+            sha256 = os.path.splitext(os.path.basename(path))[0]
+            if pool.submit(path, media_type, sha256) is not None:
+                queued += 1
+
+    pool.wait()
+    return {**pool.get_stats(), 'queued': queued}
+
+def main():
+    parser = argparse.ArgumentParser(description="Run background media processing")
+    parser.add_argument('command', choices=['backfill'],
+                        help="backfill: process stored uploads that have no metadata yet")
+    args = parser.parse_args()
+
+    if args.command == 'backfill':
+        stats = backfill()
+        print(f"✅ Processed {stats['queued']} uploads with {stats['workers']} workers "
+              f"({stats['failed']} failed, {stats['skipped']} already processed)")
+
+if __name__ == "__main__":
+    main()
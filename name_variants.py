@@ -0,0 +1,312 @@
+"""
+Variant grouping of Idi-Emiti local names
+The same name is submitted in Telugu or Devanagari script, romanized, and with
+spelling variants (Bathukamma, bathukama, బతుకమ్మ). Each local name and
+pronunciation guide is reduced to a transliteration key (Brahmic scripts are
+transliterated; case, diacritics, aspiration, doubled letters and vowel length
+are ignored), identical keys are grouped by hashing, and a longer key within
+a few edits of a group's most submitted spelling joins that group. Groups are
+found through a bigram index, so a name is compared only with the few groups
+that share its rarest bigrams, not with every other name.
+
+Usage:
+    python name_variants.py                           # print the vocabulary of every object
+    python name_variants.py --object assets/image.jpg
+    python name_variants.py key బతుకమ్మ Bathukamma     # print transliteration keys
+"""
+
+import argparse
+import re
+import unicodedata
+from collections import Counter, defaultdict
+from typing import Dict, Iterable, List, Tuple
+
+from config import NAME_VARIANT_DISTANCE_RATIO, NAME_VARIANT_MIN_LENGTH
+from aggregate_store import IDI_EMITI_CATEGORY
+from analytics_engine import get_analytics_snapshot
+from data_cache import get_or_compute
+from media_store import normalize_media_path
+from storage_backend import get_backend
+
+# Transliteration of the Brahmic blocks (Devanagari to Malayalam, U+0900-U+0D7F),
+# which share one layout: offset within the block -> (kind, Latin)
+BRAHMIC_START = 0x0900
+BRAHMIC_END = 0x0D80
+BRAHMIC = {
+    0x01: ('mark', 'n'), 0x02: ('mark', 'n'), 0x03: ('mark', 'h'),
+    0x05: ('vowel', 'a'), 0x06: ('vowel', 'aa'), 0x07: ('vowel', 'i'), 0x08: ('vowel', 'ii'),
+    0x09: ('vowel', 'u'), 0x0A: ('vowel', 'uu'), 0x0B: ('vowel', 'ri'), 0x0C: ('vowel', 'li'),
+    0x0D: ('vowel', 'e'), 0x0E: ('vowel', 'e'), 0x0F: ('vowel', 'e'), 0x10: ('vowel', 'ai'),
+    0x11: ('vowel', 'o'), 0x12: ('vowel', 'o'), 0x13: ('vowel', 'o'), 0x14: ('vowel', 'au'),
+    0x15: ('consonant', 'k'), 0x16: ('consonant', 'kh'), 0x17: ('consonant', 'g'), 0x18: ('consonant', 'gh'),
+    0x19: ('consonant', 'n'), 0x1A: ('consonant', 'ch'), 0x1B: ('consonant', 'ch'), 0x1C: ('consonant', 'j'),
+    0x1D: ('consonant', 'jh'), 0x1E: ('consonant', 'n'), 0x1F: ('consonant', 't'), 0x20: ('consonant', 'th'),
+    0x21: ('consonant', 'd'), 0x22: ('consonant', 'dh'), 0x23: ('consonant', 'n'), 0x24: ('consonant', 't'),
+    0x25: ('consonant', 'th'), 0x26: ('consonant', 'd'), 0x27: ('consonant', 'dh'), 0x28: ('consonant', 'n'),
+    0x29: ('consonant', 'n'), 0x2A: ('consonant', 'p'), 0x2B: ('consonant', 'ph'), 0x2C: ('consonant', 'b'),
+    0x2D: ('consonant', 'bh'), 0x2E: ('consonant', 'm'), 0x2F: ('consonant', 'y'), 0x30: ('consonant', 'r'),
+    0x31: ('consonant', 'r'), 0x32: ('consonant', 'l'), 0x33: ('consonant', 'l'), 0x34: ('consonant', 'zh'),
+    0x35: ('consonant', 'v'), 0x36: ('consonant', 'sh'), 0x37: ('consonant', 'sh'), 0x38: ('consonant', 's'),
+    0x39: ('consonant', 'h'),
+    0x3C: ('nukta', ''), 0x3D: ('mark', ''),
+    0x3E: ('sign', 'aa'), 0x3F: ('sign', 'i'), 0x40: ('sign', 'ii'), 0x41: ('sign', 'u'), 0x42: ('sign', 'uu'),
+    0x43: ('sign', 'ri'), 0x44: ('sign', 'ri'), 0x45: ('sign', 'e'), 0x46: ('sign', 'e'), 0x47: ('sign', 'e'),
+    0x48: ('sign', 'ai'), 0x49: ('sign', 'o'), 0x4A: ('sign', 'o'), 0x4B: ('sign', 'o'), 0x4C: ('sign', 'au'),
+    0x4D: ('virama', ''),
+    0x58: ('consonant', 'k'), 0x59: ('consonant', 'kh'), 0x5A: ('consonant', 'g'), 0x5B: ('consonant', 'z'),
+    0x5C: ('consonant', 'r'), 0x5D: ('consonant', 'rh'), 0x5E: ('consonant', 'f'), 0x5F: ('consonant', 'y'),
+    0x60: ('vowel', 'ri'), 0x61: ('vowel', 'li'), 0x62: ('sign', 'li'), 0x63: ('sign', 'li'),
+    **{0x66 + digit: ('mark', str(digit)) for digit in range(10)}
+}
+
+# Spelling conventions that romanizations of the same word disagree on, applied in order
+KEY_RULES = [
+    (re.compile(r'ee'), 'i'),
+    (re.compile(r'oo'), 'u'),
+    (re.compile(r'([kgcjtdpbsz])h'), r'\1'),  # aspiration (kh, th, bh, ch, sh, ...)
+    (re.compile(r'w'), 'v'),
+    (re.compile(r'z'), 'j'),
+    (re.compile(r'q'), 'k'),
+    (re.compile(r'f'), 'p'),
+    (re.compile(r'x'), 'ks'),
+    (re.compile(r'(.)\1+'), r'\1'),  # doubled letters and long vowels
+    (re.compile(r'm(?=[bcdgjkpst])'), 'n'),  # nasals before a consonant (anusvara)
+]
+
+# Normalization
+
+def display_form(text) -> str:
+    """A submitted name with Unicode normalization and whitespace cleaned up"""
+    return ' '.join(unicodedata.normalize('NFC', str(text)).split())
+
+def transliterate(text: str) -> str:
+    """Write Brahmic-script text in Latin letters (other characters are kept)"""
+    out = []
+    pending = False  # a consonant still carrying its inherent 'a'
+    for char in unicodedata.normalize('NFC', text):
+        code = ord(char)
+        if not BRAHMIC_START <= code < BRAHMIC_END:
+            if pending:
+                out.append('a')
+                pending = False
+            out.append(char)
+            continue
+
+        kind, latin = BRAHMIC.get(code & 0x7F, ('mark', ''))
+        if kind == 'nukta':
+            continue
+        if kind == 'consonant':
+            if pending:
+                out.append('a')
+            out.append(latin)
+            pending = True
+        elif kind == 'sign':
+            out.append(latin)
+            pending = False
+        elif kind == 'virama':
+            pending = False
+        else:
+            if pending:
+                out.append('a')
+                pending = False
+            out.append(latin)
+    if pending:
+        out.append('a')
+    return ''.join(out)
+
+def transliteration_key(text) -> str:
+    """Reduce a name to the key its script and spelling variants share ('' if it has no letters)"""
+    if text is None or text != text:  # missing or NaN
+        return ''
+    latin = unicodedata.normalize('NFKD', transliterate(str(text))).casefold()
+    # Diacritics (IAST ā, ṭ, ...) are dropped along with spaces and punctuation
+    key = ''.join(char for char in latin if char.isalnum())
+    for pattern, replacement in KEY_RULES:
+        key = pattern.sub(replacement, key)
+    # Final inherent vowels come and go (Hindi schwa deletion, Telugu -a/-u endings)
+    if len(key) > 3 and key[-1] == 'a':
+        key = key[:-1]
+    return key
+
+# Grouping
+
+def bounded_distance(a: str, b: str, limit: int) -> int:
+    """Levenshtein distance of a and b, or limit + 1 as soon as it must exceed limit"""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        for j, char_b in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (char_a != char_b)))
+        if min(current) > limit:
+            return limit + 1
+        previous = current
+    return min(previous[-1], limit + 1)
+
+def variant_limit(key: str) -> int:
+    """Edits allowed between a key and a group's key (none for short keys)"""
+    if len(key) < NAME_VARIANT_MIN_LENGTH:
+        return 0
+    return int(len(key) * NAME_VARIANT_DISTANCE_RATIO)
+
+def _bigrams(key: str) -> set:
+    padded = f"^{key}$"
+    return {padded[i:i + 2] for i in range(len(padded) - 1)}
+
+class VariantGrouper:
+    """Groups transliteration keys around representative keys found through a bigram index.
+
+    The first key of a group is its representative; a later key joins the group
+    whose representative is closest, if it starts with the same letter and is
+    within variant_limit edits of it.
+    Keys are never chained through other members, so two keys in one group are
+    at most twice the limit apart, and keys added in order of frequency make the
+    most submitted spellings the representatives.
+
+    An edit changes at most 2 of a key's distinct bigrams, so a key within
+    `limit` edits of a representative shares all but 2 * limit of its bigrams
+    with it, and therefore at least one of any 2 * limit + 1 of them. Only the
+    representatives listed under the new key's 2 * limit + 1 rarest bigrams, and
+    sharing enough bigrams, are compared with it.
+    """
+
+    def __init__(self):
+        self._groups: Dict[str, int] = {}
+        self._representatives: List[str] = []
+        self._grams: List[set] = []
+        self._postings: Dict[str, List[int]] = defaultdict(list)
+
+    def add(self, key: str) -> int:
+        """Add a key to the group of the closest representative (or a new group) and return the group id"""
+        group = self._groups.get(key)
+        if group is not None:
+            return group
+
+        grams = _bigrams(key)
+        limit = variant_limit(key)
+        best = (limit + 1, None)
+        if limit:
+            probes = sorted(grams, key=lambda gram: len(self._postings.get(gram, ())))[:2 * limit + 1]
+            candidates = set()
+            for gram in probes:
+                candidates.update(self._postings.get(gram, ()))
+            for candidate in sorted(candidates):
+                representative, representative_grams = self._representatives[candidate], self._grams[candidate]
+                candidate_limit = min(limit, variant_limit(representative))
+                # Variant spellings keep the initial sound; a different one is a different word
+                if (candidate_limit and representative[0] == key[0] and len(grams & representative_grams)
+                        >= max(len(grams), len(representative_grams)) - 2 * candidate_limit):
+                    distance = bounded_distance(key, representative, candidate_limit)
+                    if distance <= candidate_limit and distance < best[0]:
+                        best = (distance, candidate)
+
+        group = best[1]
+        if group is None:
+            group = len(self._representatives)
+            self._representatives.append(key)
+            self._grams.append(grams)
+            for gram in grams:
+                self._postings[gram].append(group)
+        self._groups[key] = group
+        return group
+
+def group_names(entries: Iterable[Tuple[str, str, int]]) -> List[Dict]:
+    """Group (local name, pronunciation guide, submissions) entries into names, most submitted first.
+
+    Only the local names are grouped; pronunciation guides are listed with the
+    name they were given for, but two names are never joined because of them.
+    """
+    keyed = []
+    key_counts: Counter = Counter()
+    for name, pronunciation, count in entries:
+        key = transliteration_key(name)
+        if key:
+            keyed.append((key, name, pronunciation, count))
+            key_counts[key] += count
+
+    grouper = VariantGrouper()
+    for key, _ in sorted(key_counts.items(), key=lambda item: (-item[1], item[0])):
+        grouper.add(key)
+
+    groups: Dict[int, Dict] = {}
+    for key, name, pronunciation, count in keyed:
+        group = groups.setdefault(grouper.add(key), {'submissions': 0, 'names': Counter(),
+                                                     'pronunciations': Counter()})
+        group['submissions'] += count
+        group['names'][display_form(name)] += count
+        if pronunciation is not None and pronunciation == pronunciation and display_form(pronunciation):
+            group['pronunciations'][display_form(pronunciation)] += count
+
+    names = []
+    for group in groups.values():
+        names.append({
+            'name': group['names'].most_common(1)[0][0],
+            'submissions': group['submissions'],
+            'variants': dict(group['names'].most_common()),
+            'pronunciations': dict(group['pronunciations'].most_common())
+        })
+    return sorted(names, key=lambda item: (-item['submissions'], item['name']))
+
+# Vocabulary of the Idi-Emiti objects
+
+def _build_vocabulary() -> Dict:
+    """Group the local names of every object, and of all objects together"""
+    snapshot = get_analytics_snapshot()
+    vocabulary = {'objects': {}, 'names': []}
+    if snapshot is None:
+        return vocabulary
+
+    df = snapshot.frame('category', 'file_path', 'local_language_name', 'pronunciation_guide')
+    df = df[df['category'] == IDI_EMITI_CATEGORY]
+    if df.empty:
+        return vocabulary
+
+    # Each distinct (object, name, pronunciation) is keyed once, however often it was submitted
+    counts = df.fillna('').groupby(['file_path', 'local_language_name', 'pronunciation_guide'],
+                                   observed=True).size()
+    by_object = defaultdict(list)
+    overall = Counter()
+    for (path, name, pronunciation), count in counts.items():
+        by_object[normalize_media_path(path)].append((name, pronunciation, int(count)))
+        overall[(name, pronunciation)] += int(count)
+
+    vocabulary['objects'] = {path: group_names(entries) for path, entries in by_object.items()}
+    vocabulary['names'] = group_names((name, pronunciation, count)
+                                      for (name, pronunciation), count in overall.items())
+    return vocabulary
+
+def get_vocabulary() -> Dict:
+    """Get the grouped names per normalized object path ('objects') and overall ('names') (read-only)"""
+    return get_or_compute('get_name_vocabulary', ('name_vocabulary',), get_backend().responses_version(),
+                          _build_vocabulary, copy_result=False)
+
+def main():
+    parser = argparse.ArgumentParser(description="Group spelling and script variants of Idi-Emiti local names")
+    parser.add_argument('command', nargs='?', choices=['vocabulary', 'key'], default='vocabulary',
+                        help="vocabulary: print the grouped names per object; key: print transliteration keys")
+    parser.add_argument('names', nargs='*', help="key: names to reduce")
+    parser.add_argument('--object', help="vocabulary: only this object path")
+    args = parser.parse_args()
+
+    if args.command == 'key':
+        for name in args.names:
+            print(f"{name}\t{transliteration_key(name)}")
+        return
+
+    objects = get_vocabulary()['objects']
+    if args.object:
+        if args.object not in objects:
+            print(f"Error: no identifications of {args.object}")
+            return
+        objects = {args.object: objects[args.object]}
+
+    for path, names in sorted(objects.items()):
+        print(f"{path}: {len(names)} names")
+        for name in names:
+            variants = ', '.join(f"{form} ({count})" for form, count in name['variants'].items())
+            print(f"  {name['submissions']:5d}  {name['name']}  [{variants}]")
+    print(f"✅ {len(objects)} objects, {len(get_vocabulary()['names'])} distinct names overall")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Coverage-aware scheduling of objects for the Idi-Emiti game
+Each image in assets/ is weighted by how well it is already documented
+(identifications and distinct dialects), so under-documented objects are shown
+more often. The cumulative weights are precomputed and rebuilt only when the
+submissions or the assets change, so picking an object is a binary search.
+"""
+
+import random
+from bisect import bisect_right
+from itertools import accumulate
+from typing import Dict, List, Optional, Set
+
+from config import ASSETS_FOLDER, IDI_EMITI_IDENTIFICATION_WEIGHT, IDI_EMITI_DIALECT_WEIGHT
+from aggregate_store import IDI_EMITI_CATEGORY
+from analytics_engine import get_analytics_snapshot
+from data_cache import get_or_compute
+from media_catalog import get_media_catalog
+from media_store import normalize_media_path
+from storage_backend import get_backend
+
+# Draws that may hit already-seen objects before falling back to a scan of the unseen ones
+MAX_REJECTED_DRAWS = 32
+
+def _identification_coverage() -> Dict[str, Dict]:
+    """Count identifications and distinct dialects per object file path"""
+    snapshot = get_analytics_snapshot()
+    if snapshot is None:
+        return {}
+
+    df = snapshot.frame('category', 'file_path', 'dialect_regional_variation')
+    df = df[df['category'] == IDI_EMITI_CATEGORY]
+    if df.empty:
+        return {}
+
+    dialects = df['dialect_regional_variation'].astype('string').str.strip().str.casefold()
+    # Paths saved on Windows (assets\2.jpeg) must match the catalog's (assets/2.jpeg)
+    paths = df['file_path'].map(normalize_media_path)
+    grouped = df.assign(path=paths, dialect=dialects.mask(dialects == '')).groupby('path', observed=True)
+    identifications = grouped.size()
+    distinct_dialects = grouped['dialect'].nunique()
+
+    return {
+        path: {'identifications': int(identifications[path]), 'dialects': int(distinct_dialects[path])}
+        for path in identifications.index
+    }
+
+def _build_index() -> Dict:
+    """Build the cumulative weight table over all Idi-Emiti objects"""
+    paths = [entry['path'] for entry in get_media_catalog().files(ASSETS_FOLDER, 'image')]
+    coverage = _identification_coverage()
+
+    objects = []
+    for path in paths:
+        counts = coverage.get(normalize_media_path(path), {'identifications': 0, 'dialects': 0})
+        weight = 1.0 / (1.0 + IDI_EMITI_IDENTIFICATION_WEIGHT * counts['identifications']
+                        + IDI_EMITI_DIALECT_WEIGHT * counts['dialects'])
+        objects.append({'path': path, **counts, 'weight': weight})
+
+    cumulative = list(accumulate(obj['weight'] for obj in objects))
+    return {
+        'objects': objects,
+        'paths': paths,
+        'positions': {path: i for i, path in enumerate(paths)},
+        'cumulative': cumulative,
+        'total': cumulative[-1] if cumulative else 0.0
+    }
+
+def get_schedule_index() -> Dict:
+    """Get the weight table for the current submissions and assets (read-only)"""
+    version = (get_backend().responses_version(), get_media_catalog().version())
+    return get_or_compute('get_schedule_index', ('schedule_index',), version, _build_index, copy_result=False)
+
+def next_object(seen: Set[str], rng: random.Random = random) -> Optional[str]:
+    """Pick the next object to show, skipping objects in seen (None if all were seen)"""
+    index = get_schedule_index()
+    paths = index['paths']
+    if len(paths) - sum(1 for path in seen if path in index['positions']) <= 0:
+        return None
+
+    for _ in range(MAX_REJECTED_DRAWS):
+        position = bisect_right(index['cumulative'], rng.random() * index['total'])
+        path = paths[min(position, len(paths) - 1)]
+        if path not in seen:
+            return path
+
+    # Most objects were already seen; choose among the rest directly
+    unseen = [obj for obj in index['objects'] if obj['path'] not in seen]
+    return rng.choices([obj['path'] for obj in unseen], weights=[obj['weight'] for obj in unseen])[0]
+
+def get_object_coverage() -> List[Dict]:
+    """Get identifications, dialects and scheduling weight per object, least documented first"""
+    index = get_schedule_index()
+    total = index['total'] or 1.0
+    return sorted(
+        ({**obj, 'share': round(obj['weight'] / total * 100, 1)} for obj in index['objects']),
+        key=lambda obj: (-obj['weight'], obj['path'])
+    )
@@ -0,0 +1,228 @@
+"""
+Near-duplicate detection for uploaded images
+The media worker stores two 64-bit perceptual hashes with each image's metadata:
+a pHash (signs of the low-frequency DCT coefficients of a 32x32 grayscale copy)
+and a dHash (brightness gradients of a 9x8 copy). Re-compressed, resized or
+slightly re-framed photos of the same object get hashes a few bits apart, which
+exact sha256 matching cannot see. The pHashes are kept in a multi-index hash
+table, so looking up the images within a Hamming radius reads a few hundred
+hash buckets instead of comparing with every image; candidates are confirmed
+with the dHash.
+
+Usage:
+    python perceptual_hash.py backfill   # hash processed images that have no perceptual hash yet
+    python perceptual_hash.py pairs      # print the possible duplicates
+"""
+
+import argparse
+import threading
+from itertools import combinations
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from PIL import Image, ImageOps
+
+from config import MEDIA_METADATA_FILE, PHASH_DUPLICATE_DISTANCE, DHASH_DUPLICATE_DISTANCE
+from data_cache import cached_on, get_file_version
+from media_worker import append_metadata, load_media_metadata
+
+HASH_SIZE = 8
+PHASH_SAMPLE_SIZE = 32
+
+def _dct_matrix(size: int) -> np.ndarray:
+    """Orthonormal DCT-II basis, so coefficients are matrix @ pixels @ matrix.T"""
+    k = np.arange(size)[:, None]
+    n = np.arange(size)[None, :]
+    matrix = np.sqrt(2.0 / size) * np.cos(np.pi * (2 * n + 1) * k / (2 * size))
+    matrix[0] /= np.sqrt(2.0)
+    return matrix
+
+DCT_MATRIX = _dct_matrix(PHASH_SAMPLE_SIZE)
+
+# Hashing (runs in the media worker processes)
+
+def _bits_to_hex(bits: np.ndarray) -> str:
+    return np.packbits(bits.astype(np.uint8).flatten()).tobytes().hex()
+
+def dhash(image: Image.Image) -> str:
+    """Difference hash: whether each pixel is brighter than its left neighbour"""
+    pixels = np.asarray(image.resize((HASH_SIZE + 1, HASH_SIZE), Image.LANCZOS), dtype=np.int16)
+    return _bits_to_hex(pixels[:, 1:] > pixels[:, :-1])
+
+def phash(image: Image.Image) -> str:
+    """DCT hash: whether each low-frequency coefficient is above their median"""
+    pixels = np.asarray(image.resize((PHASH_SAMPLE_SIZE, PHASH_SAMPLE_SIZE), Image.LANCZOS), dtype=np.float64)
+    low = (DCT_MATRIX @ pixels @ DCT_MATRIX.T)[:HASH_SIZE, :HASH_SIZE].flatten()
+    # The DC coefficient is the overall brightness and would dominate the median
+    return _bits_to_hex(low > np.median(low[1:]))
+
+def perceptual_hashes(path: str) -> Dict[str, str]:
+    """Get the pHash and dHash of an image file, as 16 hex digits each"""
+    with Image.open(path) as image:
+        # Only a small grayscale copy is needed, so JPEGs are decoded at reduced size
+        image.draft('L', (PHASH_SAMPLE_SIZE * 4, PHASH_SAMPLE_SIZE * 4))
+        grayscale = ImageOps.exif_transpose(image).convert('L')
+    return {'phash': phash(grayscale), 'dhash': dhash(grayscale)}
+
+def hamming(a: int, b: int) -> int:
+    return bin(a ^ b).count('1')
+
+# Index
+
+class MultiIndexHashTable:
+    """Hashes split into CHUNKS 16-bit substrings, each indexed in its own hash table.
+
+    If two hashes differ in at most r bits, one of their CHUNKS substrings
+    differs in at most r // CHUNKS bits (pigeonhole). A search therefore looks
+    up, in every table, the substrings within r // CHUNKS bits of the query's,
+    and checks the full distance of only the hashes found there.
+    """
+
+    CHUNKS = 4
+    CHUNK_BITS = 16
+
+    def __init__(self):
+        self._tables: List[Dict[int, list]] = [{} for _ in range(self.CHUNKS)]
+        self._flip_masks: Dict[int, List[int]] = {}
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _chunks(self, value: int) -> List[int]:
+        mask = (1 << self.CHUNK_BITS) - 1
+        return [(value >> (self.CHUNK_BITS * i)) & mask for i in range(self.CHUNKS)]
+
+    def _masks(self, radius: int) -> List[int]:
+        """Every chunk-sized bit mask with at most radius bits set"""
+        if radius not in self._flip_masks:
+            self._flip_masks[radius] = [
+                sum(1 << bit for bit in bits)
+                for count in range(radius + 1)
+                for bits in combinations(range(self.CHUNK_BITS), count)
+            ]
+        return self._flip_masks[radius]
+
+    def add(self, value: int, item):
+        for table, chunk in zip(self._tables, self._chunks(value)):
+            table.setdefault(chunk, []).append((value, item))
+        self._size += 1
+
+    def search(self, value: int, radius: int) -> List[Tuple[int, object]]:
+        """Get (distance, item) for every item within radius of value"""
+        masks = self._masks(radius // self.CHUNKS)
+        found = {}
+        for table, chunk in zip(self._tables, self._chunks(value)):
+            for mask in masks:
+                for other, item in table.get(chunk ^ mask, ()):
+                    if item not in found:
+                        distance = hamming(value, other)
+                        if distance <= radius:
+                            found[item] = distance
+        return [(distance, item) for item, distance in found.items()]
+
+class DuplicateIndex:
+    """Perceptual hashes of the processed images, extended as the media worker records new ones"""
+
+    def __init__(self):
+        self.table = MultiIndexHashTable()
+        self.hashes: Dict[str, Tuple[int, int]] = {}
+        self._version = None
+        self._lock = threading.Lock()
+
+    def sync(self):
+        """Add images hashed since the last sync (metadata records are only ever added)"""
+        with self._lock:
+            version = get_file_version(MEDIA_METADATA_FILE)
+            if version == self._version:
+                return
+            for sha256, record in load_media_metadata().items():
+                if sha256 not in self.hashes and record.get('phash') and record.get('dhash'):
+                    hashes = (int(record['phash'], 16), int(record['dhash'], 16))
+                    self.hashes[sha256] = hashes
+                    self.table.add(hashes[0], sha256)
+            self._version = version
+
+    def similar(self, sha256: str) -> List[Dict]:
+        """Get the images that look like the given one, closest first"""
+        self.sync()
+        hashes = self.hashes.get(sha256)
+        if hashes is None:
+            return []
+
+        matches = []
+        for distance, other in self.table.search(hashes[0], PHASH_DUPLICATE_DISTANCE):
+            if other == sha256:
+                continue
+            dhash_distance = hamming(hashes[1], self.hashes[other][1])
+            if dhash_distance <= DHASH_DUPLICATE_DISTANCE:
+                matches.append({'sha256': other, 'distance': distance, 'dhash_distance': dhash_distance})
+        return sorted(matches, key=lambda match: (match['distance'], match['dhash_distance'], match['sha256']))
+
+_index: Optional[DuplicateIndex] = None
+_index_lock = threading.Lock()
+
+def get_duplicate_index() -> DuplicateIndex:
+    """Get the process-wide near-duplicate index"""
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                _index = DuplicateIndex()
+    return _index
+
+def find_similar_images(sha256: str) -> List[Dict]:
+    """Get the stored images that are possible duplicates of the given one"""
+    return get_duplicate_index().similar(sha256)
+
+@cached_on(MEDIA_METADATA_FILE, copy_result=False)
+def find_duplicate_pairs() -> List[Dict]:
+    """Get every pair of possible duplicate images, most similar first (read-only)"""
+    index = get_duplicate_index()
+    index.sync()
+    metadata = load_media_metadata()
+
+    pairs = []
+    for sha256 in list(index.hashes):
+        for match in index.similar(sha256):
+            if sha256 < match['sha256']:
+                pairs.append({
+                    'sha256_a': sha256, 'path_a': metadata[sha256]['path'],
+                    'sha256_b': match['sha256'], 'path_b': metadata[match['sha256']]['path'],
+                    'distance': match['distance'], 'dhash_distance': match['dhash_distance']
+                })
+    return sorted(pairs, key=lambda pair: (pair['distance'], pair['dhash_distance'], pair['path_a']))
+
+def backfill() -> Dict:
+    """Hash the processed images whose metadata predates perceptual hashing"""
+    stats = {'hashed': 0, 'failed': 0}
+    for record in list(load_media_metadata().values()):
+        if record.get('media_type') != 'image' or not record.get('valid') or record.get('phash'):
+            continue
+        try:
+            # The latest record per sha256 wins, so the updated copy replaces the old one
+            append_metadata({**record, **perceptual_hashes(record['path'])})
+            stats['hashed'] += 1
+        except Exception as e:
+            print(f"Error hashing {record['path']}: {e}")
+            stats['failed'] += 1
+    return stats
+
+def main():
+    parser = argparse.ArgumentParser(description="Find near-duplicate uploaded images")
+    parser.add_argument('command', choices=['backfill', 'pairs'],
+                        help="backfill: hash processed images without a perceptual hash; "
+                             "pairs: print the possible duplicates")
+    args = parser.parse_args()
+
+    if args.command == 'backfill':
+        stats = backfill()
+        print(f"✅ Hashed {stats['hashed']} images ({stats['failed']} failed)")
+    elif args.command == 'pairs':
+        pairs = find_duplicate_pairs()
+        for pair in pairs:
+            print(f"  {pair['distance']:2d} bits  {pair['path_a']}  ~  {pair['path_b']}")
+        print(f"✅ {len(pairs)} possible duplicate pairs among {len(get_duplicate_index().hashes)} images")
+
+if __name__ == "__main__":
+    main()
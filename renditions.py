@@ -0,0 +1,173 @@
+"""
+Resized image renditions for the Cultural Corpus Collection Platform
+Pages show a copy scaled to one of RENDITION_WIDTHS instead of the full-resolution
+original. Copies are WebP, or JPEG if Pillow was built without WebP support.
+They are generated on first access and cached in data/renditions/, keyed by the
+source path, size and modification time, so a replaced file gets new renditions.
+
+Usage:
+    python renditions.py warm    # pre-generate renditions for assets/ and uploaded images
+    python renditions.py clear   # delete all cached renditions
+"""
+
+import argparse
+import hashlib
+import io
+import os
+import shutil
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, Union
+
+from PIL import Image, ImageOps, features
+
+from config import (
+    ASSETS_FOLDER, RENDITIONS_FOLDER, RENDITION_WIDTHS, RENDITION_DISPLAY_WIDTH,
+    RENDITION_QUALITY, RENDITION_MEMORY_CACHE_SIZE, IMAGE_EXTENSIONS
+)
+from file_lock import atomic_write
+from media_store import iter_media_files, media_dir
+
+RENDITION_FORMAT = 'WEBP' if features.check('webp') else 'JPEG'
+RENDITION_EXTENSION = '.webp' if RENDITION_FORMAT == 'WEBP' else '.jpg'
+
+# Encoded bytes of recently used renditions (LRU), so prefetched images are served from memory
+_memory_cache: "OrderedDict[str, bytes]" = OrderedDict()
+_memory_cache_lock = threading.Lock()
+_prefetch_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='rendition-prefetch')
+
+def choose_width(width: int) -> int:
+    """Get the smallest configured rendition width that covers the requested width"""
+    for candidate in sorted(RENDITION_WIDTHS):
+        if candidate >= width:
+            return candidate
+    return max(RENDITION_WIDTHS)
+
+def rendition_path(path: str, width: int) -> str:
+    """Get the cache path of a rendition of an image file"""
+    stat = os.stat(path)
+    key = hashlib.sha1(f"{os.path.abspath(path)}|{stat.st_size}|{stat.st_mtime_ns}".encode()).hexdigest()
+    return os.path.join(RENDITIONS_FOLDER, key[:2], f"{key}_{width}{RENDITION_EXTENSION}")
+
+def _resize(image: Image.Image, width: int) -> Image.Image:
+    """Scale an image down to width (never up), applying its EXIF orientation"""
+    # Let the JPEG decoder skip detail we would throw away anyway
+    image.draft('RGB', (width, width))
+    image = ImageOps.exif_transpose(image)
+
+    if image.width > width:
+        image.thumbnail((width, image.height), Image.LANCZOS)
+
+    keep_alpha = RENDITION_FORMAT == 'WEBP' and 'A' in image.getbands()
+    target_mode = 'RGBA' if keep_alpha else 'RGB'
+    if image.mode != target_mode:
+        image = image.convert(target_mode)
+    return image
+
+def _encode(image: Image.Image, f):
+    image.save(f, format=RENDITION_FORMAT, quality=RENDITION_QUALITY, optimize=True)
+
+def create_rendition(path: str, width: int) -> str:
+    """Generate (or reuse) the rendition of an image at one configured width"""
+    target = rendition_path(path, width)
+    if os.path.exists(target):
+        return target
+
+    with Image.open(path) as image:
+        resized = _resize(image, width)
+    with atomic_write(target, 'wb') as f:
+        _encode(resized, f)
+    return target
+
+def get_rendition(path: str, width: int = RENDITION_DISPLAY_WIDTH) -> str:
+    """Get the path of a resized copy of an image for display (the original if it cannot be resized)"""
+    try:
+        return create_rendition(path, choose_width(width))
+    except Exception as e:
+        print(f"Error creating rendition of {path}: {e}")
+        return path
+
+def load_rendition(path: str, width: int = RENDITION_DISPLAY_WIDTH) -> Union[bytes, str]:
+    """Get the encoded bytes of an image's rendition (the original's path if it cannot be resized)"""
+    target = get_rendition(path, width)
+    if target == path:
+        return path
+
+    with _memory_cache_lock:
+        data = _memory_cache.get(target)
+        if data is not None:
+            _memory_cache.move_to_end(target)
+            return data
+
+    with open(target, 'rb') as f:
+        data = f.read()
+
+    with _memory_cache_lock:
+        _memory_cache[target] = data
+        while len(_memory_cache) > RENDITION_MEMORY_CACHE_SIZE:
+            _memory_cache.popitem(last=False)
+    return data
+
+def prefetch_renditions(paths: Iterable[str], width: int = RENDITION_DISPLAY_WIDTH):
+    """Generate and load renditions on background threads so showing them later is instant"""
+    for path in paths:
+        _prefetch_executor.submit(load_rendition, path, width)
+
+def preview_image(uploaded_file, width: int = RENDITION_DISPLAY_WIDTH):
+    """Get a resized in-memory copy of an uploaded image for previews (the upload if it cannot be resized)"""
+    try:
+        uploaded_file.seek(0)
+        with Image.open(uploaded_file) as image:
+            resized = _resize(image, choose_width(width))
+        buffer = io.BytesIO()
+        _encode(resized, buffer)
+        return buffer.getvalue()
+    except Exception as e:
+        print(f"Error creating preview: {e}")
+        return uploaded_file
+    finally:
+        uploaded_file.seek(0)
+
+def warm_renditions() -> Dict:
+    """Generate all rendition widths for the sample assets and uploaded images"""
+    stats = {'images': 0, 'created': 0, 'failed': 0}
+
+    for directory in (ASSETS_FOLDER, media_dir('image')):
+        for path in iter_media_files(directory):
+            if not path.lower().endswith(IMAGE_EXTENSIONS):
+                continue
+            stats['images'] += 1
+            for width in RENDITION_WIDTHS:
+                existed = os.path.exists(rendition_path(path, width))
+                try:
+                    create_rendition(path, width)
+                except Exception as e:
+                    print(f"Error creating rendition of {path}: {e}")
+                    stats['failed'] += 1
+                    break
+                if not existed:
+                    stats['created'] += 1
+
+    return stats
+
+def clear_renditions():
+    """Delete all cached renditions"""
+    shutil.rmtree(RENDITIONS_FOLDER, ignore_errors=True)
+
+def main():
+    parser = argparse.ArgumentParser(description="Maintain the cached image renditions")
+    parser.add_argument('command', choices=['warm', 'clear'],
+                        help="warm: pre-generate renditions; clear: delete cached renditions")
+    args = parser.parse_args()
+
+    if args.command == 'warm':
+        stats = warm_renditions()
+        print(f"✅ Created {stats['created']} {RENDITION_FORMAT} renditions for {stats['images']} images"
+              f" ({stats['failed']} failed)")
+    elif args.command == 'clear':
+        clear_renditions()
+        print(f"✅ Cleared {RENDITIONS_FOLDER}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,214 @@
+"""
+Append-only storage for cultural submissions in user_responses.csv
+Each submission is written as a single row instead of rewriting the whole file;
+concurrent submissions are grouped into one locked append and fsync
+"""
+
+import csv
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from config import (
+    DATA_FOLDER, CSV_FILE, CSV_SCHEMA_FILE, RESPONSE_COLUMNS, RESPONSES_SCHEMA_VERSION
+)
+from file_lock import file_lock, atomic_write
+
+def read_csv_header(path: str = CSV_FILE) -> List[str]:
+    """Read only the header row of a CSV file (empty list if missing or empty)"""
+    if not os.path.exists(path):
+        return []
+
+    with open(path, 'r', newline='', encoding='utf-8') as f:
+        return next(csv.reader(f), [])
+
+def write_schema_file(columns: List[str]):
+    """Record the schema version and column order of the responses CSV"""
+    with atomic_write(CSV_SCHEMA_FILE) as f:
+        json.dump({'version': RESPONSES_SCHEMA_VERSION, 'columns': columns}, f, indent=2)
+
+def read_schema_version() -> int:
+    """Read the recorded schema version of the responses CSV (0 if unknown)"""
+    try:
+        with open(CSV_SCHEMA_FILE, 'r', encoding='utf-8') as f:
+            return int(json.load(f).get('version', 0))
+    except (OSError, ValueError, AttributeError):
+        return 0
+
+def _create_responses_csv():
+    """Create the responses CSV with the current header"""
+    with open(CSV_FILE, 'w', newline='', encoding='utf-8') as f:
+        csv.writer(f, lineterminator='\n').writerow(RESPONSE_COLUMNS)
+        f.flush()
+        os.fsync(f.fileno())
+
+    write_schema_file(RESPONSE_COLUMNS)
+    return list(RESPONSE_COLUMNS)
+
+def migrate_responses_csv(header: List[str]) -> List[str]:
+    """Add any missing schema columns to the responses CSV.
+
+    Existing columns keep their position (legacy columns are preserved) and new
+    columns are appended to the end. Rows are streamed into a temporary file that
+    replaces the original, so this is a one-off O(N) step per schema version.
+    Callers must hold the CSV_FILE lock.
+    """
+    missing = [column for column in RESPONSE_COLUMNS if column not in header]
+    if not missing:
+        return header
+
+    new_header = header + missing
+
+    with atomic_write(CSV_FILE) as dst:
+        with open(CSV_FILE, 'r', newline='', encoding='utf-8') as src:
+            reader = csv.reader(src)
+            writer = csv.writer(dst, lineterminator='\n')
+            next(reader, None)
+            writer.writerow(new_header)
+            for row in reader:
+                if not row:
+                    continue
+                writer.writerow(row + [''] * (len(new_header) - len(row)))
+
+    write_schema_file(new_header)
+
+    return new_header
+
+def _ends_with_newline(path: str) -> bool:
+    """Check whether a non-empty file ends with a newline"""
+    with open(path, 'rb') as f:
+        f.seek(0, os.SEEK_END)
+        if f.tell() == 0:
+            return True
+        f.seek(-1, os.SEEK_END)
+        return f.read(1) in (b'\n', b'\r')
+
+def append_responses(rows: List[Dict]) -> Tuple[int, int]:
+    """Append submission rows to the responses CSV under the file lock.
+
+    Only the header line is read, so the cost of a write does not depend on
+    how many submissions already exist, and the whole batch costs one fsync.
+    Returns the file size before and after the rows were written, which lets
+    derived stores detect missed writes.
+    """
+    Path(DATA_FOLDER).mkdir(exist_ok=True)
+
+    with file_lock(CSV_FILE):
+        header = read_csv_header()
+        if not header:
+            header = _create_responses_csv()
+        elif any(column not in header for column in RESPONSE_COLUMNS):
+            header = migrate_responses_csv(header)
+        elif read_schema_version() != RESPONSES_SCHEMA_VERSION:
+            write_schema_file(header)
+
+        needs_newline = not _ends_with_newline(CSV_FILE)
+
+        with open(CSV_FILE, 'a', newline='', encoding='utf-8') as f:
+            if needs_newline:
+                f.write('\n')
+                f.flush()
+            size_before = os.fstat(f.fileno()).st_size
+            writer = csv.writer(f, lineterminator='\n')
+            writer.writerows(
+                ['' if row.get(column) is None else row.get(column) for column in header]
+                for row in rows
+            )
+            f.flush()
+            os.fsync(f.fileno())
+            size_after = os.fstat(f.fileno()).st_size
+
+    return size_before, size_after
+
+def rewrite_responses(update: Callable[[Dict], bool]) -> int:
+    """Rewrite the responses CSV, letting update() modify each row dict in place.
+
+    update() returns True for rows it changed; the file is only replaced if at
+    least one row changed. Returns the number of changed rows.
+    """
+    if not os.path.exists(CSV_FILE):
+        return 0
+
+    with file_lock(CSV_FILE):
+        with open(CSV_FILE, 'r', newline='', encoding='utf-8') as src:
+            reader = csv.DictReader(src)
+            header = reader.fieldnames or []
+            rows = list(reader)
+
+        changed = sum(1 for row in rows if update(row))
+        if not changed:
+            return 0
+
+        with atomic_write(CSV_FILE) as dst:
+            writer = csv.DictWriter(dst, fieldnames=header, lineterminator='\n', extrasaction='ignore')
+            writer.writeheader()
+            writer.writerows(rows)
+
+    return changed
+
+def append_response(row: Dict) -> Tuple[int, int]:
+    """Append a single submission row to the responses CSV"""
+    return append_responses([row])
+
+class ResponseWriter:
+    """Group-commit writer for the responses CSV.
+
+    Concurrent submit() calls are coalesced: while one thread is flushing, rows
+    submitted by other threads queue up and are written by the next flush in a
+    single locked append. on_commit(rows, size_before, size_after) runs inside
+    the CSV lock after each batch, so derived stores see batches in file order;
+    its failures are logged, not raised, since the rows are already saved.
+    """
+
+    def __init__(self, on_commit: Optional[Callable[[List[Dict], int, int], None]] = None):
+        self.on_commit = on_commit
+        self._cond = threading.Condition()
+        self._queue: List[Dict] = []
+        self._flushing = False
+        self.batches = 0
+        self.rows = 0
+
+    def _write_batch(self, rows: List[Dict]):
+        with file_lock(CSV_FILE):
+            size_before, size_after = append_responses(rows)
+            if self.on_commit is not None:
+                try:
+                    self.on_commit(rows, size_before, size_after)
+                except Exception as e:
+                    # The rows are saved; derived stores notice the size mismatch and rebuild
+                    print(f"Error updating derived data after saving responses: {e}")
+
+    def submit(self, row: Dict):
+        """Write a row, returning once the batch containing it is durable"""
+        entry = {'row': row, 'done': False, 'error': None}
+
+        with self._cond:
+            self._queue.append(entry)
+            while not entry['done']:
+                if self._flushing:
+                    self._cond.wait()
+                    continue
+
+                # Become the leader: take everything queued so far
+                batch, self._queue = self._queue, []
+                self._flushing = True
+                self._cond.release()
+                error = None
+                try:
+                    self._write_batch([item['row'] for item in batch])
+                except Exception as e:
+                    error = e
+                finally:
+                    self._cond.acquire()
+                    for item in batch:
+                        item['done'] = True
+                        item['error'] = error
+                    self.batches += 1
+                    self.rows += len(batch)
+                    self._flushing = False
+                    self._cond.notify_all()
+
+        if entry['error'] is not None:
+            raise entry['error']
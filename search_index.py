@@ -0,0 +1,285 @@
+"""
+Full-text search over submissions for the Cultural Corpus Collection Platform
+An inverted index (token -> submissions) over the SEARCH_FIELD_WEIGHTS columns,
+stored in data/search_index.db. Tokens keep vowel signs and viramas with their
+letters, so words in Telugu, Hindi, Tamil and the other supported scripts are
+split only at spaces and punctuation. Submissions are indexed as they are saved,
+and results are ranked with BM25; the last query word also matches as a prefix.
+
+Usage:
+    python search_index.py rebuild          # index all submissions again
+    python search_index.py search <words>   # print the best matches
+"""
+
+import argparse
+import heapq
+import math
+import os
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import Counter
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from config import CSV_FILE, SEARCH_INDEX_FILE, SEARCH_FIELD_WEIGHTS, SEARCH_RESULTS_LIMIT
+from file_lock import file_lock
+from storage_backend import get_backend
+
+INDEX_VERSION = 1
+REBUILD_CHUNK_SIZE = 5000
+
+# BM25 parameters
+K1 = 1.2
+B = 0.75
+
+# Zero-width (non-)joiners only select glyph forms; words match with or without them
+JOINERS = {'\u200c', '\u200d'}
+
+SCHEMA = [
+    "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value)",
+    # Document length is stored with each posting so ranking needs no join
+    "CREATE TABLE IF NOT EXISTS postings ("
+    "token TEXT NOT NULL, row INTEGER NOT NULL, weight REAL NOT NULL, length REAL NOT NULL, "
+    "PRIMARY KEY (token, row)) WITHOUT ROWID"
+]
+
+SELECT_POSTINGS = "SELECT row, weight, length FROM postings WHERE token = ?"
+SELECT_PREFIX_POSTINGS = "SELECT row, weight, length FROM postings WHERE token >= ? AND token < ?"
+INSERT_POSTING = "INSERT OR REPLACE INTO postings (token, row, weight, length) VALUES (?, ?, ?, ?)"
+SET_META = "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)"
+
+# Tokenization
+
+@lru_cache(maxsize=None)
+def _is_word_char(char: str) -> bool:
+    # Letters, digits and combining marks (Indic vowel signs, viramas, nuktas)
+    return unicodedata.category(char)[0] in 'LNM'
+
+def tokenize(text) -> List[str]:
+    """Split text into normalized words (NFC, case-folded, joiners removed)"""
+    tokens = []
+    current = []
+    for char in unicodedata.normalize('NFC', str(text)).casefold():
+        if char in JOINERS:
+            continue
+        if _is_word_char(char):
+            current.append(char)
+        elif current:
+            tokens.append(''.join(current))
+            current = []
+    if current:
+        tokens.append(''.join(current))
+    return tokens
+
+def document_terms(row: Dict) -> Tuple[Dict[str, float], float]:
+    """Get the field-weighted term frequencies and weighted length of a submission"""
+    terms: Counter = Counter()
+    for column, field_weight in SEARCH_FIELD_WEIGHTS.items():
+        value = row.get(column)
+        if value is None or value != value:  # missing or NaN
+            continue
+        for token in tokenize(value):
+            terms[token] += field_weight
+    return terms, float(sum(terms.values()))
+
+# Index
+
+class SearchIndex:
+    """Inverted index of the submissions, kept in sync with the storage backend's extent.
+
+    Submissions are numbered by 0-based position in submission order. The
+    index records the backend extent it covers; appends that start at that
+    extent are added incrementally, anything else triggers a rebuild.
+    """
+
+    def __init__(self, path: str = SEARCH_INDEX_FILE):
+        self.path = path
+        self._local = threading.local()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Get this thread's connection"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            Path(os.path.dirname(self.path) or '.').mkdir(exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None, cached_statements=64)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            for statement in SCHEMA:
+                conn.execute(statement)
+            self._local.conn = conn
+        return conn
+
+    def _meta(self) -> Dict:
+        meta = dict(self._connect().execute("SELECT key, value FROM meta"))
+        if meta.get('version') != INDEX_VERSION:
+            return {}
+        return meta
+
+    @staticmethod
+    def _add_rows(conn: sqlite3.Connection, rows: List[Dict], first: int) -> float:
+        """Index rows numbered from first; returns their total weighted length"""
+        total_length = 0.0
+        postings = []
+        for offset, row in enumerate(rows):
+            terms, length = document_terms(row)
+            total_length += length
+            postings.extend((token, first + offset, weight, length) for token, weight in terms.items())
+        conn.executemany(INSERT_POSTING, postings)
+        return total_length
+
+    def rebuild(self) -> Dict:
+        """Index all submissions from scratch"""
+        backend = get_backend()
+        # Hold the CSV lock (as the aggregates rebuild does) so no append is missed
+        with file_lock(CSV_FILE), file_lock(self.path):
+            conn = self._connect()
+            extent = backend.responses_extent()
+            count = 0
+            total_length = 0.0
+
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.execute("DELETE FROM postings")
+                conn.execute("DELETE FROM meta")
+                for chunk in backend.iter_responses(REBUILD_CHUNK_SIZE):
+                    rows = chunk.to_dict('records')
+                    total_length += self._add_rows(conn, rows, count)
+                    count += len(rows)
+                conn.executemany(SET_META, [('version', INDEX_VERSION), ('extent', extent),
+                                            ('rows', count), ('total_length', total_length)])
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+
+        return {'rows': count, 'tokens': self.token_count()}
+
+    def record_responses(self, rows: List[Dict], extent_before, extent_after):
+        """Index rows just appended to the submissions (rebuilds if the index was not at extent_before)"""
+        with file_lock(self.path):
+            conn = self._connect()
+            meta = self._meta()
+            if meta.get('extent') == extent_before:
+                conn.execute("BEGIN IMMEDIATE")
+                try:
+                    added = self._add_rows(conn, rows, meta['rows'])
+                    conn.executemany(SET_META, [('extent', extent_after), ('rows', meta['rows'] + len(rows)),
+                                                ('total_length', meta['total_length'] + added)])
+                except BaseException:
+                    conn.execute("ROLLBACK")
+                    raise
+                conn.execute("COMMIT")
+                return
+
+        # Rebuilt outside the index lock: rebuild takes the CSV lock first
+        self.rebuild()
+
+    def ensure_current(self) -> Dict:
+        """Rebuild if the submissions changed without going through record_responses"""
+        meta = self._meta()
+        if meta.get('extent') != get_backend().responses_extent():
+            self.rebuild()
+            meta = self._meta()
+        return meta
+
+    def token_count(self) -> int:
+        return self._connect().execute("SELECT COUNT(DISTINCT token) FROM postings").fetchone()[0]
+
+    def _term_postings(self, token: str, prefix: bool) -> Dict[int, Tuple[float, float]]:
+        """Get row -> (weight, length) for a token, or for every token starting with it"""
+        conn = self._connect()
+        if prefix:
+            cursor = conn.execute(SELECT_PREFIX_POSTINGS, (token, token + '\U0010ffff'))
+        else:
+            cursor = conn.execute(SELECT_POSTINGS, (token,))
+
+        postings = {}
+        for row, weight, length in cursor:
+            previous = postings.get(row)
+            postings[row] = (weight + previous[0], length) if previous else (weight, length)
+        return postings
+
+    def search(self, query: str, limit: int = SEARCH_RESULTS_LIMIT) -> Tuple[List[Dict], int]:
+        """Rank the submissions containing every query word; returns the top results and the match count"""
+        tokens = list(dict.fromkeys(tokenize(query)))
+        if not tokens:
+            return [], 0
+
+        meta = self.ensure_current()
+        documents = meta.get('rows', 0)
+        if not documents:
+            return [], 0
+        average_length = meta['total_length'] / documents or 1.0
+
+        # Rarest words first, so the candidate set shrinks as fast as possible
+        terms = [self._term_postings(token, prefix=(i == len(tokens) - 1)) for i, token in enumerate(tokens)]
+        terms.sort(key=len)
+        candidates = set(terms[0])
+        for postings in terms[1:]:
+            candidates &= postings.keys()
+            if not candidates:
+                return [], 0
+
+        scores = dict.fromkeys(candidates, 0.0)
+        for postings in terms:
+            idf = math.log(1 + (documents - len(postings) + 0.5) / (len(postings) + 0.5))
+            for row in candidates:
+                weight, length = postings[row]
+                scores[row] += idf * weight * (K1 + 1) / (weight + K1 * (1 - B + B * length / average_length))
+
+        top = heapq.nlargest(limit, scores.items(), key=lambda item: (item[1], item[0]))
+        return [{'row': row, 'score': round(score, 3)} for row, score in top], len(candidates)
+
+_index: Optional[SearchIndex] = None
+_index_lock = threading.Lock()
+
+def get_search_index() -> SearchIndex:
+    """Get the process-wide search index"""
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                _index = SearchIndex()
+    return _index
+
+def index_responses(rows: List[Dict], extent_before, extent_after):
+    """Add newly saved submissions to the search index (called by the storage backends)"""
+    try:
+        get_search_index().record_responses(rows, extent_before, extent_after)
+    except Exception as e:
+        # The next search notices the index is behind and rebuilds it
+        print(f"Error updating search index: {e}")
+
+def search_responses(query: str, limit: int = SEARCH_RESULTS_LIMIT) -> Dict:
+    """Search the submissions and return the ranked rows with their scores"""
+    started = time.perf_counter()
+    results, total = get_search_index().search(query, limit)
+
+    rows = get_backend().read_responses_at([result['row'] for result in results])
+    if not rows.empty:
+        rows.insert(0, 'score', [result['score'] for result in results])
+    return {'results': rows, 'total': total, 'elapsed_ms': round((time.perf_counter() - started) * 1000, 1)}
+
+def main():
+    parser = argparse.ArgumentParser(description="Maintain and query the submissions search index")
+    parser.add_argument('command', choices=['rebuild', 'search'],
+                        help="rebuild: index all submissions again; search: print the best matches")
+    parser.add_argument('query', nargs='*', help="search: words to look for")
+    args = parser.parse_args()
+
+    if args.command == 'rebuild':
+        started = time.perf_counter()
+        stats = get_search_index().rebuild()
+        print(f"✅ Indexed {stats['rows']} submissions ({stats['tokens']} distinct words) "
+              f"in {time.perf_counter() - started:.1f}s")
+    elif args.command == 'search':
+        found = search_responses(' '.join(args.query))
+        print(f"✅ {found['total']} matches in {found['elapsed_ms']}ms")
+        for _, row in found['results'].iterrows():
+            print(f"  {row['score']:7.3f}  {row.get('title', '')}  [{row.get('category', '')}]")
+
+if __name__ == "__main__":
+    main()
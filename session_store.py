@@ -0,0 +1,306 @@
+"""
+Token-indexed session store for the Cultural Corpus Collection Platform
+Keeps sessions.csv in memory as a hash index with an expiry heap, so validating a
+session is a dictionary lookup instead of a full CSV parse
+
+Usage:
+    python session_store.py reap   # drop expired and logged-out sessions from the session store
+"""
+
+import argparse
+import atexit
+import csv
+import heapq
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from data_cache import get_file_version
+from file_lock import file_lock, atomic_write
+
+SESSION_COLUMNS = ['session_token', 'user_id', 'created_at', 'expires_at', 'is_active']
+
+def _parse_bool(value) -> bool:
+    if isinstance(value, bool):
+        return value
+    return str(value).strip().lower() in ('true', '1', 'yes')
+
+def _parse_datetime(value) -> Optional[datetime]:
+    try:
+        return datetime.fromisoformat(str(value))
+    except ValueError:
+        return None
+
+class SessionStore:
+    """In-memory index over a sessions CSV with lazy write-back.
+
+    - sessions are indexed by token; expiry times are parsed once at load
+    - active sessions sit in a min-heap ordered by expiry, so expiring them is
+      O(log n) per session instead of a scan
+    - state changes that do not need to be visible immediately (expiry) are
+      written back by a background timer; creates append a single row and
+      logouts are flushed right away
+    - the file version is checked on each access, so changes made by other
+      processes are picked up (pending local changes are re-applied on top)
+    - every write happens under a cross-process file lock, and full rewrites
+      replace the file atomically
+    - compact() drops expired and logged-out rows and reports what it removed
+    """
+
+    def __init__(self, path: str, writeback_delay: float = 5.0):
+        self.path = path
+        self.writeback_delay = writeback_delay
+        self._lock = threading.RLock()
+        self._sessions: Dict[str, Dict] = {}
+        self._expiry: Dict[str, Optional[datetime]] = {}
+        self._heap: List = []
+        self._columns: List[str] = list(SESSION_COLUMNS)
+        self._version = None
+        self._pending_deactivations = set()
+        self._flush_timer: Optional[threading.Timer] = None
+        self._by_user: Dict[str, set] = {}
+        atexit.register(self.flush)
+
+    # Loading
+
+    def _ensure_file(self):
+        if not os.path.exists(self.path):
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            with open(self.path, 'w', newline='', encoding='utf-8') as f:
+                csv.writer(f).writerow(SESSION_COLUMNS)
+
+    def _load(self):
+        """(Re)load the CSV into the index, keeping pending local deactivations"""
+        self._ensure_file()
+        sessions = {}
+        columns = list(SESSION_COLUMNS)
+
+        try:
+            with open(self.path, 'r', newline='', encoding='utf-8') as f:
+                reader = csv.DictReader(f)
+                columns = reader.fieldnames or columns
+                for row in reader:
+                    token = row.get('session_token')
+                    if not token:
+                        continue
+                    row['is_active'] = _parse_bool(row.get('is_active'))
+                    sessions[token] = row
+        except Exception as e:
+            print(f"Error loading sessions: {e}")
+
+        for token in self._pending_deactivations:
+            if token in sessions:
+                sessions[token]['is_active'] = False
+
+        self._sessions = sessions
+        self._columns = list(columns)
+        self._expiry = {token: _parse_datetime(row.get('expires_at')) for token, row in sessions.items()}
+        self._heap = [
+            (expires_at, token) for token, expires_at in self._expiry.items()
+            if expires_at is not None and sessions[token]['is_active']
+        ]
+        heapq.heapify(self._heap)
+        self._by_user = {}
+        for token, row in sessions.items():
+            if row['is_active']:
+                self._by_user.setdefault(row.get('user_id'), set()).add(token)
+        self._version = get_file_version(self.path)
+
+    def _refresh(self):
+        """Reload if the file changed outside this store"""
+        if self._version is None or get_file_version(self.path) != self._version:
+            self._load()
+
+    # Writing
+
+    def _write_all(self):
+        """Rewrite the whole CSV atomically from the in-memory index"""
+        with atomic_write(self.path) as f:
+            writer = csv.DictWriter(f, fieldnames=self._columns, extrasaction='ignore')
+            writer.writeheader()
+            for row in self._sessions.values():
+                writer.writerow(row)
+        self._version = get_file_version(self.path)
+        self._pending_deactivations.clear()
+
+    def flush(self):
+        """Write pending changes back to disk"""
+        with self._lock:
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+            if not self._pending_deactivations:
+                return
+            with file_lock(self.path):
+                # Merge with any changes other processes made since our last load
+                if get_file_version(self.path) != self._version:
+                    self._load()
+                self._write_all()
+
+    def _mark_inactive(self, token: str):
+        session = self._sessions[token]
+        session['is_active'] = False
+        self._pending_deactivations.add(token)
+        self._by_user.get(session.get('user_id'), set()).discard(token)
+
+    def _schedule_flush(self):
+        if self._flush_timer is None:
+            self._flush_timer = threading.Timer(self.writeback_delay, self.flush)
+            self._flush_timer.daemon = True
+            self._flush_timer.start()
+
+    def _expire(self, now: datetime):
+        """Deactivate every session whose expiry has passed"""
+        while self._heap and self._heap[0][0] < now:
+            _, token = heapq.heappop(self._heap)
+            session = self._sessions.get(token)
+            if session is not None and session['is_active']:
+                self._mark_inactive(token)
+
+        if self._pending_deactivations:
+            self._schedule_flush()
+
+    # Public API
+
+    def _enforce_cap(self, user_id: str, max_active: int, now: datetime):
+        """Deactivate a user's oldest sessions so a new one fits under max_active"""
+        self._expire(now)
+        tokens = sorted(self._by_user.get(user_id, ()),
+                        key=lambda token: str(self._sessions[token].get('created_at')))
+        excess = len(tokens) - (max_active - 1)
+        for token in tokens[:max(excess, 0)]:
+            self._mark_inactive(token)
+
+    def create(self, session: Dict, max_active: Optional[int] = None):
+        """Add a new session by appending a single row.
+
+        If max_active is given, the user's oldest active sessions are logged out
+        so that at most max_active remain including the new one.
+        """
+        with self._lock, file_lock(self.path):
+            self._refresh()
+            if max_active:
+                self._enforce_cap(session.get('user_id'), max_active, datetime.now())
+            row = dict(session)
+            row['is_active'] = _parse_bool(row.get('is_active', True))
+
+            with open(self.path, 'a', newline='', encoding='utf-8') as f:
+                csv.DictWriter(f, fieldnames=self._columns, extrasaction='ignore').writerow(row)
+
+            token = row['session_token']
+            self._sessions[token] = row
+            self._expiry[token] = _parse_datetime(row.get('expires_at'))
+            if self._expiry[token] is not None and row['is_active']:
+                heapq.heappush(self._heap, (self._expiry[token], token))
+                self._by_user.setdefault(row.get('user_id'), set()).add(token)
+            self._version = get_file_version(self.path)
+
+            # Sessions logged out by the cap must stop working everywhere right away
+            if self._pending_deactivations:
+                self.flush()
+
+    def get_active(self, token: str, now: Optional[datetime] = None) -> Optional[Dict]:
+        """Return a copy of the session if it exists, is active and has not expired"""
+        now = now or datetime.now()
+        with self._lock:
+            self._refresh()
+            self._expire(now)
+            session = self._sessions.get(token)
+            if session is None or not session['is_active']:
+                return None
+            expires_at = self._expiry.get(token)
+            if expires_at is None or now > expires_at:
+                return None
+            return dict(session)
+
+    def deactivate(self, token: str) -> bool:
+        """Deactivate a session and write the change through immediately"""
+        with self._lock:
+            self._refresh()
+            session = self._sessions.get(token)
+            if session is None:
+                return False
+            self._mark_inactive(token)
+            self.flush()
+            return True
+
+    def all_sessions(self) -> List[Dict]:
+        """Return copies of all session records"""
+        with self._lock:
+            self._refresh()
+            return [dict(session) for session in self._sessions.values()]
+
+    def replace_all(self, sessions: List[Dict]):
+        """Replace every session with the given records"""
+        with self._lock, file_lock(self.path):
+            self._ensure_file()
+            self._sessions = {}
+            for session in sessions:
+                row = dict(session)
+                row['is_active'] = _parse_bool(row.get('is_active', False))
+                self._sessions[row['session_token']] = row
+            self._pending_deactivations.clear()
+            self._write_all()
+            self._load()
+
+    # Compaction
+
+    def compact(self, now: Optional[datetime] = None) -> Dict:
+        """Remove expired and logged-out sessions from the file in one rewrite"""
+        now = now or datetime.now()
+        started = time.perf_counter()
+
+        with self._lock, file_lock(self.path):
+            self._refresh()
+            expired = 0
+            logged_out = 0
+            kept = {}
+            for token, session in self._sessions.items():
+                expires_at = self._expiry.get(token)
+                if expires_at is None or now > expires_at:
+                    expired += 1
+                elif not session['is_active']:
+                    logged_out += 1
+                else:
+                    kept[token] = session
+
+            if expired or logged_out:
+                self._sessions = kept
+                self._write_all()
+                self._load()
+            else:
+                self.flush()
+
+            return {
+                'run_at': now.isoformat(),
+                'expired': expired,
+                'logged_out': logged_out,
+                'reaped': expired + logged_out,
+                'remaining': len(kept),
+                'duration_ms': round((time.perf_counter() - started) * 1000, 2)
+            }
+
+    def counts(self) -> Dict:
+        """Get the number of stored and active sessions"""
+        with self._lock:
+            self._refresh()
+            return {
+                'sessions': len(self._sessions),
+                'active_sessions': sum(len(tokens) for tokens in self._by_user.values())
+            }
+
+def main():
+    parser = argparse.ArgumentParser(description="Maintain the session store")
+    parser.add_argument('command', choices=['reap'], help="reap: drop expired and logged-out sessions")
+    args = parser.parse_args()
+
+    if args.command == 'reap':
+        from csv_user_manager import cleanup_expired_sessions
+        run = cleanup_expired_sessions()
+        print(f"✅ Reaped {run['reaped']} sessions ({run['expired']} expired, "
+              f"{run['logged_out']} logged out); {run['remaining']} remaining")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,519 @@
+"""
+Embedded SQLite storage backend for the Cultural Corpus Collection Platform
+Users, sessions and submissions live in one WAL-mode database, so lookups by
+email, user_id or session token and dashboard aggregations are indexed queries
+
+Usage:
+    python sqlite_backend.py import-csv           # copy existing data/*.csv into the database
+    python sqlite_backend.py import-csv --force   # import again, replacing the stored submissions
+"""
+
+import argparse
+import csv
+import os
+import sqlite3
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import pandas as pd
+
+from config import (
+    CSV_FILE, USERS_CSV_FILE, SESSIONS_CSV_FILE, SQLITE_DB_FILE,
+    RESPONSE_COLUMNS, USER_COLUMNS, SUBMISSIONS_FILTER_COLUMNS, SUBMISSIONS_SORT_COLUMNS
+)
+from data_cache import get_file_version, bump_write_generation
+from aggregate_store import (
+    empty_aggregates, COUNTED_COLUMNS, CONFIDENCE_PATTERN, IDI_EMITI_CATEGORY
+)
+from session_store import SESSION_COLUMNS
+from storage_backend import StorageBackend
+
+BOOLEAN_USER_COLUMNS = ('is_active', 'display_publicly')
+NUMERIC_RESPONSE_COLUMNS = {'latitude': 'REAL', 'longitude': 'REAL', 'file_size': 'INTEGER'}
+
+SCHEMA = [
+    "CREATE TABLE IF NOT EXISTS users ("
+    "user_id TEXT PRIMARY KEY, "
+    + ", ".join(f"{column} TEXT" for column in USER_COLUMNS
+                if column not in ('user_id', 'is_active', 'display_publicly'))
+    + ", is_active INTEGER DEFAULT 1, display_publicly INTEGER DEFAULT 1)",
+    "CREATE UNIQUE INDEX IF NOT EXISTS idx_users_email ON users(email)",
+
+    "CREATE TABLE IF NOT EXISTS sessions ("
+    "session_token TEXT PRIMARY KEY, user_id TEXT NOT NULL, created_at TEXT, "
+    "expires_at TEXT, is_active INTEGER DEFAULT 1)",
+    "CREATE INDEX IF NOT EXISTS idx_sessions_user_id ON sessions(user_id, is_active)",
+    "CREATE INDEX IF NOT EXISTS idx_sessions_expires_at ON sessions(expires_at)",
+
+    "CREATE TABLE IF NOT EXISTS responses ("
+    "id INTEGER PRIMARY KEY AUTOINCREMENT, "
+    + ", ".join(f"{column} {NUMERIC_RESPONSE_COLUMNS.get(column, 'TEXT')}" for column in RESPONSE_COLUMNS)
+    + ")",
+    "CREATE INDEX IF NOT EXISTS idx_responses_timestamp ON responses(timestamp)",
+    "CREATE INDEX IF NOT EXISTS idx_responses_category ON responses(category)",
+    "CREATE INDEX IF NOT EXISTS idx_responses_contributor_email ON responses(contributor_email)",
+    "CREATE INDEX IF NOT EXISTS idx_responses_language ON responses(language)",
+    "CREATE INDEX IF NOT EXISTS idx_responses_media_type ON responses(media_type)",
+    "CREATE INDEX IF NOT EXISTS idx_responses_validation_status ON responses(validation_status)"
+]
+
+# Statements are constant strings with ? placeholders; sqlite3 keeps a per-connection
+# cache of compiled statements, so each one is prepared once per thread and reused
+SELECT_USERS = f"SELECT {', '.join(USER_COLUMNS)} FROM users ORDER BY rowid"
+SELECT_USER_BY_EMAIL = f"SELECT {', '.join(USER_COLUMNS)} FROM users WHERE email = ?"
+SELECT_USER_BY_ID = f"SELECT {', '.join(USER_COLUMNS)} FROM users WHERE user_id = ?"
+INSERT_USER = (f"INSERT INTO users ({', '.join(USER_COLUMNS)}) "
+               f"VALUES ({', '.join('?' for _ in USER_COLUMNS)})")
+INSERT_OR_IGNORE_USER = INSERT_USER.replace("INSERT INTO", "INSERT OR IGNORE INTO", 1)
+DELETE_USER = "DELETE FROM users WHERE user_id = ?"
+
+SELECT_SESSIONS = f"SELECT {', '.join(SESSION_COLUMNS)} FROM sessions ORDER BY rowid"
+SELECT_SESSION = f"SELECT {', '.join(SESSION_COLUMNS)} FROM sessions WHERE session_token = ? AND is_active = 1"
+SELECT_ACTIVE_USER_SESSIONS = ("SELECT session_token FROM sessions "
+                               "WHERE user_id = ? AND is_active = 1 AND expires_at >= ? "
+                               "ORDER BY created_at")
+INSERT_SESSION = (f"INSERT OR REPLACE INTO sessions ({', '.join(SESSION_COLUMNS)}) "
+                  f"VALUES ({', '.join('?' for _ in SESSION_COLUMNS)})")
+DEACTIVATE_SESSION = "UPDATE sessions SET is_active = 0 WHERE session_token = ?"
+DELETE_EXPIRED_SESSIONS = "DELETE FROM sessions WHERE expires_at IS NULL OR expires_at < ?"
+DELETE_INACTIVE_SESSIONS = "DELETE FROM sessions WHERE is_active = 0"
+COUNT_SESSIONS = "SELECT COUNT(*), COALESCE(SUM(is_active = 1 AND expires_at >= ?), 0) FROM sessions"
+
+INSERT_RESPONSE = (f"INSERT INTO responses ({', '.join(RESPONSE_COLUMNS)}) "
+                   f"VALUES ({', '.join('?' for _ in RESPONSE_COLUMNS)})")
+SELECT_RESPONSES = f"SELECT {', '.join(RESPONSE_COLUMNS)} FROM responses ORDER BY id"
+SELECT_RESPONSES_BY_CONTRIBUTOR = (f"SELECT {', '.join(RESPONSE_COLUMNS)} FROM responses "
+                                   f"WHERE contributor_email = ? ORDER BY id")
+COUNT_RESPONSES = "SELECT COUNT(*) FROM responses"
+MAX_RESPONSE_ID = "SELECT COALESCE(MAX(id), 0) FROM responses"
+DELETE_RESPONSES = "DELETE FROM responses"
+RELINK_RESPONSE_MEDIA = ("UPDATE responses SET file_path = ?, media_filename = ?, file_sha256 = ? "
+                         "WHERE file_path = ?")
+RELINK_RESPONSE_AUDIO = "UPDATE responses SET local_language_audio_path = ? WHERE local_language_audio_path = ?"
+SELECT_MEDIA_PATHS = "SELECT DISTINCT file_path FROM responses WHERE file_path IS NOT NULL"
+SELECT_AUDIO_PATHS = ("SELECT DISTINCT local_language_audio_path FROM responses "
+                      "WHERE local_language_audio_path IS NOT NULL")
+COUNT_BY_DAY = ("SELECT substr(timestamp, 1, 10), COUNT(*) FROM responses "
+                "WHERE length(timestamp) >= 13 AND substr(timestamp, 11, 1) = 'T' GROUP BY 1")
+COUNT_BY_HOUR = ("SELECT CAST(substr(timestamp, 12, 2) AS INTEGER), COUNT(*) FROM responses "
+                 "WHERE length(timestamp) >= 13 AND substr(timestamp, 11, 1) = 'T' GROUP BY 1")
+SELECT_IDI_EMITI = ("SELECT local_language_name, dialect_regional_variation, "
+                    "local_language_audio_path, contributor_details "
+                    "FROM responses WHERE category = ?")
+
+def _blank_to_none(value):
+    """Store empty form values as NULL (pandas reads empty CSV cells as NaN too)"""
+    if value is None or value == '':
+        return None
+    try:
+        if pd.isna(value):
+            return None
+    except (TypeError, ValueError):
+        pass
+    return value
+
+def _to_flag(value) -> int:
+    if isinstance(value, str):
+        return 1 if value.strip().lower() in ('true', '1', 'yes') else 0
+    return 1 if value else 0
+
+class SQLiteBackend(StorageBackend):
+    """SQLite database in WAL mode: readers never block the single writer"""
+
+    name = 'sqlite'
+
+    def __init__(self, path: str = SQLITE_DB_FILE):
+        super().__init__()
+        self.path = path
+        self._local = threading.local()
+        self._initialized = False
+
+    # Connections
+
+    def _connect(self) -> sqlite3.Connection:
+        """Get this thread's connection (sqlite3 connections are per thread)"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            Path(os.path.dirname(self.path) or '.').mkdir(exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None, cached_statements=256)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        if not self._initialized:
+            for statement in SCHEMA:
+                conn.execute(statement)
+            self._migrate(conn)
+            self._initialized = True
+        return conn
+
+    @staticmethod
+    def _migrate(conn: sqlite3.Connection):
+        """Add response columns introduced by newer schema versions"""
+        existing = {row[1] for row in conn.execute("PRAGMA table_info(responses)")}
+        for column in RESPONSE_COLUMNS:
+            if column not in existing:
+                conn.execute(f"ALTER TABLE responses ADD COLUMN {column} "
+                             f"{NUMERIC_RESPONSE_COLUMNS.get(column, 'TEXT')}")
+
+    @contextmanager
+    def _transaction(self):
+        """Run statements in one write transaction (BEGIN IMMEDIATE takes the write lock up front)"""
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    def initialize(self):
+        self._connect()
+
+    def status(self) -> Dict:
+        return {
+            'mode': 'sqlite',
+            'status': 'Using SQLite Database (WAL mode)',
+            'icon': '🗄️',
+            'color': 'success',
+            'files': [self.path]
+        }
+
+    # Users
+
+    @staticmethod
+    def _user_from_row(row) -> Dict:
+        user = dict(zip(USER_COLUMNS, row))
+        for column in BOOLEAN_USER_COLUMNS:
+            user[column] = bool(user[column])
+        return user
+
+    @staticmethod
+    def _user_params(user: Dict) -> List:
+        params = []
+        for column in USER_COLUMNS:
+            value = user.get(column)
+            if column in BOOLEAN_USER_COLUMNS:
+                value = _to_flag(True if value is None else value)
+            elif column == 'email' and isinstance(value, str):
+                value = value.lower()
+            params.append(value)
+        return params
+
+    def load_users(self) -> List[Dict]:
+        return [self._user_from_row(row) for row in self._connect().execute(SELECT_USERS)]
+
+    def save_users(self, users: List[Dict]):
+        if not users:
+            return
+
+        with self._transaction() as conn:
+            conn.execute("DELETE FROM users")
+            conn.executemany(INSERT_USER, [self._user_params(user) for user in users])
+
+    def get_user_by_email(self, email: str) -> Optional[Dict]:
+        row = self._connect().execute(SELECT_USER_BY_EMAIL, (email.lower(),)).fetchone()
+        return self._user_from_row(row) if row else None
+
+    def get_user_by_id(self, user_id: str) -> Optional[Dict]:
+        row = self._connect().execute(SELECT_USER_BY_ID, (user_id,)).fetchone()
+        return self._user_from_row(row) if row else None
+
+    def insert_user(self, user: Dict) -> bool:
+        try:
+            with self._transaction() as conn:
+                conn.execute(INSERT_USER, self._user_params(user))
+            return True
+        except sqlite3.IntegrityError:
+            return False
+
+    def update_user(self, user_id: str, fields: Dict) -> bool:
+        columns = [column for column in fields if column in USER_COLUMNS and column != 'user_id']
+        if not columns:
+            return self.get_user_by_id(user_id) is not None
+
+        values = []
+        for column in columns:
+            value = fields[column]
+            values.append(_to_flag(value) if column in BOOLEAN_USER_COLUMNS else value)
+
+        statement = f"UPDATE users SET {', '.join(f'{column} = ?' for column in columns)} WHERE user_id = ?"
+        with self._transaction() as conn:
+            return conn.execute(statement, values + [user_id]).rowcount > 0
+
+    def delete_user(self, user_id: str) -> bool:
+        with self._transaction() as conn:
+            return conn.execute(DELETE_USER, (user_id,)).rowcount > 0
+
+    # Sessions
+
+    @staticmethod
+    def _session_params(session: Dict) -> List:
+        return [_to_flag(session.get(column, True)) if column == 'is_active' else session.get(column)
+                for column in SESSION_COLUMNS]
+
+    def create_session(self, session: Dict, max_active: Optional[int] = None):
+        with self._transaction() as conn:
+            if max_active:
+                now = datetime.now().isoformat()
+                tokens = [row[0] for row in conn.execute(SELECT_ACTIVE_USER_SESSIONS, (session['user_id'], now))]
+                excess = len(tokens) - (max_active - 1)
+                if excess > 0:
+                    conn.executemany(DEACTIVATE_SESSION, [(token,) for token in tokens[:excess]])
+            conn.execute(INSERT_SESSION, self._session_params(session))
+
+    def get_active_session(self, session_token: str) -> Optional[Dict]:
+        row = self._connect().execute(SELECT_SESSION, (session_token,)).fetchone()
+        if row is None:
+            return None
+
+        session = dict(zip(SESSION_COLUMNS, row))
+        session['is_active'] = True
+        try:
+            if datetime.now() > datetime.fromisoformat(session['expires_at']):
+                # Expired sessions are dropped by the reaper; no write needed here
+                return None
+        except (TypeError, ValueError):
+            return None
+        return session
+
+    def deactivate_session(self, session_token: str) -> bool:
+        with self._transaction() as conn:
+            return conn.execute(DEACTIVATE_SESSION, (session_token,)).rowcount > 0
+
+    def load_sessions(self) -> List[Dict]:
+        sessions = []
+        for row in self._connect().execute(SELECT_SESSIONS):
+            session = dict(zip(SESSION_COLUMNS, row))
+            session['is_active'] = bool(session['is_active'])
+            sessions.append(session)
+        return sessions
+
+    def save_sessions(self, sessions: List[Dict]):
+        with self._transaction() as conn:
+            conn.execute("DELETE FROM sessions")
+            conn.executemany(INSERT_SESSION, [self._session_params(session) for session in sessions])
+
+    def cleanup_sessions(self) -> Dict:
+        now = datetime.now()
+        started = time.perf_counter()
+
+        with self._transaction() as conn:
+            expired = conn.execute(DELETE_EXPIRED_SESSIONS, (now.isoformat(),)).rowcount
+            logged_out = conn.execute(DELETE_INACTIVE_SESSIONS).rowcount
+            remaining = conn.execute("SELECT COUNT(*) FROM sessions").fetchone()[0]
+
+        return {
+            'run_at': now.isoformat(),
+            'expired': expired,
+            'logged_out': logged_out,
+            'reaped': expired + logged_out,
+            'remaining': remaining,
+            'duration_ms': round((time.perf_counter() - started) * 1000, 2)
+        }
+
+    def session_counts(self) -> Dict:
+        total, active = self._connect().execute(COUNT_SESSIONS, (datetime.now().isoformat(),)).fetchone()
+        return {'sessions': total, 'active_sessions': active}
+
+    # Responses
+
+    @staticmethod
+    def _response_params(row: Dict) -> List:
+        return [_blank_to_none(row.get(column)) for column in RESPONSE_COLUMNS]
+
+    def append_response(self, row: Dict):
+        self.append_responses([row])
+
+    def append_responses(self, rows: List[Dict]):
+        from search_index import index_responses
+
+        with self._transaction() as conn:
+            extent_before = conn.execute(MAX_RESPONSE_ID).fetchone()[0]
+            conn.executemany(INSERT_RESPONSE, [self._response_params(row) for row in rows])
+            extent_after = conn.execute(MAX_RESPONSE_ID).fetchone()[0]
+        # Invalidate cached readers even if the filesystem mtime did not move
+        bump_write_generation(self.path)
+        index_responses(rows, extent_before, extent_after)
+
+    def responses_version(self):
+        # Commits land in the -wal file until a checkpoint moves them into the
+        # main database, so both files identify the current contents
+        version = get_file_version(self.path)
+        if version is None:
+            return None
+        return version + (get_file_version(self.path + '-wal'),)
+
+    def responses_extent(self) -> int:
+        return self._connect().execute(MAX_RESPONSE_ID).fetchone()[0]
+
+    def read_responses_at(self, positions: List[int]) -> pd.DataFrame:
+        if not positions:
+            return pd.DataFrame(columns=RESPONSE_COLUMNS)
+        # Submissions are never deleted, so ids are positions + 1
+        df = pd.read_sql_query(
+            f"SELECT id, {', '.join(RESPONSE_COLUMNS)} FROM responses "
+            f"WHERE id IN ({', '.join('?' for _ in positions)})",
+            self._connect(), params=[position + 1 for position in positions]
+        )
+        return df.set_index('id').reindex([position + 1 for position in positions]).reset_index(drop=True)
+
+    def read_responses(self, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        if columns is None:
+            return pd.read_sql_query(SELECT_RESPONSES, self._connect())
+
+        columns = [column for column in columns if column in RESPONSE_COLUMNS]
+        return pd.read_sql_query(f"SELECT {', '.join(columns)} FROM responses ORDER BY id", self._connect())
+
+    def responses_by_contributor(self, email: str) -> pd.DataFrame:
+        return pd.read_sql_query(SELECT_RESPONSES_BY_CONTRIBUTOR, self._connect(), params=(email,))
+
+    def iter_responses(self, chunk_size: int) -> Iterator[pd.DataFrame]:
+        for chunk in pd.read_sql_query(SELECT_RESPONSES, self._connect(), chunksize=chunk_size):
+            # Match the CSV backend: numbers as written, NULL as ''
+            for column in NUMERIC_RESPONSE_COLUMNS:
+                chunk[column] = chunk[column].map(lambda value: '' if pd.isna(value) else f"{value:.15g}")
+            yield chunk.fillna('').astype(str)
+
+    def query_responses(self, filters: Dict, sort_by: str = 'timestamp', descending: bool = True,
+                        offset: int = 0, limit: int = 50) -> Tuple[pd.DataFrame, int]:
+        conditions = []
+        params = []
+        for column in SUBMISSIONS_FILTER_COLUMNS:
+            if filters.get(column):
+                conditions.append(f"{column} IN ({', '.join('?' for _ in filters[column])})")
+                params.extend(filters[column])
+        if filters.get('contributor'):
+            conditions.append("(instr(lower(contributor_name), ?) OR instr(lower(contributor_email), ?))")
+            params.extend([filters['contributor'].strip().lower()] * 2)
+        if filters.get('date_from'):
+            conditions.append("substr(timestamp, 1, 10) >= ?")
+            params.append(filters['date_from'].isoformat())
+        if filters.get('date_to'):
+            conditions.append("substr(timestamp, 1, 10) <= ?")
+            params.append(filters['date_to'].isoformat())
+
+        where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+        if sort_by not in SUBMISSIONS_SORT_COLUMNS:
+            sort_by = 'timestamp'
+        direction = 'DESC' if descending else 'ASC'
+
+        conn = self._connect()
+        total = conn.execute(f"SELECT COUNT(*) FROM responses{where}", params).fetchone()[0]
+        page = pd.read_sql_query(
+            f"SELECT {', '.join(RESPONSE_COLUMNS)} FROM responses{where} "
+            f"ORDER BY {sort_by} IS NULL, {sort_by} {direction}, id {direction} LIMIT ? OFFSET ?",
+            conn, params=params + [limit, offset]
+        )
+        return page, total
+
+    def load_aggregates(self) -> Dict:
+        """Build the aggregate_store document with GROUP BY queries"""
+        conn = self._connect()
+        aggregates = empty_aggregates()
+
+        aggregates['total'] = conn.execute(COUNT_RESPONSES).fetchone()[0]
+        aggregates['day'] = {day: count for day, count in conn.execute(COUNT_BY_DAY)}
+        aggregates['hour'] = {str(hour): count for hour, count in conn.execute(COUNT_BY_HOUR)}
+
+        for family, column in COUNTED_COLUMNS.items():
+            statement = (f"SELECT {column}, COUNT(*) FROM responses "
+                         f"WHERE {column} IS NOT NULL AND {column} != '' GROUP BY {column}")
+            aggregates[family] = {str(value): count for value, count in conn.execute(statement)}
+
+        idi_emiti = aggregates['idi_emiti']
+        for local_name, dialect, audio_path, details in conn.execute(SELECT_IDI_EMITI, (IDI_EMITI_CATEGORY,)):
+            idi_emiti['total'] += 1
+            if audio_path:
+                idi_emiti['audio_recordings'] += 1
+            for counter, value in (('local_language_name', local_name), ('dialect_regional_variation', dialect)):
+                if value:
+                    idi_emiti[counter][value] = idi_emiti[counter].get(value, 0) + 1
+            match = CONFIDENCE_PATTERN.search(details or '')
+            if match and match.group(1):
+                confidence = idi_emiti['confidence']
+                confidence[match.group(1)] = confidence.get(match.group(1), 0) + 1
+
+        return aggregates
+
+    def relink_media(self, moves: Dict[str, Dict]) -> int:
+        from media_store import normalize_media_path
+
+        changed = 0
+        with self._transaction() as conn:
+            # Stored paths are matched after normalization, so each distinct spelling is updated as stored
+            for (stored,) in conn.execute(SELECT_MEDIA_PATHS).fetchall():
+                target = moves.get(normalize_media_path(stored))
+                if target is not None:
+                    changed += conn.execute(RELINK_RESPONSE_MEDIA, (
+                        target['path'], os.path.basename(target['path']), target['sha256'], stored
+                    )).rowcount
+            for (stored,) in conn.execute(SELECT_AUDIO_PATHS).fetchall():
+                target = moves.get(normalize_media_path(stored))
+                if target is not None:
+                    changed += conn.execute(RELINK_RESPONSE_AUDIO, (target['path'], stored)).rowcount
+        if changed:
+            bump_write_generation(self.path)
+        return changed
+
+    # Import
+
+    def import_csv(self, force: bool = False) -> Dict:
+        """Copy users, sessions and submissions from the CSV backend files.
+
+        Users and sessions are keyed, so importing them again is harmless;
+        submissions are not, so a database that already has some is refused
+        unless force is set, which replaces them with the CSV's.
+        """
+        imported = {'users': 0, 'sessions': 0, 'responses': 0}
+
+        def read_rows(path):
+            if not os.path.exists(path):
+                return []
+            with open(path, 'r', newline='', encoding='utf-8') as f:
+                return list(csv.DictReader(f))
+
+        with self._transaction() as conn:
+            existing = conn.execute(COUNT_RESPONSES).fetchone()[0]
+            if existing and not force:
+                raise ValueError(f"{SQLITE_DB_FILE} already has {existing} submissions; "
+                                 f"use --force to replace them with the CSV's")
+            if existing:
+                conn.execute(DELETE_RESPONSES)
+
+            for user in read_rows(USERS_CSV_FILE):
+                imported['users'] += conn.execute(INSERT_OR_IGNORE_USER, self._user_params(user)).rowcount
+            for session in read_rows(SESSIONS_CSV_FILE):
+                conn.execute(INSERT_SESSION, self._session_params(session))
+                imported['sessions'] += 1
+            rows = read_rows(CSV_FILE)
+            conn.executemany(INSERT_RESPONSE, [self._response_params(row) for row in rows])
+            imported['responses'] = len(rows)
+
+        bump_write_generation(self.path)
+        return imported
+
+def main():
+    parser = argparse.ArgumentParser(description="Maintain the SQLite storage backend")
+    parser.add_argument('command', choices=['import-csv'],
+                        help="import-csv: copy data/users.csv, sessions.csv and user_responses.csv into the database")
+    parser.add_argument('--force', action='store_true',
+                        help="import-csv: replace submissions already in the database")
+    args = parser.parse_args()
+
+    if args.command == 'import-csv':
+        try:
+            imported = SQLiteBackend().import_csv(force=args.force)
+        except ValueError as e:
+            print(f"Error importing CSV data: {e}")
+            sys.exit(1)
+        print(f"✅ Imported {imported['users']} users, {imported['sessions']} sessions and "
+              f"{imported['responses']} submissions into {SQLITE_DB_FILE}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""
+Startup profile of the Cultural Corpus Collection Platform
+Imports the modules app.py imports at the top level in a fresh interpreter
+with `python -X importtime`, and reports the import time of each of them, the
+heaviest packages they pull in, and the time of the explicit initialization
+step (initialize_app) that runs before the first page is drawn.
+
+Usage:
+    python startup_profile.py              # profile the imports of app.py
+    python startup_profile.py --top 25     # list more of the heaviest packages
+    python startup_profile.py --entry auth.py
+"""
+
+import argparse
+import ast
+import os
+import subprocess
+import sys
+import time
+from typing import Dict, List
+
+def top_level_imports(entry: str) -> List[str]:
+    """Get the modules an entry script imports at module level, in order"""
+    with open(entry, 'r', encoding='utf-8') as f:
+        tree = ast.parse(f.read(), filename=entry)
+
+    modules = []
+    for node in tree.body:
+        if isinstance(node, ast.Import):
+            names = [alias.name for alias in node.names]
+        elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+            names = [node.module]
+        else:
+            continue
+        modules.extend(name for name in names if name not in modules)
+    return modules
+
+def measure_imports(modules: List[str]) -> List[Dict]:
+    """Import modules in a fresh interpreter and parse its -X importtime report"""
+    code = "\n".join(f"import {module}" for module in modules)
+    env = {**os.environ, 'PYTHONPATH': os.pathsep.join(filter(None, [os.getcwd(), os.environ.get('PYTHONPATH')]))}
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', code],
+                            capture_output=True, text=True, env=env)
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+
+    entries = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        entries.append({
+            'module': name.strip(),
+            'depth': (len(name) - len(name.lstrip()) - 1) // 2,
+            'self_ms': int(self_us) / 1000,
+            'cumulative_ms': int(cumulative_us) / 1000
+        })
+    return entries
+
+def measure_initialization() -> float:
+    """Time the explicit initialization step in a fresh interpreter"""
+    code = ("import time, app_init; started = time.perf_counter(); app_init.initialize_app(); "
+            "print(time.perf_counter() - started)")
+    result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+    return float(result.stdout.strip().splitlines()[-1]) * 1000
+
+def build_report(entry: str, top: int) -> Dict:
+    """Profile the imports of an entry script"""
+    modules = top_level_imports(entry)
+    started = time.perf_counter()
+    entries = measure_imports(modules)
+    wall_ms = (time.perf_counter() - started) * 1000
+
+    # -X importtime reports each module once, where it was first imported
+    roots = [entry for entry in entries if entry['depth'] == 0]
+    packages: Dict[str, float] = {}
+    for item in entries:
+        package = item['module'].split('.')[0]
+        packages[package] = packages.get(package, 0.0) + item['self_ms']
+
+    return {
+        'entry': entry,
+        'wall_ms': wall_ms,
+        'total_ms': sum(item['cumulative_ms'] for item in roots),
+        'direct': [item for item in roots if item['module'] in modules],
+        'packages': sorted(packages.items(), key=lambda item: -item[1])[:top]
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Report where the app spends its startup time")
+    parser.add_argument('--entry', default='app.py', help="script whose top-level imports are profiled")
+    parser.add_argument('--top', type=int, default=15, help="number of packages to list")
+    args = parser.parse_args()
+
+    try:
+        report = build_report(args.entry, args.top)
+        init_ms = measure_initialization()
+    except (OSError, RuntimeError) as e:
+        print(f"Error profiling startup: {e}")
+        sys.exit(1)
+
+    print(f"Imports of {report['entry']}: {report['total_ms']:.1f}ms "
+          f"(interpreter with imports: {report['wall_ms']:.1f}ms)")
+    print("\nModules imported by the entry script (cumulative, first import only):")
+    for item in sorted(report['direct'], key=lambda item: -item['cumulative_ms']):
+        print(f"  {item['cumulative_ms']:9.1f}ms  {item['module']}")
+
+    print("\nHeaviest packages (own import time of all their modules):")
+    for package, self_ms in report['packages']:
+        print(f"  {self_ms:9.1f}ms  {package}")
+
+    print(f"\nInitialization (initialize_app): {init_ms:.1f}ms")
+    print("✅ Startup profile complete")
+
+if __name__ == "__main__":
+    main()
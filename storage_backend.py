@@ -0,0 +1,508 @@
+"""
+Pluggable storage backends for the Cultural Corpus Collection Platform
+User accounts, sessions and submissions go through a StorageBackend; the
+implementation is selected with STORAGE_BACKEND in config.py:
+
+    'csv'     plain CSV files in data/ (default)
+    'sqlite'  a single SQLite database in WAL mode with indexed lookups
+"""
+
+import csv
+import os
+import threading
+from collections import deque
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import pandas as pd
+
+from config import (
+    DATA_FOLDER, CSV_FILE, USERS_CSV_FILE, SESSIONS_CSV_FILE, STORAGE_BACKEND, USER_COLUMNS,
+    SUBMISSIONS_FILTER_COLUMNS
+)
+from data_cache import get_file_version, bump_write_generation
+from file_lock import file_lock, atomic_write
+from session_store import SessionStore, SESSION_COLUMNS
+from response_store import ResponseWriter, append_responses, rewrite_responses
+from aggregate_store import load_aggregates, record_responses, rebuild_aggregates
+from columnar_snapshot import read_columns, read_rows
+
+class StorageBackend:
+    """Interface shared by all storage backends.
+
+    Lookups return private copies, so callers may mutate the records they get.
+    The session reaper thread and its per-run metrics live here; backends only
+    implement cleanup_sessions().
+    """
+
+    name = ''
+
+    def __init__(self):
+        self._reaper: Optional[threading.Thread] = None
+        self._reaper_stop = threading.Event()
+        self._reaper_lock = threading.Lock()
+        self.reap_history = deque(maxlen=20)
+
+    def initialize(self):
+        """Create the underlying files/tables if they do not exist"""
+        raise NotImplementedError
+
+    def status(self) -> Dict:
+        """Describe the backend for the storage status display"""
+        raise NotImplementedError
+
+    # Users
+
+    def load_users(self) -> List[Dict]:
+        raise NotImplementedError
+
+    def save_users(self, users: List[Dict]):
+        raise NotImplementedError
+
+    def get_user_by_email(self, email: str) -> Optional[Dict]:
+        raise NotImplementedError
+
+    def get_user_by_id(self, user_id: str) -> Optional[Dict]:
+        raise NotImplementedError
+
+    def insert_user(self, user: Dict) -> bool:
+        """Add a user; returns False if the email is already registered"""
+        raise NotImplementedError
+
+    def update_user(self, user_id: str, fields: Dict) -> bool:
+        """Update fields of a user; returns False if the user does not exist"""
+        raise NotImplementedError
+
+    def delete_user(self, user_id: str) -> bool:
+        raise NotImplementedError
+
+    # Sessions
+
+    def create_session(self, session: Dict, max_active: Optional[int] = None):
+        raise NotImplementedError
+
+    def get_active_session(self, session_token: str) -> Optional[Dict]:
+        """Return the session if it exists, is active and has not expired"""
+        raise NotImplementedError
+
+    def deactivate_session(self, session_token: str) -> bool:
+        raise NotImplementedError
+
+    def load_sessions(self) -> List[Dict]:
+        raise NotImplementedError
+
+    def save_sessions(self, sessions: List[Dict]):
+        raise NotImplementedError
+
+    def cleanup_sessions(self) -> Dict:
+        """Drop expired and logged-out sessions and return the run metrics"""
+        raise NotImplementedError
+
+    def session_counts(self) -> Dict:
+        raise NotImplementedError
+
+    # Responses
+
+    def append_response(self, row: Dict):
+        raise NotImplementedError
+
+    def append_responses(self, rows: List[Dict]):
+        raise NotImplementedError
+
+    def responses_version(self):
+        """Token that changes whenever the submissions change (None if there are none)"""
+        raise NotImplementedError
+
+    def responses_extent(self) -> int:
+        """How far the submissions extend (CSV bytes, or the last SQLite row id).
+
+        Derived indexes record the extent they cover, so appends can be applied
+        incrementally and any other change is detected.
+        """
+        raise NotImplementedError
+
+    def read_responses(self, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """Read the given submission columns (all if None), oldest first"""
+        raise NotImplementedError
+
+    def responses_by_contributor(self, email: str) -> pd.DataFrame:
+        raise NotImplementedError
+
+    def iter_responses(self, chunk_size: int) -> Iterator[pd.DataFrame]:
+        """Yield all submissions in chunks of up to chunk_size rows, oldest first.
+
+        Values are strings as stored ('' for empty), so consumers never hold
+        more than one chunk in memory.
+        """
+        raise NotImplementedError
+
+    def read_responses_at(self, positions: List[int]) -> pd.DataFrame:
+        """Read the submissions at the given 0-based positions (in submission order), in the order given"""
+        raise NotImplementedError
+
+    def query_responses(self, filters: Dict, sort_by: str = 'timestamp', descending: bool = True,
+                        offset: int = 0, limit: int = 50) -> Tuple[pd.DataFrame, int]:
+        """Get one page of matching submissions and the number of matches.
+
+        filters may hold lists of accepted values for category, language,
+        media_type and validation_status, 'contributor' (a case-insensitive
+        substring of the contributor's name or email), and 'date_from' /
+        'date_to' (inclusive datetime.date bounds). Ties in sort_by keep
+        submission order (reversed when descending).
+        """
+        raise NotImplementedError
+
+    def load_aggregates(self) -> Dict:
+        """Dashboard counters in the aggregate_store document format"""
+        raise NotImplementedError
+
+    def relink_media(self, moves: Dict[str, Dict]) -> int:
+        """Point submissions at relocated media files.
+
+        moves maps an old path (normalized with media_store.normalize_media_path)
+        to {'path': new path, 'sha256': content hash}; file_path and
+        local_language_audio_path references are matched after the same
+        normalization, so Windows-style stored paths are relinked too.
+        Returns the number of updated references.
+        """
+        raise NotImplementedError
+
+    # Session reaper
+
+    def reap_sessions(self) -> Dict:
+        """Run one session cleanup and record its metrics"""
+        run = self.cleanup_sessions()
+        self.reap_history.append(run)
+        return run
+
+    def _reap_loop(self, interval: float):
+        while not self._reaper_stop.wait(interval):
+            try:
+                self.reap_sessions()
+            except Exception as e:
+                print(f"Error reaping sessions: {e}")
+
+    def start_session_reaper(self, interval: float):
+        """Start the background reaper thread (no-op if it is already running)"""
+        with self._reaper_lock:
+            if self._reaper is not None and self._reaper.is_alive():
+                return
+            self._reaper_stop.clear()
+            self._reaper = threading.Thread(target=self._reap_loop, args=(interval,),
+                                            name='session-reaper', daemon=True)
+            self._reaper.start()
+
+    def stop_session_reaper(self):
+        """Stop the background reaper thread"""
+        self._reaper_stop.set()
+
+    def get_session_reaper_stats(self) -> Dict:
+        """Get totals and the most recent reaper runs"""
+        runs = list(self.reap_history)
+        stats = {
+            'running': self._reaper is not None and self._reaper.is_alive(),
+            'runs': len(runs),
+            'total_reaped': sum(run['reaped'] for run in runs),
+            'last_run': runs[-1] if runs else None,
+            'history': runs
+        }
+        stats.update(self.session_counts())
+        return stats
+
+class CSVBackend(StorageBackend):
+    """Plain CSV files in data/ with in-memory indexes over them"""
+
+    name = 'csv'
+
+    def __init__(self):
+        super().__init__()
+        # In-memory user index (email -> record, user_id -> record)
+        # Rebuilt only when users.csv changes on disk; writes invalidate it
+        self._user_index_lock = threading.Lock()
+        self._user_index = {'version': None, 'users': [], 'by_email': {}, 'by_id': {}}
+        # Token-indexed session store; validating a session is a dictionary lookup
+        self._sessions = SessionStore(SESSIONS_CSV_FILE)
+        # Concurrent submissions are grouped into one locked append
+        self._response_writer = ResponseWriter(on_commit=self._on_responses_committed)
+
+    def initialize(self):
+        Path(DATA_FOLDER).mkdir(exist_ok=True)
+
+        for path, headers in ((USERS_CSV_FILE, USER_COLUMNS), (SESSIONS_CSV_FILE, SESSION_COLUMNS)):
+            if not os.path.exists(path):
+                with open(path, 'w', newline='', encoding='utf-8') as f:
+                    csv.writer(f).writerow(headers)
+
+    def status(self) -> Dict:
+        return {
+            'mode': 'csv',
+            'status': 'Using CSV File Storage',
+            'icon': '📁',
+            'color': 'info',
+            'files': [USERS_CSV_FILE, SESSIONS_CSV_FILE, CSV_FILE]
+        }
+
+    # Users
+
+    def _read_users_csv(self) -> List[Dict]:
+        """Parse users.csv into a list of user records"""
+        try:
+            df = pd.read_csv(USERS_CSV_FILE, dtype={'user_id': str})
+            return df.to_dict('records')
+        except Exception as e:
+            print(f"Error loading users: {e}")
+            return []
+
+    def _get_user_index(self) -> Dict:
+        """Get the user index, reloading users.csv only if it changed since the last load"""
+        # users.csv is created once at startup (app_init); no file yet means no users
+        version = get_file_version(USERS_CSV_FILE)
+
+        with self._user_index_lock:
+            if version is None or self._user_index['version'] != version:
+                users = self._read_users_csv() if version is not None else []
+                by_email = {}
+                by_id = {}
+                for user in users:
+                    email = user.get('email')
+                    if isinstance(email, str):
+                        by_email.setdefault(email.lower(), user)
+                    by_id.setdefault(user.get('user_id'), user)
+
+                self._user_index.update(version=version, users=users, by_email=by_email, by_id=by_id)
+
+            return self._user_index
+
+    def _invalidate_user_index(self):
+        """Force the next lookup to reload users.csv"""
+        with self._user_index_lock:
+            self._user_index['version'] = None
+
+    def load_users(self) -> List[Dict]:
+        return [dict(user) for user in self._get_user_index()['users']]
+
+    def save_users(self, users: List[Dict]):
+        Path(DATA_FOLDER).mkdir(exist_ok=True)
+
+        if not users:
+            return
+
+        df = pd.DataFrame(users)
+        with file_lock(USERS_CSV_FILE), atomic_write(USERS_CSV_FILE) as f:
+            df.to_csv(f, index=False)
+        self._invalidate_user_index()
+
+    def get_user_by_email(self, email: str) -> Optional[Dict]:
+        user = self._get_user_index()['by_email'].get(email.lower())
+        return dict(user) if user else None
+
+    def get_user_by_id(self, user_id: str) -> Optional[Dict]:
+        user = self._get_user_index()['by_id'].get(user_id)
+        return dict(user) if user else None
+
+    def insert_user(self, user: Dict) -> bool:
+        with file_lock(USERS_CSV_FILE):
+            if self.get_user_by_email(user['email']):
+                return False
+
+            users = self.load_users()
+            users.append(user)
+            self.save_users(users)
+            return True
+
+    def update_user(self, user_id: str, fields: Dict) -> bool:
+        with file_lock(USERS_CSV_FILE):
+            users = self.load_users()
+
+            for user in users:
+                if user.get('user_id') == user_id:
+                    user.update(fields)
+                    self.save_users(users)
+                    return True
+
+            return False
+
+    def delete_user(self, user_id: str) -> bool:
+        with file_lock(USERS_CSV_FILE):
+            users = self.load_users()
+            remaining = [user for user in users if user.get('user_id') != user_id]
+
+            if len(remaining) < len(users):
+                self.save_users(remaining)
+                return True
+
+            return False
+
+    # Sessions
+
+    def create_session(self, session: Dict, max_active: Optional[int] = None):
+        self._sessions.create(session, max_active=max_active)
+
+    def get_active_session(self, session_token: str) -> Optional[Dict]:
+        return self._sessions.get_active(session_token)
+
+    def deactivate_session(self, session_token: str) -> bool:
+        return self._sessions.deactivate(session_token)
+
+    def load_sessions(self) -> List[Dict]:
+        self.initialize()
+        return self._sessions.all_sessions()
+
+    def save_sessions(self, sessions: List[Dict]):
+        Path(DATA_FOLDER).mkdir(exist_ok=True)
+        self._sessions.replace_all(sessions)
+
+    def cleanup_sessions(self) -> Dict:
+        self.initialize()
+        return self._sessions.compact()
+
+    def session_counts(self) -> Dict:
+        return self._sessions.counts()
+
+    # Responses
+
+    def _on_responses_committed(self, rows: List[Dict], size_before: int, size_after: int):
+        """Keep derived data in sync after a batch of submissions is appended"""
+        # Keep dashboard counters and the search index in sync without rescanning the CSV
+        from search_index import index_responses
+
+        record_responses(rows, size_before, size_after)
+        index_responses(rows, size_before, size_after)
+
+        # Invalidate cached readers even if the filesystem mtime did not move
+        bump_write_generation(CSV_FILE)
+
+    def append_response(self, row: Dict):
+        self._response_writer.submit(row)
+
+    def append_responses(self, rows: List[Dict]):
+        with file_lock(CSV_FILE):
+            size_before, size_after = append_responses(rows)
+            self._on_responses_committed(rows, size_before, size_after)
+
+    def responses_version(self):
+        return get_file_version(CSV_FILE)
+
+    def responses_extent(self) -> int:
+        try:
+            return os.path.getsize(CSV_FILE)
+        except OSError:
+            return 0
+
+    def read_responses(self, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        # Served from the columnar snapshot so only the requested columns are read
+        return read_columns(columns)
+
+    def responses_by_contributor(self, email: str) -> pd.DataFrame:
+        # Reuse the shared analytics snapshot instead of parsing the CSV again
+        from analytics_engine import get_analytics_snapshot
+
+        snapshot = get_analytics_snapshot()
+        if snapshot is None:
+            return pd.DataFrame()
+        df = snapshot.df
+        contributions = df[df['contributor_email'] == email].copy()
+        # Drop categories this contributor never used so value_counts skips them
+        for column in contributions.select_dtypes('category').columns:
+            contributions[column] = contributions[column].cat.remove_unused_categories()
+        return contributions
+
+    def read_responses_at(self, positions: List[int]) -> pd.DataFrame:
+        return read_rows(positions).reset_index(drop=True)
+
+    def iter_responses(self, chunk_size: int) -> Iterator[pd.DataFrame]:
+        if self.responses_version() is None:
+            return
+        yield from pd.read_csv(CSV_FILE, chunksize=chunk_size, dtype=str, keep_default_na=False)
+
+    def query_responses(self, filters: Dict, sort_by: str = 'timestamp', descending: bool = True,
+                        offset: int = 0, limit: int = 50) -> Tuple[pd.DataFrame, int]:
+        # Filter and sort on the few columns the analytics snapshot already
+        # holds in memory, then read just the page's rows from the Parquet snapshot
+        from analytics_engine import get_analytics_snapshot
+
+        snapshot = get_analytics_snapshot()
+        if snapshot is None:
+            return pd.DataFrame(), 0
+
+        columns = [column for column in SUBMISSIONS_FILTER_COLUMNS if filters.get(column)]
+        if filters.get('contributor'):
+            columns += ['contributor_name', 'contributor_email']
+        if sort_by != 'timestamp':
+            columns.append(sort_by)
+        df = snapshot.frame(*dict.fromkeys(columns))
+        timestamps = snapshot.timestamps
+
+        mask = pd.Series(True, index=timestamps.index)
+        for column in SUBMISSIONS_FILTER_COLUMNS:
+            if filters.get(column) and column in df.columns:
+                mask &= df[column].isin(filters[column])
+        if filters.get('contributor'):
+            needle = filters['contributor'].strip().casefold()
+            for_contributor = pd.Series(False, index=mask.index)
+            for column in ('contributor_name', 'contributor_email'):
+                if column in df.columns:
+                    for_contributor |= df[column].astype('string').str.casefold().str.contains(
+                        needle, regex=False, na=False)
+            mask &= for_contributor
+        if filters.get('date_from'):
+            mask &= timestamps >= pd.Timestamp(filters['date_from'])
+        if filters.get('date_to'):
+            mask &= timestamps < pd.Timestamp(filters['date_to']) + pd.Timedelta(days=1)
+
+        keys = (df[sort_by] if sort_by in df.columns else timestamps)[mask]
+        if descending:
+            keys = keys.iloc[::-1]
+        keys = keys.sort_values(ascending=not descending, kind='stable', na_position='last')
+
+        positions = keys.index[offset:offset + limit].tolist()
+        page = read_rows(positions).reset_index(drop=True)
+        return page, int(mask.sum())
+
+    def load_aggregates(self) -> Dict:
+        return load_aggregates()
+
+    def relink_media(self, moves: Dict[str, Dict]) -> int:
+        from media_store import normalize_media_path
+
+        def relink(row):
+            changed = False
+            target = moves.get(normalize_media_path(row.get('file_path')))
+            if target is not None:
+                row['file_path'] = target['path']
+                row['media_filename'] = os.path.basename(target['path'])
+                row['file_sha256'] = target['sha256']
+                changed = True
+            target = moves.get(normalize_media_path(row.get('local_language_audio_path')))
+            if target is not None:
+                row['local_language_audio_path'] = target['path']
+                changed = True
+            return changed
+
+        with file_lock(CSV_FILE):
+            changed = rewrite_responses(relink)
+            if changed:
+                rebuild_aggregates()
+                bump_write_generation(CSV_FILE)
+        return changed
+
+_backend: Optional[StorageBackend] = None
+_backend_lock = threading.Lock()
+
+def create_backend(name: str) -> StorageBackend:
+    """Instantiate a storage backend by name"""
+    if name == 'csv':
+        return CSVBackend()
+    if name == 'sqlite':
+        from sqlite_backend import SQLiteBackend
+        return SQLiteBackend()
+    raise ValueError(f"Unknown storage backend: {name}")
+
+def get_backend() -> StorageBackend:
+    """Get the process-wide storage backend selected by STORAGE_BACKEND"""
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                _backend = create_backend(STORAGE_BACKEND)
+    return _backend
@@ -1,17 +1,21 @@
 import streamlit as st
+import functools
 import os
 import pandas as pd
 import random
 import uuid
-import shutil
-from datetime import datetime, timedelta
+from datetime import datetime
 from pathlib import Path
 from config import (
-    ASSETS_FOLDER, DATA_FOLDER, CSV_FILE, UPLOADS_FOLDER,
-    IMAGE_EXTENSIONS, AUDIO_EXTENSIONS, VIDEO_EXTENSIONS, MEDIA_EXTENSIONS,
-    MAX_IMAGE_SIZE, MAX_AUDIO_SIZE, MAX_VIDEO_SIZE
+    ASSETS_FOLDER, DATA_FOLDER, UPLOADS_FOLDER,
+    MAX_IMAGE_SIZE, MAX_AUDIO_SIZE, MAX_VIDEO_SIZE, SEARCH_RESULTS_LIMIT, DUPLICATES_SHOWN
 )
-import numpy as np
+from media_store import ingest_upload, media_type_of, normalize_media_path, UploadTooLargeError
+from media_catalog import get_media_catalog
+from storage_backend import get_backend
+from analytics_engine import get_metric, get_analytics_snapshot
+from data_cache import cached_on, get_cache_stats
+from aggregate_store import get_counts, time_based_analytics, idi_emiti_analytics
 
 def ensure_directories():
     """Ensure required directories exist"""
@@ -28,16 +32,8 @@ def get_available_media():
     """Get list of available media files from assets folder"""
     ensure_directories()
     
-    if not os.path.exists(ASSETS_FOLDER):
-        return []
-    
-    media_files = []
-    
-    for file in os.listdir(ASSETS_FOLDER):
-        if file.endswith(MEDIA_EXTENSIONS):
-            media_files.append(os.path.join(ASSETS_FOLDER, file))
-    
-    return media_files
+    # Served from the media catalog instead of listing the folder on every call
+    return [entry['path'] for entry in get_media_catalog().files(ASSETS_FOLDER)]
 
 def get_random_media():
     """Get a random media file from the assets folder"""
@@ -46,18 +42,19 @@ def get_random_media():
     if not media_files:
         return None
     
-    return random.choice(media_files)
+    media_file = random.choice(media_files)
+    
+    # The catalog may lag behind a file removed since its last rescan
+    if not os.path.exists(media_file):
+        get_media_catalog().invalidate()
+        media_files = get_available_media()
+        return random.choice(media_files) if media_files else None
+    
+    return media_file
 
 def get_media_type(filename):
     """Determine the media type based on file extension"""
-    if filename.lower().endswith(IMAGE_EXTENSIONS):
-        return "image"
-    elif filename.lower().endswith(AUDIO_EXTENSIONS):
-        return "audio"
-    elif filename.lower().endswith(VIDEO_EXTENSIONS):
-        return "video"
-    else:
-        return "unknown"
+    return media_type_of(filename)
 
 def validate_media_file(file_path, file_size):
     """Validate media file format and size"""
@@ -77,391 +74,224 @@ def validate_media_file(file_path, file_size):
     
     return True, "Valid file"
 
-def save_uploaded_file(uploaded_file, media_type):
-    """Save uploaded file to appropriate directory"""
+def get_max_file_size(media_type):
+    """Get the size limit in bytes for a media type (None if unlimited)"""
+    return {
+        'image': MAX_IMAGE_SIZE,
+        'audio': MAX_AUDIO_SIZE,
+        'video': MAX_VIDEO_SIZE
+    }.get(media_type)
+
+def store_uploaded_file(uploaded_file, media_type):
+    """Store an upload in the media store and return its filename, path, size and sha256.
+    
+    Files are named by content hash, so an upload identical to a stored file is
+    not written again; oversized uploads raise UploadTooLargeError before
+    anything is written.
+    """
     ensure_directories()
     
-    # Generate unique filename
     file_extension = os.path.splitext(uploaded_file.name)[1]
-    unique_filename = f"{uuid.uuid4()}{file_extension}"
-    
-    # Determine upload directory based on media type
-    if media_type == "image":
-        upload_dir = os.path.join(UPLOADS_FOLDER, "images")
-    elif media_type == "audio":
-        upload_dir = os.path.join(UPLOADS_FOLDER, "audio")
-    elif media_type == "video":
-        upload_dir = os.path.join(UPLOADS_FOLDER, "video")
-    else:
-        upload_dir = UPLOADS_FOLDER
+    filename, file_path, file_size, sha256 = ingest_upload(
+        uploaded_file, media_type, file_extension, get_max_file_size(media_type)
+    )
     
-    file_path = os.path.join(upload_dir, unique_filename)
+    get_media_catalog().add(file_path, sha256)
     
-    # Save the file
-    with open(file_path, "wb") as f:
-        f.write(uploaded_file.getbuffer())
+    # Validation, metadata extraction and renditions run on the media worker pool
+    try:
+        from media_worker import enqueue_media
+        enqueue_media(file_path, media_type, sha256)
+    except Exception as e:
+        print(f"Error queueing media processing: {e}")
     
+    return filename, file_path, file_size, sha256
+
+def save_uploaded_file(uploaded_file, media_type):
+    """Save uploaded file to appropriate directory"""
+    unique_filename, file_path, _, _ = store_uploaded_file(uploaded_file, media_type)
     return unique_filename, file_path
 
 def get_session_id():
     """Generate a unique session ID"""
     return str(uuid.uuid4())
 
+def responses_version():
+    """Version token of the stored submissions; cached readers recompute when it changes"""
+    return get_backend().responses_version()
+
+def fallback_on_error(default):
+    """Return default() instead of raising if a derived-data reader fails.
+
+    Applied outside @cached_on so a failed read isn't cached for the data version.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            try:
+                return func(*args, **kwargs)
+            except Exception as e:
+                print(f"Error in {func.__name__}: {e}")
+                return default()
+
+        return wrapper
+
+    return decorator
+
+def load_aggregates():
+    """Get the dashboard counters from the storage backend"""
+    return get_backend().load_aggregates()
+
 def save_user_response(media_filename, media_type, title, description, language, 
                       contributor_name, contributor_email, contributor_details, 
                       category, session_id, latitude=None, longitude=None, 
                       file_size=None, file_path=None, local_language_name=None,
                       dialect_regional_variation=None, pronunciation_guide=None,
-                      cultural_context=None, local_language_audio_path=None):
+                      cultural_context=None, local_language_audio_path=None,
+                      file_sha256=None):
     """Save user response to CSV file with enhanced multimodal data fields including local language support"""
     ensure_directories()
     
-    # Prepare the data with new schema including local language fields
-    data = {
-        'timestamp': [datetime.now().isoformat()],
-        'media_filename': [media_filename],
-        'media_type': [media_type],
-        'title': [title if title else ''],
-        'description': [description],
-        'language': [language],
-        'contributor_name': [contributor_name if contributor_name else ''],
-        'contributor_email': [contributor_email if contributor_email else ''],
-        'contributor_details': [contributor_details if contributor_details else ''],
-        'category': [category if category else ''],
-        'latitude': [latitude if latitude else ''],
-        'longitude': [longitude if longitude else ''],
-        'session_id': [session_id],
-        'file_size': [file_size if file_size else ''],
-        'file_path': [file_path if file_path else ''],
-        'local_language_name': [local_language_name if local_language_name else ''],
-        'dialect_regional_variation': [dialect_regional_variation if dialect_regional_variation else ''],
-        'pronunciation_guide': [pronunciation_guide if pronunciation_guide else ''],
-        'cultural_context': [cultural_context if cultural_context else ''],
-        'local_language_audio_path': [local_language_audio_path if local_language_audio_path else ''],
-        'validation_status': ['pending'],
-        'curator_notes': ['']
+    # Prepare the row with new schema including local language fields
+    row = {
+        'timestamp': datetime.now().isoformat(),
+        'media_filename': media_filename,
+        'media_type': media_type,
+        'title': title if title else '',
+        'description': description,
+        'language': language,
+        'contributor_name': contributor_name if contributor_name else '',
+        'contributor_email': contributor_email if contributor_email else '',
+        'contributor_details': contributor_details if contributor_details else '',
+        'category': category if category else '',
+        'latitude': latitude if latitude else '',
+        'longitude': longitude if longitude else '',
+        'session_id': session_id,
+        'file_size': file_size if file_size else '',
+        'file_path': file_path if file_path else '',
+        'local_language_name': local_language_name if local_language_name else '',
+        'dialect_regional_variation': dialect_regional_variation if dialect_regional_variation else '',
+        'pronunciation_guide': pronunciation_guide if pronunciation_guide else '',
+        'cultural_context': cultural_context if cultural_context else '',
+        'local_language_audio_path': local_language_audio_path if local_language_audio_path else '',
+        'validation_status': 'pending',
+        'curator_notes': '',
+        'file_sha256': file_sha256 if file_sha256 else ''
     }
     
-    df_new = pd.DataFrame(data)
-    
-    # Check if CSV file exists
-    if os.path.exists(CSV_FILE):
-        # Append to existing file
-        df_existing = pd.read_csv(CSV_FILE)
-        df_combined = pd.concat([df_existing, df_new], ignore_index=True)
-        df_combined.to_csv(CSV_FILE, index=False)
-    else:
-        # Create new file
-        df_new.to_csv(CSV_FILE, index=False)
+    # Append a single row (the CSV backend groups concurrent submissions into one
+    # locked write); existing submissions are never re-read or rewritten
+    get_backend().append_response(row)
 
+@fallback_on_error(int)
+@cached_on(responses_version)
 def get_submission_count():
     """Get total number of submissions"""
-    if not os.path.exists(CSV_FILE):
-        return 0
-    
-    try:
-        df = pd.read_csv(CSV_FILE)
-        return len(df)
-    except:
-        return 0
+    return load_aggregates()['total']
 
+@fallback_on_error(pd.DataFrame)
+@cached_on(responses_version)
 def get_recent_responses(limit=10):
     """Get recent responses for analytics"""
-    if not os.path.exists(CSV_FILE):
+    snapshot = get_analytics_snapshot()
+    if snapshot is None:
         return pd.DataFrame()
     
-    try:
-        df = pd.read_csv(CSV_FILE)
-        return df.tail(limit)
-    except:
+    return snapshot.df.tail(limit).copy()
+
+@fallback_on_error(pd.DataFrame)
+def load_responses():
+    """Get all submissions as a DataFrame (empty if there are none)"""
+    snapshot = get_analytics_snapshot()
+    if snapshot is None:
         return pd.DataFrame()
+    
+    return snapshot.df.copy()
+
+def query_submissions(filters, sort_by='timestamp', descending=True, page=1, page_size=50):
+    """Get one page of filtered, sorted submissions and the total number of matches"""
+    try:
+        return get_backend().query_responses(filters, sort_by, descending, (page - 1) * page_size, page_size)
+    except Exception as e:
+        print(f"Error querying submissions: {e}")
+        return pd.DataFrame(), 0
+
+def search_submissions(query, limit=SEARCH_RESULTS_LIMIT):
+    """Full-text search of the submissions, best matches first"""
+    from search_index import search_responses
+
+    try:
+        return search_responses(query, limit)
+    except Exception as e:
+        print(f"Error searching submissions: {e}")
+        return {'results': pd.DataFrame(), 'total': 0, 'elapsed_ms': 0.0}
 
+@fallback_on_error(dict)
+@cached_on(responses_version)
 def get_language_stats():
     """Get statistics by language"""
-    if not os.path.exists(CSV_FILE):
-        return {}
-    
-    try:
-        df = pd.read_csv(CSV_FILE)
-        return df['language'].value_counts().to_dict()
-    except:
-        return {}
+    return get_counts(load_aggregates(), 'language')
 
+@fallback_on_error(dict)
+@cached_on(responses_version)
 def get_media_type_stats():
     """Get statistics by media type"""
-    if not os.path.exists(CSV_FILE):
-        return {}
-    
-    try:
-        df = pd.read_csv(CSV_FILE)
-        return df['media_type'].value_counts().to_dict()
-    except:
-        return {}
+    return get_counts(load_aggregates(), 'media_type')
 
+@fallback_on_error(dict)
+@cached_on(responses_version)
 def get_category_stats():
     """Get statistics by category"""
-    if not os.path.exists(CSV_FILE):
-        return {}
-    
-    try:
-        df = pd.read_csv(CSV_FILE)
-        return df['category'].value_counts().to_dict()
-    except:
-        return {}
+    return get_counts(load_aggregates(), 'category')
+
+@fallback_on_error(dict)
+@cached_on(responses_version)
+def get_validation_status_stats():
+    """Get statistics by validation status"""
+    return get_counts(load_aggregates(), 'validation_status')
+
+@fallback_on_error(dict)
+@cached_on(responses_version)
+def get_contributor_stats():
+    """Get submission counts by contributor name"""
+    return get_counts(load_aggregates(), 'contributor')
 
 # Enhanced Analytics Functions
 
+@fallback_on_error(dict)
 def get_time_based_analytics():
     """Get time-based analytics including daily, weekly, and monthly trends"""
-    if not os.path.exists(CSV_FILE):
-        return {}
-    
-    try:
-        df = pd.read_csv(CSV_FILE)
-        df['timestamp'] = pd.to_datetime(df['timestamp'])
-        df['date'] = df['timestamp'].dt.date
-        df['hour'] = df['timestamp'].dt.hour
-        df['day_of_week'] = df['timestamp'].dt.day_name()
-        df['month'] = df['timestamp'].dt.month_name()
-        
-        # Daily submissions - convert dates to strings
-        daily_stats = df.groupby('date').size().to_dict()
-        daily_stats = {str(date): count for date, count in daily_stats.items()}
-        
-        # Hourly distribution
-        hourly_stats = df['hour'].value_counts().sort_index().to_dict()
-        
-        # Day of week distribution
-        day_stats = df['day_of_week'].value_counts().to_dict()
-        
-        # Monthly distribution
-        month_stats = df['month'].value_counts().to_dict()
-        
-        # Recent 7 days trend - convert dates to strings
-        last_7_days = (datetime.now() - timedelta(days=7)).date()
-        recent_trend = df[df['date'] >= last_7_days].groupby('date').size().to_dict()
-        recent_trend = {str(date): count for date, count in recent_trend.items()}
-        
-        return {
-            'daily': daily_stats,
-            'hourly': hourly_stats,
-            'day_of_week': day_stats,
-            'monthly': month_stats,
-            'recent_trend': recent_trend
-        }
-    except:
-        return {}
+    return time_based_analytics(load_aggregates(), datetime.now().date())
 
+@fallback_on_error(dict)
+@cached_on(responses_version)
 def get_user_engagement_metrics():
     """Get user engagement metrics including unique users, session analysis"""
-    if not os.path.exists(CSV_FILE):
-        return {}
-    
-    try:
-        df = pd.read_csv(CSV_FILE)
-        df['timestamp'] = pd.to_datetime(df['timestamp'])
-        
-        # Unique contributors (by name)
-        unique_contributors = df[df['contributor_name'] != '']['contributor_name'].nunique()
-        
-        # Unique sessions
-        unique_sessions = df['session_id'].nunique()
-        
-        # Anonymous vs named submissions
-        anonymous_count = len(df[df['contributor_name'] == ''])
-        named_count = len(df[df['contributor_name'] != ''])
-        
-        # Average submissions per session
-        avg_per_session = len(df) / unique_sessions if unique_sessions > 0 else 0
-        
-        # Most active contributors
-        active_contributors = df[df['contributor_name'] != '']['contributor_name'].value_counts().head(5).to_dict()
-        
-        # Session duration analysis (if multiple submissions per session)
-        session_analysis = df.groupby('session_id').agg({
-            'timestamp': ['min', 'max', 'count']
-        }).reset_index()
-        session_analysis.columns = ['session_id', 'start_time', 'end_time', 'submission_count']
-        session_analysis['duration_minutes'] = (
-            pd.to_datetime(session_analysis['end_time']) - 
-            pd.to_datetime(session_analysis['start_time'])
-        ).dt.total_seconds() / 60
-        
-        avg_session_duration = session_analysis['duration_minutes'].mean()
-        
-        return {
-            'unique_contributors': unique_contributors,
-            'unique_sessions': unique_sessions,
-            'anonymous_submissions': anonymous_count,
-            'named_submissions': named_count,
-            'avg_submissions_per_session': round(avg_per_session, 2),
-            'avg_session_duration': round(avg_session_duration, 2),
-            'active_contributors': active_contributors
-        }
-    except:
-        return {}
+    return get_metric('user_engagement')
 
+@fallback_on_error(dict)
+@cached_on(responses_version)
 def get_content_analysis():
     """Get content analysis including description length, language diversity"""
-    if not os.path.exists(CSV_FILE):
-        return {}
-    
-    try:
-        df = pd.read_csv(CSV_FILE)
-        
-        # Description length analysis
-        df['description_length'] = df['description'].str.len()
-        avg_description_length = df['description_length'].mean()
-        max_description_length = df['description_length'].max()
-        min_description_length = df['description_length'].min()
-        
-        # Language diversity
-        language_counts = df['language'].value_counts()
-        total_languages = len(language_counts)
-        most_common_language = language_counts.index[0] if len(language_counts) > 0 else None
-        
-        # Category diversity
-        category_counts = df['category'].value_counts()
-        total_categories = len(category_counts)
-        most_common_category = category_counts.index[0] if len(category_counts) > 0 else None
-        
-        # Media type distribution
-        media_type_counts = df['media_type'].value_counts()
-        
-        return {
-            'avg_description_length': round(avg_description_length, 2),
-            'max_description_length': max_description_length,
-            'min_description_length': min_description_length,
-            'total_languages': total_languages,
-            'most_common_language': most_common_language,
-            'total_categories': total_categories,
-            'most_common_category': most_common_category,
-            'media_type_distribution': media_type_counts.to_dict()
-        }
-    except:
-        return {}
+    return get_metric('content_analysis')
 
+@fallback_on_error(dict)
+@cached_on(responses_version)
 def get_popular_media_analysis():
     """Get analysis of most popular media files"""
-    if not os.path.exists(CSV_FILE):
-        return {}
-    
-    try:
-        df = pd.read_csv(CSV_FILE)
-        
-        # Most popular media files
-        popular_media = df['media_filename'].value_counts().head(10).to_dict()
-        
-        # Media type popularity
-        media_type_popularity = df['media_type'].value_counts().to_dict()
-        
-        return {
-            'popular_media': popular_media,
-            'media_type_popularity': media_type_popularity
-        }
-    except:
-        return {}
+    return get_metric('popular_media')
 
+@fallback_on_error(dict)
+@cached_on(responses_version)
 def get_growth_metrics():
     """Get growth metrics and trends"""
-    if not os.path.exists(CSV_FILE):
-        return {}
-    
-    try:
-        df = pd.read_csv(CSV_FILE)
-        df['timestamp'] = pd.to_datetime(df['timestamp'])
-        df['date'] = df['timestamp'].dt.date
-        
-        # Daily growth
-        daily_growth = df.groupby('date').size().reset_index()
-        daily_growth.columns = ['date', 'submissions']
-        
-        # Weekly growth
-        df['week'] = df['timestamp'].dt.isocalendar().week
-        df['year'] = df['timestamp'].dt.year
-        weekly_growth = df.groupby(['year', 'week']).size().reset_index()
-        weekly_growth.columns = ['year', 'week', 'submissions']
-        
-        # Monthly growth
-        df['month'] = df['timestamp'].dt.to_period('M')
-        monthly_growth = df.groupby('month').size().reset_index()
-        monthly_growth.columns = ['month', 'submissions']
-        
-        # Growth rate calculation
-        total_submissions = len(df)
-        first_submission_date = df['date'].min()
-        last_submission_date = df['date'].max()
-        
-        if first_submission_date and last_submission_date:
-            days_active = (last_submission_date - first_submission_date).days
-            avg_daily_submissions = total_submissions / days_active if days_active > 0 else 0
-        else:
-            avg_daily_submissions = 0
-        
-        # Convert datetime objects to strings in growth data
-        daily_growth_records = daily_growth.to_dict('records')
-        for record in daily_growth_records:
-            if 'date' in record:
-                record['date'] = str(record['date'])
-        
-        weekly_growth_records = weekly_growth.to_dict('records')
-        for record in weekly_growth_records:
-            if 'month' in record:
-                record['month'] = str(record['month'])
-        
-        monthly_growth_records = monthly_growth.to_dict('records')
-        for record in monthly_growth_records:
-            if 'month' in record:
-                record['month'] = str(record['month'])
-        
-        return {
-            'total_submissions': total_submissions,
-            'first_submission_date': str(first_submission_date) if first_submission_date else None,
-            'last_submission_date': str(last_submission_date) if last_submission_date else None,
-            'avg_daily_submissions': round(avg_daily_submissions, 2),
-            'daily_growth': daily_growth_records,
-            'weekly_growth': weekly_growth_records,
-            'monthly_growth': monthly_growth_records
-        }
-    except:
-        return {}
+    return get_metric('growth_metrics')
 
+@fallback_on_error(dict)
+@cached_on(responses_version)
 def get_quality_metrics():
     """Get data quality metrics"""
-    if not os.path.exists(CSV_FILE):
-        return {}
-    
-    try:
-        df = pd.read_csv(CSV_FILE)
-        
-        # Completeness metrics
-        total_records = len(df)
-        complete_records = len(df.dropna(subset=['title', 'description', 'category']))
-        completeness_rate = (complete_records / total_records) * 100 if total_records > 0 else 0
-        
-        # Validation status distribution
-        validation_status_counts = df['validation_status'].value_counts().to_dict()
-        
-        # Language completeness
-        language_completeness = (df['language'].notna().sum() / total_records) * 100 if total_records > 0 else 0
-        
-        # Category completeness
-        category_completeness = (df['category'].notna().sum() / total_records) * 100 if total_records > 0 else 0
-        
-        # Geolocation completeness
-        geo_completeness = ((df['latitude'].notna()) & (df['longitude'].notna())).sum() / total_records * 100 if total_records > 0 else 0
-        
-        return {
-            'total_records': total_records,
-            'complete_records': complete_records,
-            'completeness_rate': round(completeness_rate, 2),
-            'validation_status_distribution': validation_status_counts,
-            'language_completeness': round(language_completeness, 2),
-            'category_completeness': round(category_completeness, 2),
-            'geo_completeness': round(geo_completeness, 2)
-        }
-    except:
-        return {}
+    return get_metric('quality_metrics')
 
 def ensure_json_serializable(obj):
     """Convert objects to JSON serializable format"""
@@ -479,7 +309,11 @@ def ensure_json_serializable(obj):
         return obj
 
 def get_comprehensive_analytics():
-    """Get comprehensive analytics combining all metrics"""
+    """Get comprehensive analytics combining all metrics
+    
+    All metric families are computed from one shared snapshot of the responses
+    table, so the CSV and its timestamps are parsed once per data version.
+    """
     analytics = {
         'time_based': get_time_based_analytics(),
         'user_engagement': get_user_engagement_metrics(),
@@ -520,106 +354,27 @@ def create_sample_data():
         }
     ]
     
-    df = pd.DataFrame(sample_data)
     ensure_directories()
-    df.to_csv(CSV_FILE, index=False)
+    get_backend().append_responses(sample_data)
     return "Sample data created successfully"
 
+@fallback_on_error(dict)
+@cached_on(responses_version)
 def get_category_analytics():
     """Get detailed category analytics"""
-    if not os.path.exists(CSV_FILE):
-        return {}
-    
-    try:
-        df = pd.read_csv(CSV_FILE)
-        
-        # Category distribution
-        category_distribution = df['category'].value_counts().to_dict()
-        
-        # Category by language
-        category_language = df.groupby(['category', 'language']).size().reset_index()
-        category_language.columns = ['category', 'language', 'count']
-        
-        # Category by media type
-        category_media = df.groupby(['category', 'media_type']).size().reset_index()
-        category_media.columns = ['category', 'media_type', 'count']
-        
-        return {
-            'category_distribution': category_distribution,
-            'category_language': category_language.to_dict('records'),
-            'category_media': category_media.to_dict('records')
-        }
-    except:
-        return {}
+    return get_metric('category_analytics')
 
+@fallback_on_error(dict)
+@cached_on(responses_version)
 def get_contributor_analytics():
     """Get contributor analytics"""
-    if not os.path.exists(CSV_FILE):
-        return {}
-    
-    try:
-        df = pd.read_csv(CSV_FILE)
-        
-        # Top contributors
-        top_contributors = df[df['contributor_name'] != '']['contributor_name'].value_counts().head(10).to_dict()
-        
-        # Contributor diversity
-        total_contributors = df[df['contributor_name'] != '']['contributor_name'].nunique()
-        
-        # Anonymous vs named ratio
-        anonymous_count = len(df[df['contributor_name'] == ''])
-        named_count = len(df[df['contributor_name'] != ''])
-        anonymous_ratio = (anonymous_count / len(df)) * 100 if len(df) > 0 else 0
-        
-        return {
-            'top_contributors': top_contributors,
-            'total_contributors': total_contributors,
-            'anonymous_ratio': round(anonymous_ratio, 2),
-            'named_submissions': named_count,
-            'anonymous_submissions': anonymous_count
-        }
-    except:
-        return {}
+    return get_metric('contributor_analytics')
 
+@fallback_on_error(dict)
+@cached_on(responses_version)
 def get_geo_analytics():
     """Get geographical analytics"""
-    if not os.path.exists(CSV_FILE):
-        return {}
-    
-    try:
-        df = pd.read_csv(CSV_FILE)
-        
-        # Filter records with valid coordinates
-        geo_df = df[(df['latitude'].notna()) & (df['longitude'].notna())]
-        
-        if len(geo_df) == 0:
-            return {'message': 'No geographical data available'}
-        
-        # Geographic distribution
-        geo_distribution = {
-            'total_geo_records': len(geo_df),
-            'avg_latitude': geo_df['latitude'].mean(),
-            'avg_longitude': geo_df['longitude'].mean(),
-            'min_latitude': geo_df['latitude'].min(),
-            'max_latitude': geo_df['latitude'].max(),
-            'min_longitude': geo_df['longitude'].min(),
-            'max_longitude': geo_df['longitude'].max()
-        }
-        
-        # Regional analysis (simplified)
-        geo_df['region'] = geo_df.apply(lambda row: 
-            'North' if row['latitude'] > 20 else
-            'South' if row['latitude'] < 15 else
-            'Central', axis=1)
-        
-        regional_distribution = geo_df['region'].value_counts().to_dict()
-        
-        return {
-            'geo_distribution': geo_distribution,
-            'regional_distribution': regional_distribution
-        }
-    except:
-        return {}
+    return get_metric('geo_analytics')
 
 def get_enhanced_analytics():
     """Get all enhanced analytics"""
@@ -631,122 +386,82 @@ def get_enhanced_analytics():
     }
 
 # Idi-Emiti specific functions
+@fallback_on_error(int)
+@cached_on(responses_version)
 def get_idi_emiti_count():
     """Get count of Idi-Emiti submissions"""
-    if not os.path.exists(CSV_FILE):
-        return 0
-    
-    try:
-        df = pd.read_csv(CSV_FILE)
-        # Count submissions that are from Idi-Emiti (Cultural Identification category)
-        idi_emiti_count = len(df[df['category'] == 'Cultural Identification'])
-        return idi_emiti_count
-    except:
-        return 0
+    return load_aggregates()['idi_emiti']['total']
 
+@fallback_on_error(int)
+@cached_on(responses_version)
 def get_idi_emiti_languages():
     """Get count of unique languages documented in Idi-Emiti"""
-    if not os.path.exists(CSV_FILE):
-        return 0
-    
-    try:
-        df = pd.read_csv(CSV_FILE)
-        # Get unique languages from Idi-Emiti submissions
-        idi_emiti_df = df[df['category'] == 'Cultural Identification']
-        unique_languages = idi_emiti_df[idi_emiti_df['local_language_name'] != '']['local_language_name'].nunique()
-        return unique_languages
-    except:
-        return 0
+    from name_variants import get_vocabulary
+
+    # Spelling and script variants of a name count once
+    return len(get_vocabulary()['names'])
 
+@fallback_on_error(int)
+@cached_on(responses_version)
 def get_user_idi_emiti_count(user_id):
     """Get count of Idi-Emiti submissions by a specific user"""
-    if not os.path.exists(CSV_FILE):
-        return 0
-    
-    try:
-        df = pd.read_csv(CSV_FILE)
-        # Count Idi-Emiti submissions by user (using contributor_name as proxy for user_id)
-        # This is a simplified approach - in a full implementation, you'd use actual user_id
-        user_contributions = len(df[df['category'] == 'Cultural Identification'])
-        return user_contributions
-    except:
-        return 0
+    # Count Idi-Emiti submissions by user (using contributor_name as proxy for user_id)
+    # This is a simplified approach - in a full implementation, you'd use actual user_id
+    return load_aggregates()['idi_emiti']['total']
 
+@fallback_on_error(dict)
+@cached_on(responses_version)
 def get_idi_emiti_analytics():
     """Get comprehensive Idi-Emiti analytics"""
-    if not os.path.exists(CSV_FILE):
-        return {}
-    
+    from name_variants import get_vocabulary
+
+    analytics = idi_emiti_analytics(load_aggregates())
+    # Local names are counted by variant group rather than by exact spelling
+    names = get_vocabulary()['names']
+    analytics['languages_documented'] = len(names)
+    analytics['top_languages'] = {name['name']: name['submissions'] for name in names[:10]}
+    return analytics
+
+def get_idi_emiti_vocabulary(object_path):
+    """Get the local names given for an Idi-Emiti object, grouped by variant, most submitted first"""
+    from name_variants import get_vocabulary
+
+    return get_vocabulary()['objects'].get(normalize_media_path(object_path), [])
+
+def get_possible_duplicates(limit=DUPLICATES_SHOWN):
+    """Get the most similar pairs of uploaded images, with the submissions using each, and the number of pairs"""
+    from perceptual_hash import find_duplicate_pairs
+
     try:
-        df = pd.read_csv(CSV_FILE)
-        idi_emiti_df = df[df['category'] == 'Cultural Identification']
-        
-        if len(idi_emiti_df) == 0:
-            return {
-                'total_identifications': 0,
-                'languages_documented': 0,
-                'dialects_documented': 0,
-                'audio_recordings': 0,
-                'confidence_distribution': {},
-                'top_languages': {},
-                'top_dialects': {}
-            }
-        
-        # Basic statistics
-        total_identifications = len(idi_emiti_df)
-        languages_documented = idi_emiti_df[idi_emiti_df['local_language_name'] != '']['local_language_name'].nunique()
-        dialects_documented = idi_emiti_df[idi_emiti_df['dialect_regional_variation'] != '']['dialect_regional_variation'].nunique()
-        audio_recordings = len(idi_emiti_df[idi_emiti_df['local_language_audio_path'] != ''])
-        
-        # Confidence distribution
-        confidence_distribution = idi_emiti_df['contributor_details'].str.extract(r'Confidence: ([^.]*)').iloc[:, 0].value_counts().to_dict()
-        
-        # Top languages
-        top_languages = idi_emiti_df[idi_emiti_df['local_language_name'] != '']['local_language_name'].value_counts().head(10).to_dict()
-        
-        # Top dialects
-        top_dialects = idi_emiti_df[idi_emiti_df['dialect_regional_variation'] != '']['dialect_regional_variation'].value_counts().head(10).to_dict()
-        
-        result = {
-            'total_identifications': total_identifications,
-            'languages_documented': languages_documented,
-            'dialects_documented': dialects_documented,
-            'audio_recordings': audio_recordings,
-            'confidence_distribution': confidence_distribution,
-            'top_languages': top_languages,
-            'top_dialects': top_dialects
-        }
-        
-        # Ensure all data is JSON serializable
-        return ensure_json_serializable(result)
-    except:
-        return {} 
+        pairs = find_duplicate_pairs()
+    except Exception as e:
+        print(f"Error finding duplicate images: {e}")
+        return [], 0
+
+    shown = pairs[:limit]
+    submissions = {}
+    snapshot = get_analytics_snapshot()
+    if shown and snapshot is not None:
+        df = snapshot.frame('file_sha256', 'title', 'contributor_name')
+        if 'file_sha256' in df.columns:
+            wanted = {pair[key] for pair in shown for key in ('sha256_a', 'sha256_b')}
+            for sha256, title, contributor in df[df['file_sha256'].isin(wanted)].itertuples(index=False):
+                submissions.setdefault(sha256, []).append(f"{title} ({contributor})")
+
+    return [{**pair, 'submissions_a': submissions.get(pair['sha256_a'], []),
+             'submissions_b': submissions.get(pair['sha256_b'], [])} for pair in shown], len(pairs)
 
 def get_storage_status():
     """Get current storage mode status for display"""
     try:
-        from db_config import get_storage_mode, is_mysql_available
-        
-        if is_mysql_available():
-            return {
-                'mode': 'mysql',
-                'status': 'Connected to MySQL Database',
-                'icon': '🗄️',
-                'color': 'success'
-            }
-        else:
-            return {
-                'mode': 'json',
-                'status': 'Using Local JSON Storage',
-                'icon': '📁',
-                'color': 'info'
-            }
+        return get_backend().status()
     except Exception:
         return {
-            'mode': 'json',
-            'status': 'Using Local JSON Storage',
-            'icon': '📁',
-            'color': 'info'
+            'mode': 'unknown',
+            'status': 'Storage backend unavailable',
+            'icon': '⚠️',
+            'color': 'warning',
+            'files': []
         }
 
 def display_storage_status():
@@ -754,8 +469,9 @@ def display_storage_status():
     try:
         from language_manager import get_text
         
-        # Show CSV storage status
-        st.success("✅ Connected to CSV Storage System")
+        # Show storage backend status
+        storage_status = get_storage_status()
+        getattr(st, storage_status['color'], st.info)(f"{storage_status['icon']} {storage_status['status']}")
         
         # Show uploaded files count
         file_counts = get_uploaded_files_count()
@@ -772,16 +488,15 @@ def display_storage_status():
         
         # Show storage info
         with st.expander("📊 Storage Information"):
-            st.markdown("""
+            storage_files = "\n".join(f"            - `{path}`" for path in storage_status['files'])
+            st.markdown(f"""
             **File Storage Structure:**
             - Images: `uploads/images/`
             - Audio: `uploads/audio/`
             - Video: `uploads/video/`
             
-            **Data Storage:**
-            - User data: `data/users.csv`
-            - Session data: `data/sessions.csv`
-            - User responses: `data/user_responses.csv`
+            **Data Storage ({storage_status['mode']}):**
+{storage_files}
             """)
             
     except Exception as e:
@@ -807,33 +522,17 @@ def get_uploaded_files(media_type=None):
     
     uploaded_files = []
     
-    if media_type:
-        # Get files from specific media type directory
-        upload_dir = os.path.join(UPLOADS_FOLDER, media_type)
-        if os.path.exists(upload_dir):
-            for file in os.listdir(upload_dir):
-                if file.endswith(MEDIA_EXTENSIONS):
-                    file_path = os.path.join(upload_dir, file)
-                    uploaded_files.append({
-                        'filename': file,
-                        'path': file_path,
-                        'type': get_media_type(file),
-                        'size': os.path.getsize(file_path)
-                    })
-    else:
-        # Get files from all media type directories
-        for media_dir in ['images', 'audio', 'video']:
-            upload_dir = os.path.join(UPLOADS_FOLDER, media_dir)
-            if os.path.exists(upload_dir):
-                for file in os.listdir(upload_dir):
-                    if file.endswith(MEDIA_EXTENSIONS):
-                        file_path = os.path.join(upload_dir, file)
-                        uploaded_files.append({
-                            'filename': file,
-                            'path': file_path,
-                            'type': get_media_type(file),
-                            'size': os.path.getsize(file_path)
-                        })
+    # Files are sharded into subdirectories by content hash; the media catalog
+    # indexes them so listing does not walk the directories
+    media_dirs = [media_type] if media_type else ['images', 'audio', 'video']
+    for media_dir in media_dirs:
+        for entry in get_media_catalog().files(os.path.join(UPLOADS_FOLDER, media_dir)):
+            uploaded_files.append({
+                'filename': entry['filename'],
+                'path': entry['path'],
+                'type': entry['type'],
+                'size': entry['size']
+            })
     
     return uploaded_files
 
@@ -844,10 +543,8 @@ def get_uploaded_files_count():
     counts = {'images': 0, 'audio': 0, 'video': 0, 'total': 0}
     
     for media_dir in ['images', 'audio', 'video']:
-        upload_dir = os.path.join(UPLOADS_FOLDER, media_dir)
-        if os.path.exists(upload_dir):
-            count = len([f for f in os.listdir(upload_dir) if f.endswith(MEDIA_EXTENSIONS)])
-            counts[media_dir] = count
-            counts['total'] += count
+        count = get_media_catalog().count(os.path.join(UPLOADS_FOLDER, media_dir))
+        counts[media_dir] = count
+        counts['total'] += count
     
-    return counts 
\ No newline at end of file
+    return counts 